@@ -1,14 +1,12 @@
 """
 Simple text chat endpoint for AI agents
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from app.core.database import get_db
-from app.models.ai_agent import AIAgent
 from app.services.agent.brain import agent_brain
+from app.services.agent_config_cache import agent_config_cache
+from app.services.usage_meter import usage_meter
 
 router = APIRouter()
 
@@ -22,15 +20,13 @@ class ChatResponse(BaseModel):
 @router.post("/{agent_id}/chat", response_model=ChatResponse)
 async def chat_with_agent(
     agent_id: int,
-    request: ChatRequest,
-    db: AsyncSession = Depends(get_db)
+    request: ChatRequest
 ):
     """
     Simple text chat with AI agent
     """
-    # Get agent
-    result = await db.execute(select(AIAgent).where(AIAgent.id == agent_id))
-    agent = result.scalar_one_or_none()
+    # Get agent (cached snapshot; no DB round-trip per message)
+    agent = await agent_config_cache.get(agent_id)
     
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -42,6 +38,7 @@ async def chat_with_agent(
         master_prompt=agent.system_prompt,
         context={}
     )
+    usage_meter.record((agent.user_id, agent.id), llm_tokens=ai_response.get("metadata", {}).get("tokens_used", 0))
     
     return ChatResponse(
         response=ai_response["response"],
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from app.services.agent.core import agent_core
 from app.services.agent.voice import voice_service
-from app.core.database import get_db
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models.ai_agent import AIAgent
+from app.services.agent_config_cache import agent_config_cache
+from app.services.recording_service import recording_service, CALLER_TRACK, AGENT_TRACK
+from app.core.config import settings
 import asyncio
 import json
+import time
+import uuid
 
 router = APIRouter()
 
@@ -17,27 +18,37 @@ async def agent_websocket(websocket: WebSocket, agent_id: int):
     Handles: STT -> Brain -> TTS Streaming.
     """
     await websocket.accept()
-    session_id = f"ws_{agent_id}"
+    # One session per connection, so concurrent callers never share a history
+    session_id = f"ws_{uuid.uuid4().hex}"
 
-    # Database fetching logic
-    # We use a context manager for the DB session since it's inside a WebSocket loop
-    from app.core.database import AsyncSessionLocal
-    async with AsyncSessionLocal() as db:
-        result = await db.execute(select(AIAgent).where(AIAgent.id == agent_id))
-        agent = result.scalar_one_or_none()
-        if not agent:
-            await websocket.send_json({"error": "Agent not found"})
-            await websocket.close()
-            return
-        master_prompt = agent.system_prompt
+    # Served from the agent config cache; a DB round-trip only on a miss
+    agent = await agent_config_cache.get(agent_id)
+    if not agent:
+        await websocket.send_json({"error": "Agent not found"})
+        await websocket.close()
+        return
+    master_prompt = agent.system_prompt
+    call_started = time.monotonic()
+    meter = (agent.user_id, agent.id)
+    
+    # Optional recording: the loop only enqueues audio, a writer task does the disk I/O
+    recorder = None
+    if agent.configuration.get("record_calls", settings.CALL_RECORDING_DEFAULT):
+        try:
+            recorder = await recording_service.start(agent.user_id, agent.id)
+            session_id = recorder.call_id
+        except Exception as e:
+            print(f"Recording Start Error: {str(e)}")
     
     try:
         while True:
             # 1. Wait for Audio Data (Binary)
             data = await websocket.receive_bytes()
+            if recorder:
+                recorder.write(CALLER_TRACK, data)
             
             # 2. Transcribe (STT)
-            user_text = await voice_service.transcribe_audio(data)
+            user_text = await voice_service.transcribe_audio(data, meter=meter)
             if not user_text:
                 continue
                 
@@ -48,7 +59,8 @@ async def agent_websocket(websocket: WebSocket, agent_id: int):
             agent_result = await agent_core.process_turn(
                 session_id=session_id,
                 user_input=user_text,
-                master_prompt=master_prompt
+                master_prompt=master_prompt,
+                meter=meter
             )
             
             # Send agent text response
@@ -56,7 +68,9 @@ async def agent_websocket(websocket: WebSocket, agent_id: int):
 
             # 4. Stream Audio (TTS)
             # We send audio chunks as binary frames
-            async for chunk in agent_core.generate_voice_response(agent_result["text"]):
+            async for chunk in agent_core.generate_voice_response(agent_result["text"], meter=meter):
+                if recorder:
+                    recorder.write(AGENT_TRACK, chunk)
                 await websocket.send_bytes(chunk)
                 
             # Signal end of turn
@@ -67,3 +81,14 @@ async def agent_websocket(websocket: WebSocket, agent_id: int):
     except Exception as e:
         print(f"WS Error: {str(e)}")
         await websocket.close()
+    finally:
+        if recorder:
+            await recording_service.finish(recorder)
+        await agent_core.end_call(session_id, {
+            "call_id": session_id,
+            "user_id": agent.user_id,
+            "agent_id": agent.id,
+            "channel": "web",
+            "caller_number": "web",
+            "duration": round(time.monotonic() - call_started, 2)
+        }, extract_orders=agent.configuration.get("extract_orders", settings.ORDER_EXTRACTION_DEFAULT))
@@ -3,20 +3,23 @@ AI Agent Endpoints
 CRUD operations for AI agents and phone number linking
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import get_current_principal, Principal
+from app.core.serialization import schema_columns, rows_response
+from app.core.etag import collection_etag, etag_matches, cache_headers, not_modified
 from app.models.ai_agent import AIAgent
-from app.models.phone_number import PhoneNumber
 from app.models.agent_phone_mapping import AgentPhoneMapping
-from sqlalchemy import delete
 from app.schemas.ai_agent import (
-    AIAgentCreate, AIAgentUpdate, AIAgentResponse, AgentPhoneLinkRequest
+    AIAgentCreate, AIAgentUpdate, AIAgentResponse, AgentPhoneLinkRequest, AgentPhoneBulkLinkRequest
 )
+from app.services.counter_service import apply_counter_deltas
+from app.services.agent_link_service import apply_agent_phone_links
+from app.services.call_routing import call_router
+from app.services.agent_config_cache import agent_config_cache
 
 router = APIRouter()
 
@@ -24,7 +27,7 @@ router = APIRouter()
 @router.post("", response_model=AIAgentResponse, status_code=status.HTTP_201_CREATED)
 async def create_ai_agent(
     agent_data: AIAgentCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new AI agent for current user"""
@@ -33,6 +36,11 @@ async def create_ai_agent(
         **agent_data.model_dump()
     )
     db.add(new_agent)
+    await apply_counter_deltas(
+        db, current_user.id,
+        total_ai_agents=1,
+        active_ai_agents=int(bool(new_agent.is_active))
+    )
     await db.commit()
     await db.refresh(new_agent)
     return new_agent
@@ -40,21 +48,25 @@ async def create_ai_agent(
 
 @router.get("", response_model=List[AIAgentResponse])
 async def get_ai_agents(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all AI agents for current user"""
+    """Get all AI agents for current user (answers If-None-Match with 304)"""
+    etag = await collection_etag(db, AIAgent, current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     result = await db.execute(
-        select(AIAgent).where(AIAgent.user_id == current_user.id)
+        select(*schema_columns(AIAgent, AIAgentResponse)).where(AIAgent.user_id == current_user.id)
     )
-    agents = result.scalars().all()
-    return agents
+    return rows_response(AIAgentResponse, result.all(), cache_headers(etag))
 
 
 @router.get("/{agent_id}", response_model=AIAgentResponse)
 async def get_ai_agent(
     agent_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific AI agent by ID (must belong to current user)"""
@@ -79,7 +91,7 @@ async def get_ai_agent(
 async def update_ai_agent(
     agent_id: int,
     agent_data: AIAgentUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update an AI agent (must belong to current user)"""
@@ -98,19 +110,27 @@ async def update_ai_agent(
         )
     
     # Update fields
+    was_active = bool(agent.is_active)
     update_data = agent_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(agent, field, value)
     
+    await apply_counter_deltas(
+        db, current_user.id,
+        active_ai_agents=int(bool(agent.is_active)) - int(was_active)
+    )
     await db.commit()
     await db.refresh(agent)
+    await agent_config_cache.invalidate(agent_id)
+    if bool(agent.is_active) != was_active:
+        await call_router.refresh_agent(agent_id)
     return agent
 
 
 @router.delete("/{agent_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_ai_agent(
     agent_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete an AI agent (must belong to current user)"""
@@ -129,69 +149,62 @@ async def delete_ai_agent(
         )
     
     await db.execute(delete(AIAgent).where(AIAgent.id == agent_id))
+    await apply_counter_deltas(
+        db, current_user.id,
+        total_ai_agents=-1,
+        active_ai_agents=-int(bool(agent.is_active))
+    )
     await db.commit()
+    await agent_config_cache.invalidate(agent_id)
+    await call_router.refresh_agent(agent_id)
     return None
 
 
+@router.post("/link-phones", status_code=status.HTTP_200_OK)
+async def bulk_link_agents_to_phones(
+    link_data: AgentPhoneBulkLinkRequest,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Relink many AI agents to their phone numbers at once (all must belong to current user)"""
+    links = {}
+    for item in link_data.links:
+        links.setdefault(item.agent_id, set()).update(item.phone_number_ids)
+    
+    changes = await apply_agent_phone_links(db, current_user.id, links)
+    await db.commit()
+    await call_router.refresh_phones(changes.phone_number_ids)
+    return {
+        "message": "Agents linked to phone numbers successfully",
+        "added": changes.added,
+        "removed": changes.removed
+    }
+
+
 @router.post("/{agent_id}/link-phones", status_code=status.HTTP_200_OK)
 async def link_agent_to_phones(
     agent_id: int,
     link_data: AgentPhoneLinkRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Link an AI agent to phone numbers (must belong to current user)"""
-    # Verify agent belongs to user
-    result = await db.execute(
-        select(AIAgent).where(
-            AIAgent.id == agent_id,
-            AIAgent.user_id == current_user.id
-        )
-    )
-    agent = result.scalar_one_or_none()
-    
-    if not agent:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="AI agent not found"
-        )
-    
-    # Remove existing mappings for this agent
-    await db.execute(
-        delete(AgentPhoneMapping).where(AgentPhoneMapping.agent_id == agent_id)
+    changes = await apply_agent_phone_links(
+        db, current_user.id, {agent_id: link_data.phone_number_ids}
     )
-    
-    # Verify all phone numbers belong to user and create new mappings
-    for phone_id in link_data.phone_number_ids:
-        phone_result = await db.execute(
-            select(PhoneNumber).where(
-                PhoneNumber.id == phone_id,
-                PhoneNumber.user_id == current_user.id
-            )
-        )
-        phone = phone_result.scalar_one_or_none()
-        
-        if not phone:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Phone number {phone_id} not found"
-            )
-        
-        # Create mapping
-        mapping = AgentPhoneMapping(
-            agent_id=agent_id,
-            phone_number_id=phone_id
-        )
-        db.add(mapping)
-    
     await db.commit()
-    return {"message": "Agent linked to phone numbers successfully"}
+    await call_router.refresh_phones(changes.phone_number_ids)
+    return {
+        "message": "Agent linked to phone numbers successfully",
+        "added": changes.added,
+        "removed": changes.removed
+    }
 
 
 @router.get("/{agent_id}/linked-phones", response_model=List[int])
 async def get_linked_phones(
     agent_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get phone numbers linked to an AI agent"""
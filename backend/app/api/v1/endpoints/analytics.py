@@ -0,0 +1,59 @@
+"""
+Analytics Endpoints
+Call time series served from hourly / daily rollups
+"""
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_principal, Principal
+from app.core.timestamps import to_naive_utc
+from app.schemas.analytics import CallTimeseriesResponse
+from app.services.analytics_service import get_call_timeseries
+
+router = APIRouter()
+
+# Longest range a single query may cover, per granularity
+MAX_RANGE = {"hour": timedelta(days=31), "day": timedelta(days=366)}
+DEFAULT_RANGE = {"hour": timedelta(hours=24), "day": timedelta(days=30)}
+
+
+@router.get("/calls", response_model=CallTimeseriesResponse)
+async def get_call_analytics(
+    granularity: Literal["hour", "day"] = Query("hour"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    phone_number_id: Optional[int] = Query(None),
+    agent_id: Optional[int] = Query(None),
+    call_status: Optional[str] = Query(None, alias="status"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Calls, failures and duration statistics per hour or day for current user.
+    Optionally narrowed to one phone number, agent or status.
+    """
+    # Rollup buckets are naive UTC; comparing them with aware query values would fail
+    end = to_naive_utc(end) or datetime.utcnow()
+    start = to_naive_utc(start) or end - DEFAULT_RANGE[granularity]
+    
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    if end - start > MAX_RANGE[granularity]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too large for {granularity} granularity"
+        )
+    
+    points = await get_call_timeseries(
+        db, current_user.id, granularity, start, end,
+        phone_number_id=phone_number_id,
+        agent_id=agent_id,
+        status=call_status
+    )
+    return CallTimeseriesResponse(granularity=granularity, start=start, end=end, points=points)
@@ -9,8 +9,7 @@ from app.core.database import get_db
 from app.schemas.auth import UserSignup, UserLogin, TokenResponse, RefreshTokenRequest
 from app.schemas.user import UserResponse
 from app.services.auth_service import signup_user, login_user, refresh_access_token
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import get_current_principal, Principal
 
 router = APIRouter()
 
@@ -44,7 +43,7 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get current authenticated user information"""
     return current_user
@@ -2,17 +2,24 @@
 Call Log Endpoints
 CRUD operations for call logs
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, tuple_
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import get_current_principal, Principal
+from app.core.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.core.serialization import schema_columns, rows_response
 from app.models.call_log import CallLog
 from app.models.phone_number import PhoneNumber
-from app.schemas.call_log import CallLogCreate, CallLogResponse
+from app.schemas.call_log import CallLogCreate, CallLogResponse, CallLogIngestResponse
+from app.services.counter_service import apply_counter_deltas
+from app.services.call_ingest_service import parse_call_events, ingest_call_logs, IngestPayloadError
+from app.services.export_service import export_response, export_range
+from app.services.analytics_service import record_call_rollups
 
 router = APIRouter()
 
@@ -20,7 +27,7 @@ router = APIRouter()
 @router.post("", response_model=CallLogResponse, status_code=status.HTTP_201_CREATED)
 async def create_call_log(
     call_data: CallLogCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new call log for current user"""
@@ -43,34 +50,111 @@ async def create_call_log(
         **call_data.model_dump()
     )
     db.add(new_call)
+    await apply_counter_deltas(db, current_user.id, total_calls=1)
+    await record_call_rollups(db, [{
+        "user_id": current_user.id,
+        "timestamp": datetime.utcnow(),
+        **call_data.model_dump()
+    }])
     await db.commit()
     await db.refresh(new_call)
     return new_call
 
 
+@router.post("/bulk", response_model=CallLogIngestResponse)
+async def ingest_call_logs_bulk(
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Idempotently ingest a batch of call events for current user.
+    Accepts a JSON array or NDJSON (application/x-ndjson). Events are upserted on
+    call_id, so retried webhooks update the existing row instead of failing.
+    Returns an outcome per event.
+    """
+    try:
+        events = parse_call_events(await request.body(), request.headers.get("content-type"))
+    except IngestPayloadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if len(events) > settings.CALL_LOG_INGEST_MAX_EVENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.CALL_LOG_INGEST_MAX_EVENTS} events per request"
+        )
+    
+    return await ingest_call_logs(db, current_user.id, events)
+
+
 @router.get("", response_model=List[CallLogResponse])
 async def get_call_logs(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all call logs for current user with pagination"""
-    result = await db.execute(
-        select(CallLog)
+    """
+    Get all call logs for current user with pagination.
+    Pass the X-Next-Cursor header of one page as `cursor` to fetch the next;
+    `skip` is kept for offset paging.
+    """
+    query = (
+        select(*schema_columns(CallLog, CallLogResponse))
         .where(CallLog.user_id == current_user.id)
-        .order_by(desc(CallLog.timestamp))
-        .offset(skip)
+        .order_by(desc(CallLog.timestamp), desc(CallLog.id))
         .limit(limit)
     )
-    call_logs = result.scalars().all()
-    return call_logs
+    if cursor:
+        query = query.where(tuple_(CallLog.timestamp, CallLog.id) < decode_cursor(cursor))
+    else:
+        query = query.offset(skip)
+    
+    result = await db.execute(query)
+    call_logs = result.all()
+    
+    headers = {}
+    if len(call_logs) == limit:
+        last = call_logs[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.timestamp, last.id)
+    return rows_response(CallLogResponse, call_logs, headers)
+
+
+@router.get("/export")
+async def export_call_logs(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    start: Optional[datetime] = Query(None, description="Only calls at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only calls before this time"),
+    call_status: Optional[str] = Query(None, alias="status"),
+    gzip: bool = Query(False),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Stream all matching call logs for current user as CSV or NDJSON"""
+    start, end = export_range(start, end)
+    columns = list(CallLogResponse.model_fields)
+    query = (
+        select(*[getattr(CallLog, column) for column in columns])
+        .where(CallLog.user_id == current_user.id)
+        .order_by(CallLog.timestamp, CallLog.id)
+    )
+    if start:
+        query = query.where(CallLog.timestamp >= start)
+    if end:
+        query = query.where(CallLog.timestamp < end)
+    if call_status:
+        query = query.where(CallLog.status == call_status)
+    
+    return export_response(query, columns, format, gzip, "call_logs")
 
 
 @router.get("/{call_id}", response_model=CallLogResponse)
 async def get_call_log(
     call_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific call log by call_id (must belong to current user)"""
@@ -0,0 +1,59 @@
+"""
+Call Dispatch Endpoints
+Resolve inbound calls to the agent that answers them
+"""
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, status
+
+from app.core.config import settings
+from app.core.security import create_media_stream_token
+from app.schemas.call_routing import InboundCallRequest, InboundCallRoute
+from app.services.call_routing import call_router
+
+router = APIRouter()
+
+
+def verify_telephony_secret(secret: Optional[str]):
+    """Provider webhooks authenticate with a shared secret; only DEBUG may run without one"""
+    if not settings.TELEPHONY_WEBHOOK_SECRET:
+        if settings.DEBUG:
+            return
+        print("Telephony Webhook Error: TELEPHONY_WEBHOOK_SECRET is not set; rejecting inbound call")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Telephony webhook secret is not configured"
+        )
+    if not hmac.compare_digest(secret or "", settings.TELEPHONY_WEBHOOK_SECRET):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid telephony secret"
+        )
+
+
+@router.post("/inbound", response_model=InboundCallRoute)
+async def dispatch_inbound_call(
+    call: InboundCallRequest,
+    x_telephony_secret: Optional[str] = Header(None)
+):
+    """
+    Resolve the dialed number to its agent from the in-memory routing index.
+    No database access on this path.
+    """
+    verify_telephony_secret(x_telephony_secret)
+    
+    route = call_router.resolve(call.to_number)
+    if route is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No active agent for this number"
+        )
+    
+    return InboundCallRoute(
+        agent_id=route.agent_id,
+        user_id=route.user_id,
+        phone_number_id=route.phone_number_id,
+        number=route.number,
+        media_stream_url=f"/api/v1/ws/telephony/{route.agent_id}?token={create_media_stream_token(route.agent_id)}",
+        routing_version=call_router.version
+    )
@@ -0,0 +1,187 @@
+"""
+Campaign Endpoints
+Outbound calling campaigns and their contact lists
+"""
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_principal, Principal
+from app.models.ai_agent import AIAgent
+from app.models.campaign import Campaign
+from app.models.phone_number import PhoneNumber
+from app.schemas.campaign import (
+    CampaignCreate, CampaignResponse, CampaignContactsAdd, CampaignContactsAdded
+)
+from app.services.campaign_service import add_contacts, contact_counts
+from app.services.dialer import dialer_unavailable_reason
+
+router = APIRouter()
+
+
+async def _get_campaign_or_404(db: AsyncSession, user_id: int, campaign_id: int) -> Campaign:
+    result = await db.execute(
+        select(Campaign).where(
+            Campaign.id == campaign_id,
+            Campaign.user_id == user_id
+        )
+    )
+    campaign = result.scalar_one_or_none()
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found"
+        )
+    return campaign
+
+
+async def _campaign_response(db: AsyncSession, campaign: Campaign) -> CampaignResponse:
+    counts = await contact_counts(db, [campaign.id])
+    response = CampaignResponse.model_validate(campaign)
+    response.contacts_by_status = counts[campaign.id]
+    return response
+
+
+@router.post("", response_model=CampaignResponse, status_code=status.HTTP_201_CREATED)
+async def create_campaign(
+    campaign_data: CampaignCreate,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create an outbound campaign (in draft) with an optional initial contact list"""
+    agent = await db.execute(
+        select(AIAgent.id).where(AIAgent.id == campaign_data.agent_id, AIAgent.user_id == current_user.id)
+    )
+    if agent.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="AI agent not found"
+        )
+    
+    phone = await db.execute(
+        select(PhoneNumber.id).where(
+            PhoneNumber.id == campaign_data.phone_number_id,
+            PhoneNumber.user_id == current_user.id
+        )
+    )
+    if phone.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Phone number not found"
+        )
+    
+    new_campaign = Campaign(
+        user_id=current_user.id,
+        status="draft",
+        **campaign_data.model_dump(exclude={"contacts"})
+    )
+    db.add(new_campaign)
+    await db.flush()
+    if campaign_data.contacts:
+        await add_contacts(db, new_campaign.id, campaign_data.contacts)
+    await db.commit()
+    await db.refresh(new_campaign)
+    return await _campaign_response(db, new_campaign)
+
+
+@router.get("", response_model=List[CampaignResponse])
+async def get_campaigns(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get all campaigns for current user, with contact progress"""
+    result = await db.execute(
+        select(Campaign).where(Campaign.user_id == current_user.id).order_by(Campaign.id.desc())
+    )
+    campaigns = result.scalars().all()
+    counts = await contact_counts(db, [campaign.id for campaign in campaigns])
+    
+    responses = []
+    for campaign in campaigns:
+        response = CampaignResponse.model_validate(campaign)
+        response.contacts_by_status = counts[campaign.id]
+        responses.append(response)
+    return responses
+
+
+@router.get("/{campaign_id}", response_model=CampaignResponse)
+async def get_campaign(
+    campaign_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a specific campaign with contact progress (must belong to current user)"""
+    campaign = await _get_campaign_or_404(db, current_user.id, campaign_id)
+    return await _campaign_response(db, campaign)
+
+
+@router.post("/{campaign_id}/contacts", response_model=CampaignContactsAdded)
+async def add_campaign_contacts(
+    campaign_id: int,
+    contacts_data: CampaignContactsAdd,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add contacts to a campaign; numbers already in the campaign are skipped"""
+    campaign = await _get_campaign_or_404(db, current_user.id, campaign_id)
+    added, skipped = await add_contacts(db, campaign.id, contacts_data.contacts)
+    # New contacts reopen a finished campaign
+    if added and campaign.status == "completed":
+        campaign.status = "running"
+    await db.commit()
+    return CampaignContactsAdded(added=added, skipped=skipped)
+
+
+async def _set_status(db: AsyncSession, user_id: int, campaign_id: int, new_status: str, allowed: tuple) -> CampaignResponse:
+    campaign = await _get_campaign_or_404(db, user_id, campaign_id)
+    if campaign.status not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot change a {campaign.status} campaign to {new_status}"
+        )
+    campaign.status = new_status
+    await db.commit()
+    await db.refresh(campaign)
+    return await _campaign_response(db, campaign)
+
+
+@router.post("/{campaign_id}/start", response_model=CampaignResponse)
+async def start_campaign(
+    campaign_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Start or resume dialing; calls are placed only inside the calling window"""
+    # A running campaign nothing dials would sit in "running" forever
+    reason = dialer_unavailable_reason()
+    if reason:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=reason
+        )
+    return await _set_status(db, current_user.id, campaign_id, "running", ("draft", "paused"))
+
+
+@router.post("/{campaign_id}/pause", response_model=CampaignResponse)
+async def pause_campaign(
+    campaign_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stop placing new calls; calls in progress finish normally"""
+    return await _set_status(db, current_user.id, campaign_id, "paused", ("running",))
+
+
+@router.delete("/{campaign_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_campaign(
+    campaign_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a campaign and its contacts (must belong to current user)"""
+    campaign = await _get_campaign_or_404(db, current_user.id, campaign_id)
+    await db.execute(delete(Campaign).where(Campaign.id == campaign.id))
+    await db.commit()
+    return None
@@ -2,12 +2,12 @@
 Dashboard Endpoints
 Statistics and summary data
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import get_current_principal, Principal
+from app.core.etag import weak_etag, etag_matches, cache_headers, not_modified
 from app.services.dashboard_service import get_dashboard_stats
 
 router = APIRouter()
@@ -15,10 +15,18 @@ router = APIRouter()
 
 @router.get("/stats")
 async def get_dashboard_statistics(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get dashboard statistics for current user"""
+    """Get dashboard statistics for current user (answers If-None-Match with 304)"""
     stats = await get_dashboard_stats(db, current_user.id)
+    # Stats are served from the counters cache, so the tag is hashed from the values
+    etag = weak_etag("dashboard", current_user.id, *stats.model_dump().values())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    response.headers.update(cache_headers(etag))
     return stats
 
@@ -2,17 +2,22 @@
 Order Endpoints
 CRUD operations for orders/data capture
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, delete, tuple_
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import get_current_principal, Principal
+from app.core.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.core.serialization import schema_columns, rows_response
+from app.core.etag import collection_etag, etag_matches, cache_headers, not_modified
 from app.models.order import Order
 from app.models.call_log import CallLog
 from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
+from app.services.counter_service import apply_counter_deltas
+from app.services.export_service import export_response, export_range
 
 router = APIRouter()
 
@@ -20,7 +25,7 @@ router = APIRouter()
 @router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order_data: OrderCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new order for current user"""
@@ -43,6 +48,7 @@ async def create_order(
         **order_data.model_dump()
     )
     db.add(new_order)
+    await apply_counter_deltas(db, current_user.id, total_orders=1)
     await db.commit()
     await db.refresh(new_order)
     return new_order
@@ -50,27 +56,74 @@ async def create_order(
 
 @router.get("", response_model=List[OrderResponse])
 async def get_orders(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all orders for current user with pagination"""
-    result = await db.execute(
-        select(Order)
+    """
+    Get all orders for current user with pagination.
+    Pass the X-Next-Cursor header of one page as `cursor` to fetch the next;
+    `skip` is kept for offset paging. Answers If-None-Match with 304.
+    """
+    etag = await collection_etag(db, Order, current_user.id, skip, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    query = (
+        select(*schema_columns(Order, OrderResponse))
         .where(Order.user_id == current_user.id)
-        .order_by(desc(Order.created_at))
-        .offset(skip)
+        .order_by(desc(Order.created_at), desc(Order.id))
         .limit(limit)
     )
-    orders = result.scalars().all()
-    return orders
+    if cursor:
+        query = query.where(tuple_(Order.created_at, Order.id) < decode_cursor(cursor))
+    else:
+        query = query.offset(skip)
+    
+    result = await db.execute(query)
+    orders = result.all()
+    
+    headers = cache_headers(etag)
+    if len(orders) == limit:
+        last = orders[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return rows_response(OrderResponse, orders, headers)
+
+
+@router.get("/export")
+async def export_orders(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    start: Optional[datetime] = Query(None, description="Only orders created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only orders created before this time"),
+    call_id: Optional[str] = Query(None, description="Only orders captured on this call"),
+    gzip: bool = Query(False),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Stream all matching orders for current user as CSV or NDJSON"""
+    start, end = export_range(start, end)
+    columns = list(OrderResponse.model_fields)
+    query = (
+        select(*[getattr(Order, column) for column in columns])
+        .where(Order.user_id == current_user.id)
+        .order_by(Order.created_at, Order.id)
+    )
+    if start:
+        query = query.where(Order.created_at >= start)
+    if end:
+        query = query.where(Order.created_at < end)
+    if call_id:
+        query = query.where(Order.call_id == call_id)
+    
+    return export_response(query, columns, format, gzip, "orders")
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific order by ID (must belong to current user)"""
@@ -95,7 +148,7 @@ async def get_order(
 async def update_order(
     order_id: int,
     order_data: OrderUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update an order (must belong to current user)"""
@@ -126,7 +179,7 @@ async def update_order(
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_order(
     order_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete an order (must belong to current user)"""
@@ -145,6 +198,7 @@ async def delete_order(
         )
     
     await db.execute(delete(Order).where(Order.id == order_id))
+    await apply_counter_deltas(db, current_user.id, total_orders=-1)
     await db.commit()
     return None
 
@@ -3,15 +3,18 @@ Phone Number Endpoints
 CRUD operations for phone numbers
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import get_current_principal, Principal
+from app.core.serialization import schema_columns, rows_response
+from app.core.etag import collection_etag, etag_matches, cache_headers, not_modified
 from app.models.phone_number import PhoneNumber
 from app.schemas.phone_number import PhoneNumberCreate, PhoneNumberUpdate, PhoneNumberResponse
+from app.services.counter_service import apply_counter_deltas
+from app.services.call_routing import call_router
 
 router = APIRouter()
 
@@ -19,7 +22,7 @@ router = APIRouter()
 @router.post("", response_model=PhoneNumberResponse, status_code=status.HTTP_201_CREATED)
 async def create_phone_number(
     phone_data: PhoneNumberCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new phone number for current user"""
@@ -28,6 +31,11 @@ async def create_phone_number(
         **phone_data.model_dump()
     )
     db.add(new_phone)
+    await apply_counter_deltas(
+        db, current_user.id,
+        total_phone_numbers=1,
+        active_phone_numbers=int(new_phone.status == "active")
+    )
     await db.commit()
     await db.refresh(new_phone)
     return new_phone
@@ -35,21 +43,25 @@ async def create_phone_number(
 
 @router.get("", response_model=List[PhoneNumberResponse])
 async def get_phone_numbers(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all phone numbers for current user"""
+    """Get all phone numbers for current user (answers If-None-Match with 304)"""
+    etag = await collection_etag(db, PhoneNumber, current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     result = await db.execute(
-        select(PhoneNumber).where(PhoneNumber.user_id == current_user.id)
+        select(*schema_columns(PhoneNumber, PhoneNumberResponse)).where(PhoneNumber.user_id == current_user.id)
     )
-    phone_numbers = result.scalars().all()
-    return phone_numbers
+    return rows_response(PhoneNumberResponse, result.all(), cache_headers(etag))
 
 
 @router.get("/{phone_id}", response_model=PhoneNumberResponse)
 async def get_phone_number(
     phone_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific phone number by ID (must belong to current user)"""
@@ -74,7 +86,7 @@ async def get_phone_number(
 async def update_phone_number(
     phone_id: int,
     phone_data: PhoneNumberUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update a phone number (must belong to current user)"""
@@ -93,19 +105,25 @@ async def update_phone_number(
         )
     
     # Update fields
+    was_active = phone_number.status == "active"
     update_data = phone_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(phone_number, field, value)
     
+    await apply_counter_deltas(
+        db, current_user.id,
+        active_phone_numbers=int(phone_number.status == "active") - int(was_active)
+    )
     await db.commit()
     await db.refresh(phone_number)
+    await call_router.refresh_phones([phone_id])
     return phone_number
 
 
 @router.delete("/{phone_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_phone_number(
     phone_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a phone number (must belong to current user)"""
@@ -124,6 +142,12 @@ async def delete_phone_number(
         )
     
     await db.execute(delete(PhoneNumber).where(PhoneNumber.id == phone_id))
+    await apply_counter_deltas(
+        db, current_user.id,
+        total_phone_numbers=-1,
+        active_phone_numbers=-int(phone_number.status == "active")
+    )
     await db.commit()
+    await call_router.refresh_phones([phone_id])
     return None
 
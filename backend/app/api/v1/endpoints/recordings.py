@@ -0,0 +1,87 @@
+"""
+Call Recording Endpoints
+Recording metadata and ranged playback by call_id
+"""
+import os
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_principal, Principal
+from app.core.file_streaming import range_file_response
+from app.schemas.call_recording import CallRecordingResponse, CallRecordingTrack
+from app.services.recording_service import recording_service, CALLER_TRACK, AGENT_TRACK
+
+router = APIRouter()
+
+
+async def _get_recording_or_404(db: AsyncSession, user_id: int, call_id: str):
+    recording = await recording_service.get_recording(db, user_id, call_id)
+    if not recording:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found"
+        )
+    return recording
+
+
+@router.get("/{call_id}", response_model=CallRecordingResponse)
+async def get_call_recording(
+    call_id: str,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a call's recording and its tracks (must belong to current user)"""
+    recording = await _get_recording_or_404(db, current_user.id, call_id)
+    
+    tracks = []
+    for track in (CALLER_TRACK, AGENT_TRACK):
+        path, media_type = recording_service.track_file(recording, track)
+        if path:
+            tracks.append(CallRecordingTrack(
+                name=track,
+                media_type=media_type,
+                bytes=os.path.getsize(path) if os.path.exists(path) else 0,
+                url=f"/api/v1/recordings/{call_id}/{track}"
+            ))
+    
+    return CallRecordingResponse(
+        call_id=recording.call_id,
+        agent_id=recording.agent_id,
+        status=recording.status,
+        duration=recording.duration or 0.0,
+        dropped_chunks=recording.dropped_chunks or 0,
+        started_at=recording.started_at,
+        finished_at=recording.finished_at,
+        tracks=tracks
+    )
+
+
+@router.get("/{call_id}/{track}")
+async def stream_call_recording(
+    call_id: str,
+    track: Literal["caller", "agent"],
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream one track of a call recording. Supports Range requests, so players
+    can seek within long calls; only the requested bytes are read.
+    """
+    recording = await _get_recording_or_404(db, current_user.id, call_id)
+    if recording.status == "recording":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Recording is still in progress"
+        )
+    
+    path, media_type = recording_service.track_file(recording, track)
+    if not path or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Track not found"
+        )
+    
+    return range_file_response(path, media_type, request.headers.get("range"))
@@ -0,0 +1,161 @@
+"""
+Telephony media-stream gateway
+Bridges provider media streams (base64 μ-law 8 kHz frames with start / media /
+mark / stop events) straight into the STT -> Brain -> TTS pipeline.
+"""
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+import asyncio
+import base64
+import json
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.security import verify_media_stream_token
+from app.services.agent.core import agent_core
+from app.services.agent.voice import voice_service
+from app.services.agent_config_cache import agent_config_cache
+from app.services.telephony.codec import (
+    TELEPHONY_SAMPLE_RATE, STT_SAMPLE_RATE, ULAW_FRAME_BYTES,
+    ulaw_to_pcm16, resample_linear, pcm16_to_wav, frames
+)
+from app.services.telephony.media import UtteranceSegmenter
+
+router = APIRouter()
+
+
+@router.websocket("/ws/telephony/{agent_id}")
+async def telephony_media_stream(websocket: WebSocket, agent_id: int, token: Optional[str] = Query(None)):
+    """
+    Media-stream WebSocket for phone calls.
+    Only opened with the signed media_stream_url that /calls/inbound returned for this agent,
+    since every turn is billed to the agent's tenant.
+    Caller audio is decoded, endpointed and upsampled into STT; the agent's reply is
+    synthesized as μ-law 8 kHz and sent back as 20 ms media frames followed by a mark.
+    """
+    if not verify_media_stream_token(token, agent_id):
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+
+    agent = await agent_config_cache.get(agent_id)
+    if not agent:
+        await websocket.close(code=1008)
+        return
+    master_prompt = agent.system_prompt
+    call_started = time.monotonic()
+    meter = (agent.user_id, agent.id)
+
+    stream_sid = None
+    session_id = f"call_{agent_id}"
+    segmenter = UtteranceSegmenter()
+    utterances: asyncio.Queue = asyncio.Queue()
+    pending_marks: set = set()
+    state = {"interrupted": False}
+
+    async def send_audio(ulaw: bytes):
+        for frame in frames(ulaw):
+            if state["interrupted"]:
+                return
+            await websocket.send_json({
+                "event": "media",
+                "streamSid": stream_sid,
+                "media": {"payload": base64.b64encode(frame).decode()}
+            })
+
+    def stt_wav(pcm: bytes) -> bytes:
+        return pcm16_to_wav(resample_linear(pcm, TELEPHONY_SAMPLE_RATE, STT_SAMPLE_RATE), STT_SAMPLE_RATE)
+
+    async def respond_turn(pcm: bytes, mark: str):
+        # Resampling a long utterance is CPU-bound; keep it off the event loop
+        wav = await asyncio.to_thread(stt_wav, pcm)
+        user_text = await voice_service.transcribe_audio(wav, meter=meter)
+        if not user_text:
+            return
+        state["interrupted"] = False
+
+        agent_result = await agent_core.process_turn(
+            session_id=session_id,
+            user_input=user_text,
+            master_prompt=master_prompt,
+            meter=meter
+        )
+
+        # The agent counts as speaking from the first frame until the provider echoes the mark
+        pending_marks.add(mark)
+
+        # ElevenLabs chunks are not frame aligned; carry the remainder over
+        remainder = b""
+        async for chunk in agent_core.generate_voice_response(agent_result["text"], output_format="ulaw_8000", meter=meter):
+            data = remainder + chunk
+            cut = len(data) - len(data) % ULAW_FRAME_BYTES
+            await send_audio(data[:cut])
+            remainder = data[cut:]
+        if remainder:
+            await send_audio(remainder)
+
+        if not state["interrupted"]:
+            await websocket.send_json({"event": "mark", "streamSid": stream_sid, "mark": {"name": mark}})
+
+    async def respond():
+        """Consumes caller utterances one turn at a time; a failed turn does not end the call"""
+        turn = 0
+        while True:
+            pcm = await utterances.get()
+            turn += 1
+            mark = f"turn_{turn}"
+            try:
+                await respond_turn(pcm, mark)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                pending_marks.discard(mark)
+                print(f"Telephony Turn Error: {str(e)}")
+
+    responder = asyncio.create_task(respond())
+    try:
+        while True:
+            message = json.loads(await websocket.receive_text())
+            event = message.get("event")
+
+            if event == "start":
+                start = message.get("start", {})
+                stream_sid = message.get("streamSid") or start.get("streamSid")
+                call_sid = start.get("callSid") or stream_sid
+                session_id = f"call_{call_sid}"
+
+            elif event == "media":
+                pcm = ulaw_to_pcm16(base64.b64decode(message["media"]["payload"]))
+                utterance = segmenter.feed(pcm)
+                # Barge-in: stop the agent's audio as soon as the caller talks over it
+                if segmenter.in_speech and pending_marks:
+                    state["interrupted"] = True
+                    pending_marks.clear()
+                    await websocket.send_json({"event": "clear", "streamSid": stream_sid})
+                if utterance:
+                    utterances.put_nowait(utterance)
+
+            elif event == "mark":
+                # The provider echoes our marks back once playback reaches them
+                pending_marks.discard(message.get("mark", {}).get("name"))
+
+            elif event == "stop":
+                break
+
+    except WebSocketDisconnect:
+        print(f"Telephony stream for agent {agent_id} disconnected.")
+    except Exception as e:
+        print(f"Telephony WS Error: {str(e)}")
+    finally:
+        responder.cancel()
+        await agent_core.end_call(session_id, {
+            "call_id": session_id,
+            "user_id": agent.user_id,
+            "agent_id": agent.id,
+            "channel": "telephony",
+            "duration": round(time.monotonic() - call_started, 2)
+        }, extract_orders=agent.configuration.get("extract_orders", settings.ORDER_EXTRACTION_DEFAULT))
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass
@@ -1,8 +1,8 @@
+from typing import AsyncGenerator, AsyncIterator, Optional
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.services.ai_service import ai_service
-import os
+from app.services.ai_service import ai_service, AIServiceError
 
 router = APIRouter()
 
@@ -10,37 +10,77 @@ class TestConversationRequest(BaseModel):
     user_input: str
     system_prompt: str = "You are a helpful AI assistant."
 
+
+async def _prime(stream: AsyncIterator) -> Optional[AsyncGenerator]:
+    """
+    Pulls the first item of a stream so failures surface as HTTP errors
+    before the response starts. Returns the stream with that item re-attached.
+    """
+    try:
+        first = await stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+    async def replay():
+        yield first
+        async for item in stream:
+            yield item
+
+    return replay()
+
+
 @router.post("/speak")
 async def test_speak(request: TestConversationRequest):
     """
     Test endpoint to verify Gemini + Edge TTS integration.
-    1. Sends user_input to Gemini.
-    2. Converts Gemini's response to speech using Edge TTS.
-    3. Returns the audio file.
+    1. Streams user_input to Gemini.
+    2. Pipes Gemini's response into Edge TTS sentence by sentence.
+    3. Streams the audio back as it is synthesized.
     """
     # 1. Generate text response
-    ai_response = await ai_service.generate_response(request.user_input, request.system_prompt)
-    
-    if ai_response.startswith("Error"):
-        raise HTTPException(status_code=500, detail=ai_response)
-        
+    try:
+        text_stream = await _prime(
+            ai_service.generate_response_stream(request.user_input, request.system_prompt)
+        )
+    except AIServiceError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if text_stream is None:
+        raise HTTPException(status_code=500, detail="Empty response from AI")
+
     # 2. Convert to speech
-    audio_path = await ai_service.text_to_speech(ai_response)
-    
-    if not audio_path or not os.path.exists(audio_path):
+    try:
+        audio_stream = await _prime(ai_service.speak_stream(text_stream))
+    except AIServiceError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        audio_stream = None
+
+    if audio_stream is None:
         raise HTTPException(status_code=500, detail="Failed to generate audio")
-        
-    # 3. Return audio file
-    return FileResponse(audio_path, media_type="audio/mpeg", filename="response.mp3")
+
+    # 3. Stream audio
+    return StreamingResponse(
+        audio_stream,
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": 'inline; filename="response.mp3"'}
+    )
 
 @router.post("/echo-speak")
 async def test_echo_speak(text: str):
     """
     Simple endpoint to test ONLY TTS (Text-to-Speech).
     """
-    audio_path = await ai_service.text_to_speech(text)
-    
-    if not audio_path or not os.path.exists(audio_path):
+    try:
+        audio_stream = await _prime(ai_service.stream_speech(text))
+    except Exception:
+        audio_stream = None
+
+    if audio_stream is None:
         raise HTTPException(status_code=500, detail="Failed to generate audio")
-        
-    return FileResponse(audio_path, media_type="audio/mpeg", filename="echo.mp3")
+
+    return StreamingResponse(
+        audio_stream,
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": 'inline; filename="echo.mp3"'}
+    )
@@ -0,0 +1,50 @@
+"""
+Usage Endpoints
+Metered LLM tokens, STT seconds and TTS characters per day and agent
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_principal, Principal
+from app.core.timestamps import to_naive_utc
+from app.schemas.usage import UsageResponse
+from app.services.usage_meter import get_usage
+
+router = APIRouter()
+
+MAX_RANGE = timedelta(days=366)
+DEFAULT_RANGE = timedelta(days=30)
+
+
+@router.get("", response_model=UsageResponse)
+async def get_usage_report(
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    agent_id: Optional[int] = Query(None),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Daily usage and estimated cost per agent for current user.
+    Usage is flushed periodically, so the latest few seconds may not be included yet.
+    """
+    # usage_daily days are naive UTC; comparing them with aware query values would fail
+    end = to_naive_utc(end) or datetime.utcnow()
+    start = to_naive_utc(start) or end - DEFAULT_RANGE
+    
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    if end - start > MAX_RANGE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Range too large"
+        )
+    
+    totals, items = await get_usage(db, current_user.id, start, end, agent_id=agent_id)
+    return UsageResponse(start=start, end=end, totals=totals, items=items)
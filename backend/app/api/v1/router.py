@@ -3,7 +3,7 @@ Main API Router
 Aggregates all endpoint routers
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, phone_numbers, ai_agents, call_logs, orders, dashboard, agent_ws
+from app.api.v1.endpoints import auth, phone_numbers, ai_agents, call_logs, orders, dashboard, agent_ws, calls, analytics, recordings, campaigns, usage
 
 api_router = APIRouter()
 
@@ -13,9 +13,15 @@ api_router.include_router(phone_numbers.router, prefix="/phone-numbers", tags=["
 api_router.include_router(ai_agents.router, prefix="/ai-agents", tags=["AI Agents"])
 api_router.include_router(call_logs.router, prefix="/call-logs", tags=["Call Logs"])
 api_router.include_router(orders.router, prefix="/orders", tags=["Orders"])
+api_router.include_router(calls.router, prefix="/calls", tags=["Calls"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(recordings.router, prefix="/recordings", tags=["Recordings"])
+api_router.include_router(campaigns.router, prefix="/campaigns", tags=["Campaigns"])
+api_router.include_router(usage.router, prefix="/usage", tags=["Usage"])
 
-from app.api.v1.endpoints import test_ai, agent_chat
+from app.api.v1.endpoints import test_ai, agent_chat, telephony_ws
 api_router.include_router(test_ai.router, prefix="/test-ai", tags=["Test AI"])
 api_router.include_router(agent_chat.router, prefix="/ai-agents", tags=["AI Agent Chat"])
 api_router.include_router(agent_ws.router, tags=["Agent WebSocket"])
+api_router.include_router(telephony_ws.router, tags=["Telephony WebSocket"])
 
@@ -2,15 +2,95 @@
 Database Configuration
 SQLAlchemy async setup for PostgreSQL
 """
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
 
+
+class PoolMetrics:
+    """Connection-checkout latency and timeout counters for the engine pool"""
+    def __init__(self, window: int = 1000):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits: deque = deque(maxlen=window)
+
+    def record_checkout(self, seconds: float):
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self.recent_waits.append(seconds)
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        recent = sorted(self.recent_waits)
+        p95 = recent[min(len(recent) - 1, int(0.95 * len(recent)))] if recent else 0.0
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "saturation": round(pool.checkedout() / capacity, 4) if capacity else 0.0,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "checkout_wait_ms": {
+                "avg": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "p95_recent": round(p95 * 1000, 3),
+                "max": round(self.max_wait * 1000, 3),
+            },
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection"""
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.record_checkout(time.perf_counter() - start)
+
+
+def _connect_args() -> Dict[str, Any]:
+    """
+    Transaction-pooling proxies (pgbouncer, Supabase pooler) hand each transaction
+    to a different server connection, so asyncpg must not cache prepared statements
+    and statement names must be unique.
+    """
+    if not settings.DB_PGBOUNCER_MODE:
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=_connect_args()
 )
 
 # Create async session factory
@@ -27,6 +107,39 @@ class Base(DeclarativeBase):
     pass
 
 
+def run_after_commit(session, callback: Callable[[], None]):
+    """
+    Runs callback once the session's current transaction commits, and drops it on rollback.
+    Cache invalidations go here, so no concurrent reader can re-cache pre-commit state.
+    """
+    session = getattr(session, "sync_session", session)
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session):
+    for callback in session.info.pop("after_commit", ()):
+        try:
+            callback()
+        except Exception as e:
+            print(f"After-commit Callback Error: {str(e)}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session):
+    session.info.pop("after_commit", None)
+
+
+def direct_dsn() -> str:
+    """asyncpg DSN for dedicated, long-lived session connections outside the pool"""
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Current pool occupancy and checkout metrics"""
+    return pool_metrics.snapshot(engine.sync_engine.pool)
+
+
 async def get_db():
     """Dependency for getting database session"""
     async with AsyncSessionLocal() as session:
@@ -34,4 +147,3 @@ async def get_db():
             yield session
         finally:
             await session.close()
-
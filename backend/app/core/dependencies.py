@@ -2,24 +2,72 @@
 Dependencies for FastAPI routes
 Authentication, database session, etc.
 """
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, event
+from sqlalchemy.orm import object_session
 
-from app.core.database import get_db
+from app.core.cache import TTLCache, SingleFlight
+from app.core.config import settings
+from app.core.database import get_db, run_after_commit
+from app.core.invalidation import invalidation_bus
 from app.core.security import decode_token
 from app.models.user import User
 
 security = HTTPBearer()
 
+PRINCIPAL_TOPIC = "principal"
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token"""
+
+@dataclass(frozen=True)
+class Principal:
+    """Lightweight, immutable view of the authenticated user"""
+    id: int
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    created_at: datetime
+
+
+# Authenticated principals by user id; concurrent misses for one user share a load
+principal_cache = TTLCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE
+)
+_principal_loads = SingleFlight()
+
+
+def invalidate_principal(user_id: int):
+    """Drop a cached principal here and in every other worker; call after the change is committed"""
+    principal_cache.invalidate(user_id)
+    invalidation_bus.publish_soon(PRINCIPAL_TOPIC, user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    # Flush time is still inside the transaction; a concurrent request could re-cache the old row
+    user_id = target.id
+    session = object_session(target)
+    if session is None:
+        invalidate_principal(user_id)
+    else:
+        run_after_commit(session, lambda: invalidate_principal(user_id))
+
+
+invalidation_bus.subscribe(
+    PRINCIPAL_TOPIC,
+    lambda key: principal_cache.invalidate(int(key)),
+    reset=principal_cache.clear
+)
+
+
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    """Validate the bearer token and return the user id it was issued for"""
     token = credentials.credentials
     payload = decode_token(token)
     
@@ -30,13 +78,69 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id: int = payload.get("sub")
+    user_id = payload.get("sub")
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
     
+    return int(user_id)
+
+
+async def _load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    result = await db.execute(
+        select(User.id, User.email, User.full_name, User.is_active, User.created_at)
+        .where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    
+    principal = Principal(
+        id=row.id,
+        email=row.email,
+        full_name=row.full_name,
+        is_active=bool(row.is_active),
+        created_at=row.created_at
+    )
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Get current authenticated principal from JWT token, served from cache when possible"""
+    user_id = _token_user_id(credentials)
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = await _principal_loads.do(user_id, lambda: _load_principal(db, user_id))
+    
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    
+    return principal
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Get current authenticated user from JWT token (full ORM entity, never cached)"""
+    user_id = _token_user_id(credentials)
+    
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
@@ -47,4 +151,3 @@ async def get_current_user(
         )
     
     return user
-
@@ -0,0 +1,50 @@
+"""
+Conditional GET helpers
+Weak ETags derived from a tenant collection's row count and newest updated_at,
+so a revalidation costs one index-only aggregate instead of loading rows.
+"""
+import hashlib
+from typing import Any, Dict
+from fastapi import Request, Response
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Per-user data: never shared caches, always revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+async def collection_etag(db: AsyncSession, model: Any, user_id: int, *variant: Any) -> str:
+    """
+    ETag for a tenant's rows of `model`. Any insert changes max(updated_at), any
+    update bumps it through onupdate, and any delete changes the count.
+    `variant` distinguishes different views (e.g. pages) of the same collection.
+    """
+    result = await db.execute(
+        select(func.count(), func.max(model.updated_at)).where(model.user_id == user_id)
+    )
+    count, last_updated = result.one()
+    return weak_etag(model.__tablename__, user_id, count, last_updated.isoformat() if last_updated else "", *variant)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match (RFC 9110 section 13.1.2)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -0,0 +1,75 @@
+"""
+File streaming with HTTP Range support
+Serves byte ranges of large files through a memory map, one bounded slice at a
+time, so a seek into a long recording never reads the whole file.
+"""
+import mmap
+import os
+import re
+from typing import Iterator, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+
+from app.core.config import settings
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) for a single-range header, None to serve the whole file.
+    Multi-range requests are answered with the whole file, which RFC 9110 allows.
+    """
+    if not header or "," in header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+def _iter_mmap(path: str, start: int, end: int) -> Iterator[bytes]:
+    """Runs in Starlette's threadpool, so page faults never block the event loop"""
+    chunk_size = settings.RECORDING_STREAM_CHUNK_BYTES
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        position = start
+        while position <= end:
+            stop = min(position + chunk_size, end + 1)
+            yield mapped[position:stop]
+            position = stop
+
+
+def range_file_response(path: str, media_type: str, range_header: Optional[str]) -> Response:
+    """200 with the whole file or 206 with the requested range, always with Accept-Ranges"""
+    size = os.path.getsize(path)
+    headers = {"Accept-Ranges": "bytes"}
+    if size == 0:
+        return Response(content=b"", media_type=media_type, headers=headers)
+
+    byte_range = parse_range(range_header, size)
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        _iter_mmap(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=media_type,
+        headers=headers
+    )
@@ -0,0 +1,112 @@
+"""
+Cross-worker cache invalidation
+Publishes invalidations with Postgres NOTIFY and listens on one dedicated
+asyncpg connection per worker, so in-process caches in every worker drop an
+entry shortly after any worker changes it. Cache TTLs remain the safety net
+for messages missed while a listener was disconnected.
+"""
+import asyncio
+import json
+import uuid
+from typing import Callable, Dict, List, Optional, Set
+import asyncpg
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine, direct_dsn
+
+INVALIDATION_CHANNEL = "cache_invalidation"
+LISTENER_PING_SECONDS = 30.0
+LISTENER_RECONNECT_SECONDS = 5.0
+
+
+class InvalidationBus:
+    def __init__(self):
+        # Lets a worker skip its own messages; it already invalidated locally
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self._resets: List[Callable[[], None]] = []
+        self._publishing: Set[asyncio.Task] = set()
+        self.connected = False
+        self.published = 0
+        self.received = 0
+
+    def subscribe(self, topic: str, handler: Callable[[str], None], reset: Optional[Callable[[], None]] = None):
+        """
+        handler(key) runs for every invalidation of `topic` from another worker.
+        reset() runs whenever the listener (re)connects, since messages may have been missed.
+        """
+        self._handlers.setdefault(topic, []).append(handler)
+        if reset:
+            self._resets.append(reset)
+
+    async def publish(self, topic: str, key):
+        if not settings.INVALIDATION_BUS_ENABLED:
+            return
+        payload = json.dumps({"topic": topic, "key": str(key), "origin": self.origin})
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": INVALIDATION_CHANNEL, "payload": payload}
+                )
+            self.published += 1
+        except Exception as e:
+            print(f"Invalidation Publish Error: {str(e)}")
+
+    def publish_soon(self, topic: str, key):
+        """publish() from synchronous code such as after-commit hooks; a no-op outside an event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.publish(topic, key))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    def _dispatch(self, connection, pid, channel, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.origin:
+            return
+        self.received += 1
+        for handler in self._handlers.get(message.get("topic"), ()):
+            handler(message.get("key"))
+
+    async def run(self):
+        """Listener loop, started from the application lifespan"""
+        if not settings.INVALIDATION_BUS_ENABLED:
+            return
+        if settings.DB_PGBOUNCER_MODE:
+            # LISTEN needs a session; transaction poolers do not keep one
+            print("Invalidation bus disabled in pgbouncer mode; caches rely on TTLs")
+            return
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(direct_dsn())
+                await connection.add_listener(INVALIDATION_CHANNEL, self._dispatch)
+                self.connected = True
+                for reset in self._resets:
+                    reset()
+                while True:
+                    await asyncio.sleep(LISTENER_PING_SECONDS)
+                    await connection.fetchval("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Invalidation Listener Error: {str(e)}")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(LISTENER_RECONNECT_SECONDS)
+
+    def stats(self):
+        return {"connected": self.connected, "published": self.published, "received": self.received}
+
+
+invalidation_bus = InvalidationBus()
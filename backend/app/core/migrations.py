@@ -0,0 +1,156 @@
+"""
+Schema Migrations
+Versioned, idempotent migrations recorded in schema_migrations.
+Startup only compares applied versions against the known ones (one small query);
+pending migrations are applied under a Postgres advisory lock, so concurrent
+workers or deploys never run them twice.
+"""
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Awaitable, Callable, List, Optional, Set
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.database import engine
+
+MIGRATIONS_PACKAGE = "app.migrations"
+MIGRATION_LOCK_KEY = 728002
+
+CREATE_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT (now() at time zone 'utc')
+)
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    transactional: bool
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+
+def _load(module: ModuleType) -> Migration:
+    return Migration(
+        version=module.VERSION,
+        name=module.__name__.rsplit(".", 1)[-1],
+        # Statements like CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        transactional=getattr(module, "TRANSACTIONAL", True),
+        upgrade=module.upgrade
+    )
+
+
+def discover_migrations() -> List[Migration]:
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = [
+        _load(importlib.import_module(f"{MIGRATIONS_PACKAGE}.{info.name}"))
+        for info in pkgutil.iter_modules(package.__path__)
+        if info.name.startswith("v")
+    ]
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_PACKAGE}")
+    return migrations
+
+
+async def applied_versions(conn: AsyncConnection) -> Set[int]:
+    exists = await conn.scalar(text("SELECT to_regclass('schema_migrations') IS NOT NULL"))
+    if not exists:
+        return set()
+    result = await conn.execute(text("SELECT version FROM schema_migrations"))
+    return set(result.scalars().all())
+
+
+async def pending_migrations() -> List[Migration]:
+    """Fast "is the schema current" check used at startup"""
+    async with engine.connect() as conn:
+        applied = await applied_versions(conn)
+    return [m for m in discover_migrations() if m.version not in applied]
+
+
+async def migrate(target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations up to `target` (default: latest) in version order.
+    Returns the migrations that this call applied.
+    """
+    applied_now = []
+    async with engine.connect() as lock_conn:
+        lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            await lock_conn.execute(text(CREATE_VERSION_TABLE))
+            # Re-read under the lock: another worker may have just finished
+            applied = await applied_versions(lock_conn)
+            for migration in discover_migrations():
+                if migration.version in applied or (target is not None and migration.version > target):
+                    continue
+                print(f"Applying migration {migration.name}...")
+                if migration.transactional:
+                    async with engine.begin() as conn:
+                        await migration.upgrade(conn)
+                        await _record(conn, migration)
+                else:
+                    await migration.upgrade(lock_conn)
+                    await _record(lock_conn, migration)
+                applied_now.append(migration)
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return applied_now
+
+
+async def _record(conn: AsyncConnection, migration: Migration):
+    await conn.execute(
+        text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+        {"version": migration.version, "name": migration.name}
+    )
+
+
+async def ensure_schema():
+    """
+    Startup hook: one query when the schema is current. Pending migrations are
+    applied when MIGRATE_ON_STARTUP is set, otherwise only reported. Never in
+    pgbouncer mode: the session advisory lock would stay on a pooled server connection.
+    """
+    pending = await pending_migrations()
+    if not pending:
+        return
+    if settings.MIGRATE_ON_STARTUP and not settings.DB_PGBOUNCER_MODE:
+        await migrate()
+    else:
+        names = ", ".join(m.name for m in pending)
+        print(
+            f"Schema Warning: {len(pending)} pending migration(s) ({names}); "
+            "run `python migrate.py` against a direct connection"
+        )
+
+
+# --- Helpers for migration modules ---
+
+async def create_tables(conn: AsyncConnection, *tables):
+    """CREATE TABLE IF NOT EXISTS for the given SQLAlchemy tables (and their indexes)"""
+    await conn.run_sync(lambda sync_conn: [table.create(sync_conn, checkfirst=True) for table in tables])
+
+
+async def create_index_concurrently(conn: AsyncConnection, name: str, table: str, columns: str):
+    """
+    Online index build: does not block writes. Must run on an autocommit
+    connection (TRANSACTIONAL = False). An invalid index left behind by an
+    interrupted build is dropped and rebuilt.
+    """
+    invalid = await conn.scalar(
+        text(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+        ),
+        {"name": name}
+    )
+    if invalid:
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    await conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"))
@@ -0,0 +1,300 @@
+"""
+Request Profiling
+Per-route latency, query count and DB time, measured by a pure ASGI middleware
+and SQLAlchemy engine events; a slow-query log with bound-parameter shapes;
+an on-demand sampling profiler for single requests; and query budgets that let
+tests fail on N+1 regressions.
+"""
+import os
+import re
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import engine
+
+PROFILE_HEADER = b"x-profile"
+LATENCY_SAMPLES = 500
+MAX_LOGGED_STATEMENT = 500
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More queries ran inside a query_budget block than it allows."""
+
+
+class RequestProfile:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+class QueryBudget:
+    def __init__(self, max_queries: int):
+        self.max_queries = max_queries
+        self.statements: List[str] = []
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+# Active budgets see statements run by requests (TestClient serves them on another thread) and by
+# the code inside the budget block itself; background loops have neither context and are not counted
+_budgets: List[QueryBudget] = []
+_inside_budget: ContextVar[bool] = ContextVar("inside_query_budget", default=False)
+
+
+def compact_statement(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= MAX_LOGGED_STATEMENT else statement[:MAX_LOGGED_STATEMENT] + "..."
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Types (and sizes) of bound parameters, never their values"""
+    if isinstance(parameters, dict):
+        return {key: parameter_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, list) and parameters and isinstance(parameters[0], (dict, tuple, list)):
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, (tuple, list)):
+        return [parameter_shape(value) for value in parameters]
+    if isinstance(parameters, (str, bytes)):
+        return f"{type(parameters).__name__}[{len(parameters)}]"
+    return type(parameters).__name__
+
+
+# --- Engine events ---
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.queries += 1
+        profile.db_seconds += elapsed
+    if _budgets and (profile is not None or _inside_budget.get()):
+        for budget in _budgets:
+            budget.statements.append(compact_statement(statement))
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        print(
+            f"Slow Query ({elapsed * 1000:.1f} ms): {compact_statement(statement)} "
+            f"params={parameter_shape(parameters)}"
+        )
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(exception_context):
+    # Keep the timing stack balanced when a statement fails
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """
+    Fails with QueryBudgetExceeded if the block runs more than max_queries statements:
+
+        with query_budget(3):
+            client.get("/api/v1/ai-agents")
+    """
+    budget = QueryBudget(max_queries)
+    _budgets.append(budget)
+    token = _inside_budget.set(True)
+    try:
+        yield budget
+    finally:
+        _inside_budget.reset(token)
+        _budgets.remove(budget)
+    if len(budget.statements) > max_queries:
+        listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(budget.statements))
+        raise QueryBudgetExceeded(
+            f"{len(budget.statements)} queries ran, budget is {max_queries}:\n{listing}"
+        )
+
+
+# --- Per-route statistics ---
+
+class RouteStats:
+    __slots__ = ("count", "errors", "total_seconds", "max_seconds", "queries", "max_queries", "db_seconds", "latencies")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_seconds = 0.0
+        self.latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, seconds: float, status: int, profile: RequestProfile):
+        self.count += 1
+        self.errors += status >= 500
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.queries += profile.queries
+        self.max_queries = max(self.max_queries, profile.queries)
+        self.db_seconds += profile.db_seconds
+        self.latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = sorted(self.latencies)
+
+        def percentile(q: float) -> float:
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))] * 1000, 3) if recent else 0.0
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "latency_ms": {
+                "avg": round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0,
+                "p50_recent": percentile(0.5),
+                "p95_recent": percentile(0.95),
+                "max": round(self.max_seconds * 1000, 3),
+            },
+            "queries": {
+                "avg": round(self.queries / self.count, 2) if self.count else 0.0,
+                "max": self.max_queries,
+            },
+            "db_ms_avg": round(self.db_seconds / self.count * 1000, 3) if self.count else 0.0,
+        }
+
+
+def _route_key(scope) -> str:
+    """Route template (not the raw path), so the number of keys stays bounded"""
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return f"{scope['method']} {route.path}"
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        return f"{scope['method']} {endpoint.__name__}"
+    return f"{scope['method']} <unmatched>"
+
+
+class _SamplingProfiler:
+    """pyinstrument when installed, cProfile otherwise; output goes to PROFILES_DIR"""
+    def __init__(self):
+        self.profile_id = uuid.uuid4().hex
+        try:
+            from pyinstrument import Profiler
+            self._profiler = Profiler(async_mode="enabled")
+            self._sampling = True
+        except ImportError:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._sampling = False
+
+    def start(self):
+        if self._sampling:
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self, label: str):
+        os.makedirs(settings.PROFILES_DIR, exist_ok=True)
+        path = os.path.join(settings.PROFILES_DIR, f"{self.profile_id}.txt")
+        if self._sampling:
+            self._profiler.stop()
+            output = self._profiler.output_text(unicode=True, show_all=False)
+        else:
+            import io
+            import pstats
+            self._profiler.disable()
+            buffer = io.StringIO()
+            pstats.Stats(self._profiler, stream=buffer).sort_stats("cumulative").print_stats(40)
+            output = buffer.getvalue()
+        with open(path, "w") as f:
+            f.write(f"{label}\n\n{output}")
+        print(f"Request Profile ({label}) written to {path}")
+
+
+class RequestProfiler:
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = {}
+
+    def record(self, key: str, seconds: float, status: int, profile: RequestProfile):
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        stats.record(seconds, status, profile)
+
+    def stats(self) -> Dict[str, Any]:
+        return {key: stats.snapshot() for key, stats in sorted(self.routes.items())}
+
+
+request_profiler = RequestProfiler()
+
+
+def _profiling_requested(scope) -> bool:
+    if not settings.PROFILING_TOKEN:
+        return False
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1") == settings.PROFILING_TOKEN
+    return False
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware), so streaming responses pass through untouched.
+    Adds a Server-Timing header with total and DB time, and records per-route stats.
+    Requests carrying "X-Profile: <PROFILING_TOKEN>" also run under the sampling profiler;
+    the response's X-Profile-Id names the report written to PROFILES_DIR.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        sampler = _SamplingProfiler() if _profiling_requested(scope) else None
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'app;dur={elapsed:.1f}, db;dur={profile.db_seconds * 1000:.1f};desc="{profile.queries} queries"'
+                )
+                headers = [*message.get("headers", []), (b"server-timing", timing.encode())]
+                if sampler:
+                    headers.append((b"x-profile-id", sampler.profile_id.encode()))
+                message["headers"] = headers
+            await send(message)
+
+        if sampler:
+            try:
+                sampler.start()
+            except Exception as e:
+                # Only one deterministic profiler can run per thread
+                print(f"Request Profile Error: {str(e)}")
+                sampler = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = time.perf_counter() - started
+            _current_profile.reset(token)
+            key = _route_key(scope)
+            request_profiler.record(key, seconds, status, profile)
+            if sampler:
+                sampler.stop(f"{key} {status} {seconds * 1000:.1f} ms, {profile.queries} queries")
+            if profile.queries > settings.REQUEST_QUERY_WARN_THRESHOLD:
+                print(f"Query Count Warning: {key} ran {profile.queries} queries")
@@ -2,14 +2,30 @@
 Security utilities
 JWT token generation, password hashing, etc.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with other parameters are flagged by needs_update and upgraded on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt is CPU-bound and releases the GIL, so it runs on a small dedicated pool.
+# The semaphore bounds concurrent hashes so a login storm cannot monopolize the
+# pool; further callers wait on the semaphore, and that wait is not bounded.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_CONCURRENCY)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,6 +38,30 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_hashing(fn, *args):
+    async with _hash_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, fn, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password off the event loop"""
+    return await _run_hashing(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password off the event loop.
+    Returns (valid, new_hash); new_hash is set when the stored hash uses outdated parameters.
+    """
+    return await _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password off the event loop"""
+    return await _run_hashing(pwd_context.hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -44,6 +84,18 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
+def create_media_stream_token(agent_id: int) -> str:
+    """Short-lived token that lets a provider open one agent's telephony media stream"""
+    expire = datetime.utcnow() + timedelta(seconds=settings.MEDIA_STREAM_TOKEN_TTL_SECONDS)
+    to_encode = {"sub": str(agent_id), "exp": expire, "type": "media"}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def verify_media_stream_token(token: Optional[str], agent_id: int) -> bool:
+    payload = decode_token(token) if token else None
+    return payload is not None and payload.get("type") == "media" and payload.get("sub") == str(agent_id)
+
+
 def decode_token(token: str) -> Optional[dict]:
     """Decode and verify JWT token"""
     try:
@@ -51,4 +103,3 @@ def decode_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
-
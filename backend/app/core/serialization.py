@@ -0,0 +1,40 @@
+"""
+Fast JSON serialization for list endpoints
+Selects only the columns a response schema exposes and encodes the raw rows
+with orjson, skipping ORM identity-map loading and per-row Pydantic validation.
+The schema stays the single source of truth for the response shape.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Type
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def schema_fields(schema: Type[BaseModel]) -> List[str]:
+    return list(schema.model_fields)
+
+
+def schema_columns(model: Any, schema: Type[BaseModel]) -> list:
+    """ORM columns matching the fields of a response schema, in schema order"""
+    return [getattr(model, field) for field in schema.model_fields]
+
+
+def encode_rows(fields: List[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """
+    Rows come straight from our own tables with the schema's column types,
+    so they are encoded as-is. orjson writes datetimes as ISO 8601 like Pydantic.
+    """
+    return orjson.dumps([dict(zip(fields, row)) for row in rows])
+
+
+def rows_response(
+    schema: Type[BaseModel],
+    rows: Sequence[Sequence[Any]],
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """JSON list response for rows selected with schema_columns"""
+    return Response(
+        content=encode_rows(schema_fields(schema), rows),
+        media_type="application/json",
+        headers=headers
+    )
@@ -0,0 +1,13 @@
+"""
+Timestamp helpers
+Columns are naive UTC (datetime.utcnow); asyncpg rejects aware values for them
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Aware datetimes are converted to UTC and stripped; naive ones are taken as UTC already"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
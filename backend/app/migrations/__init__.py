@@ -0,0 +1,8 @@
+"""
+Schema migrations, applied in VERSION order by app.core.migrations.
+
+Each module is named v<NNNN>_<description>.py and defines VERSION and
+`async def upgrade(conn)`. Set TRANSACTIONAL = False for statements that
+cannot run in a transaction (CREATE INDEX CONCURRENTLY). Migrations must be
+idempotent so they apply cleanly to databases first built by create_all.
+"""
@@ -0,0 +1,18 @@
+"""Original tenant tables"""
+from app.core.migrations import create_tables
+from app.models.user import User
+from app.models.phone_number import PhoneNumber
+from app.models.ai_agent import AIAgent
+from app.models.agent_phone_mapping import AgentPhoneMapping
+from app.models.call_log import CallLog
+from app.models.order import Order
+
+VERSION = 1
+
+
+async def upgrade(conn):
+    await create_tables(
+        conn,
+        User.__table__, PhoneNumber.__table__, AIAgent.__table__,
+        AgentPhoneMapping.__table__, CallLog.__table__, Order.__table__
+    )
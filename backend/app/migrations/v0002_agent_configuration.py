@@ -0,0 +1,8 @@
+"""AI agent configuration column (formerly migrate_temp.py)"""
+from sqlalchemy import text
+
+VERSION = 2
+
+
+async def upgrade(conn):
+    await conn.execute(text("ALTER TABLE ai_agents ADD COLUMN IF NOT EXISTS configuration JSON DEFAULT '{}'"))
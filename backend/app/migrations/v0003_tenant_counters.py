@@ -0,0 +1,9 @@
+"""Per-tenant counters backing the dashboard"""
+from app.core.migrations import create_tables
+from app.models.tenant_counters import TenantCounters
+
+VERSION = 3
+
+
+async def upgrade(conn):
+    await create_tables(conn, TenantCounters.__table__)
@@ -0,0 +1,10 @@
+"""Keyset pagination indexes for call logs and orders"""
+from app.core.migrations import create_index_concurrently
+
+VERSION = 4
+TRANSACTIONAL = False
+
+
+async def upgrade(conn):
+    await create_index_concurrently(conn, "ix_call_logs_user_timestamp_id", "call_logs", "user_id, timestamp DESC, id DESC")
+    await create_index_concurrently(conn, "ix_orders_user_created_at_id", "orders", "user_id, created_at DESC, id DESC")
@@ -0,0 +1,9 @@
+"""Hourly / daily call rollups and back-fill checkpoints"""
+from app.core.migrations import create_tables
+from app.models.call_stats import CallStatsHourly, CallStatsDaily, RollupCheckpoint
+
+VERSION = 5
+
+
+async def upgrade(conn):
+    await create_tables(conn, CallStatsHourly.__table__, CallStatsDaily.__table__, RollupCheckpoint.__table__)
@@ -0,0 +1,10 @@
+"""(user_id, updated_at) indexes for conditional GET on tenant lists"""
+from app.core.migrations import create_index_concurrently
+
+VERSION = 6
+TRANSACTIONAL = False
+
+
+async def upgrade(conn):
+    for table in ("ai_agents", "phone_numbers", "orders"):
+        await create_index_concurrently(conn, f"ix_{table}_user_updated_at", table, "user_id, updated_at")
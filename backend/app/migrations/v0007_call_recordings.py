@@ -0,0 +1,9 @@
+"""Call recordings index"""
+from app.core.migrations import create_tables
+from app.models.call_recording import CallRecording
+
+VERSION = 7
+
+
+async def upgrade(conn):
+    await create_tables(conn, CallRecording.__table__)
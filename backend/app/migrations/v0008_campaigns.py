@@ -0,0 +1,9 @@
+"""Outbound campaigns and their contacts"""
+from app.core.migrations import create_tables
+from app.models.campaign import Campaign, CampaignContact
+
+VERSION = 8
+
+
+async def upgrade(conn):
+    await create_tables(conn, Campaign.__table__, CampaignContact.__table__)
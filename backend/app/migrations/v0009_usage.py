@@ -0,0 +1,9 @@
+"""Daily usage metering"""
+from app.core.migrations import create_tables
+from app.models.usage import UsageDaily
+
+VERSION = 9
+
+
+async def upgrade(conn):
+    await create_tables(conn, UsageDaily.__table__)
@@ -0,0 +1,21 @@
+"""Per-call order extraction markers, seeded from calls that already have orders"""
+from sqlalchemy import text
+
+from app.core.migrations import create_tables
+from app.models.order_extraction import OrderExtraction
+
+VERSION = 10
+
+SEED_MARKERS = """
+INSERT INTO order_extractions (call_id, user_id, orders, extracted_at)
+SELECT call_id, MIN(user_id), COUNT(*), MAX(created_at)
+FROM orders
+WHERE call_id IS NOT NULL
+GROUP BY call_id
+ON CONFLICT (call_id) DO NOTHING
+"""
+
+
+async def upgrade(conn):
+    await create_tables(conn, OrderExtraction.__table__)
+    await conn.execute(text(SEED_MARKERS))
@@ -3,7 +3,7 @@ AI Agent Model
 Stores AI agent configurations for each user (tenant)
 Future: Integration with AI voice services
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, Index, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -27,3 +27,6 @@ class AIAgent(Base):
     user = relationship("User", back_populates="ai_agents")
     agent_mappings = relationship("AgentPhoneMapping", back_populates="ai_agent", cascade="all, delete-orphan")
 
+
+# Conditional GET: count and max(updated_at) per tenant from an index-only scan
+Index("ix_ai_agents_user_updated_at", AIAgent.user_id, AIAgent.updated_at)
@@ -3,7 +3,7 @@ Call Log Model
 Stores call records for each user (tenant)
 Future: Integration with SIP/telephony webhooks
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -27,3 +27,10 @@ class CallLog(Base):
     phone_number = relationship("PhoneNumber", back_populates="call_logs")
     orders = relationship("Order", back_populates="call_log")
 
+
+# Keyset pagination: a tenant's calls, newest first, with id as tie-breaker
+Index(
+    "ix_call_logs_user_timestamp_id",
+    CallLog.user_id, CallLog.timestamp.desc(), CallLog.id.desc()
+)
+
@@ -0,0 +1,26 @@
+"""
+Call Recording Model
+Per-call audio tracks on disk, looked up by CallLog.call_id
+"""
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+
+class CallRecording(Base):
+    __tablename__ = "call_recordings"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    agent_id = Column(Integer, ForeignKey("ai_agents.id", ondelete="SET NULL"), nullable=True)
+    call_id = Column(String, unique=True, index=True, nullable=False)  # Same id as the call log
+    status = Column(String, default="recording")  # recording / complete / failed
+    storage_path = Column(String, nullable=False)  # Directory holding one file per track
+    caller_media_type = Column(String, nullable=True)  # As sent by the client, e.g. audio/webm
+    caller_bytes = Column(Integer, default=0)
+    agent_media_type = Column(String, default="audio/mpeg")
+    agent_bytes = Column(Integer, default=0)
+    dropped_chunks = Column(Integer, default=0)  # Chunks skipped because the writer fell behind
+    duration = Column(Float, default=0.0)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,54 @@
+"""
+Call Statistics Rollup Models
+Hourly and daily call aggregates per tenant, phone number, agent and status
+Filled incrementally on call ingest and back-filled by backfill_rollups.py
+"""
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy.orm import declared_attr
+from datetime import datetime
+from app.core.database import Base
+
+# Upper bounds (seconds) of the duration histogram buckets; the last bucket is open-ended
+DURATION_BUCKETS = (5, 15, 30, 60, 120, 300, 600, 1800)
+BUCKET_COLUMNS = tuple(f"bucket_{i}" for i in range(len(DURATION_BUCKETS) + 1))
+
+
+class CallStatsColumns:
+    """Shared rollup layout; phone_number_id / agent_id use 0 for 'none' so they can be key columns"""
+    @declared_attr
+    def user_id(cls):
+        return Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    bucket_start = Column(DateTime, primary_key=True)
+    phone_number_id = Column(Integer, primary_key=True, default=0)
+    agent_id = Column(Integer, primary_key=True, default=0)
+    status = Column(String, primary_key=True)
+    call_count = Column(Integer, nullable=False, default=0)
+    total_duration = Column(Float, nullable=False, default=0.0)
+    max_duration = Column(Float, nullable=False, default=0.0)
+    bucket_0 = Column(Integer, nullable=False, default=0)  # <= 5s
+    bucket_1 = Column(Integer, nullable=False, default=0)  # <= 15s
+    bucket_2 = Column(Integer, nullable=False, default=0)  # <= 30s
+    bucket_3 = Column(Integer, nullable=False, default=0)  # <= 60s
+    bucket_4 = Column(Integer, nullable=False, default=0)  # <= 2m
+    bucket_5 = Column(Integer, nullable=False, default=0)  # <= 5m
+    bucket_6 = Column(Integer, nullable=False, default=0)  # <= 10m
+    bucket_7 = Column(Integer, nullable=False, default=0)  # <= 30m
+    bucket_8 = Column(Integer, nullable=False, default=0)  # > 30m
+
+
+class CallStatsHourly(CallStatsColumns, Base):
+    __tablename__ = "call_stats_hourly"
+
+
+class CallStatsDaily(CallStatsColumns, Base):
+    __tablename__ = "call_stats_daily"
+
+
+class RollupCheckpoint(Base):
+    """Resume position of a back-fill job"""
+    __tablename__ = "rollup_checkpoints"
+    
+    job_name = Column(String, primary_key=True)
+    position = Column(DateTime, nullable=False)  # Everything before this has been back-filled
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,54 @@
+"""
+Campaign Models
+Outbound calling campaigns: a contact list dialed by one AI agent from one phone number
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Time, JSON, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime, time
+from app.core.database import Base
+
+
+class Campaign(Base):
+    __tablename__ = "campaigns"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    agent_id = Column(Integer, ForeignKey("ai_agents.id", ondelete="CASCADE"), nullable=False)
+    phone_number_id = Column(Integer, ForeignKey("phone_numbers.id", ondelete="CASCADE"), nullable=False)  # Caller ID
+    name = Column(String, nullable=False)
+    status = Column(String, default="draft")  # draft / running / paused / completed
+    window_start = Column(Time, default=time(9, 0))  # Local calling window, in `timezone`
+    window_end = Column(Time, default=time(20, 0))
+    timezone = Column(String, default="UTC")
+    max_attempts = Column(Integer, default=3)
+    retry_backoff_seconds = Column(Integer, default=600)  # Doubles after every failed attempt
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    contacts = relationship("CampaignContact", back_populates="campaign", cascade="all, delete-orphan")
+
+
+class CampaignContact(Base):
+    __tablename__ = "campaign_contacts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
+    phone = Column(String, nullable=False)  # Normalized E.164
+    name = Column(String, nullable=True)
+    variables = Column(JSON, default={})  # Per-contact details for the agent, e.g. appointment time
+    status = Column(String, default="pending")  # pending / dialing / completed / exhausted
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    last_call_id = Column(String, nullable=True)
+    last_outcome = Column(String, nullable=True)  # Status of the last call, e.g. busy / no-answer
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    campaign = relationship("Campaign", back_populates="contacts")
+
+
+# Scheduler claim: a campaign's due contacts, earliest first
+Index(
+    "ix_campaign_contacts_claim",
+    CampaignContact.campaign_id, CampaignContact.status, CampaignContact.next_attempt_at
+)
+Index("uq_campaign_contacts_phone", CampaignContact.campaign_id, CampaignContact.phone, unique=True)
@@ -3,7 +3,7 @@ Order Model
 Stores order/data capture information for each user (tenant)
 Linked to call logs for tracking
 """
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -26,3 +26,13 @@ class Order(Base):
     user = relationship("User", back_populates="orders")
     call_log = relationship("CallLog", back_populates="orders")
 
+
+# Keyset pagination: a tenant's orders, newest first, with id as tie-breaker
+Index(
+    "ix_orders_user_created_at_id",
+    Order.user_id, Order.created_at.desc(), Order.id.desc()
+)
+
+
+# Conditional GET: count and max(updated_at) per tenant from an index-only scan
+Index("ix_orders_user_updated_at", Order.user_id, Order.updated_at)
@@ -0,0 +1,17 @@
+"""
+Order Extraction Model
+One row per call whose transcript went through order extraction, including calls
+where no order was found, so retried jobs never pay for a second extraction
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+
+class OrderExtraction(Base):
+    __tablename__ = "order_extractions"
+    
+    call_id = Column(String, primary_key=True)  # The transcript's call id (the call log's, when one exists)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    orders = Column(Integer, nullable=False, default=0)  # Orders created from the call
+    extracted_at = Column(DateTime, default=datetime.utcnow)
@@ -3,7 +3,7 @@ Phone Number Model
 Stores phone numbers associated with each user (tenant)
 Future: Integration with Knowlarity DID
 """
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -25,3 +25,6 @@ class PhoneNumber(Base):
     agent_mappings = relationship("AgentPhoneMapping", back_populates="phone_number", cascade="all, delete-orphan")
     call_logs = relationship("CallLog", back_populates="phone_number")
 
+
+# Conditional GET: count and max(updated_at) per tenant from an index-only scan
+Index("ix_phone_numbers_user_updated_at", PhoneNumber.user_id, PhoneNumber.updated_at)
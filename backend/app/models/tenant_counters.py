@@ -0,0 +1,21 @@
+"""
+Tenant Counters Model
+Per-tenant aggregate counts backing the dashboard
+Maintained incrementally by the write paths and reconciled periodically
+"""
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+
+class TenantCounters(Base):
+    __tablename__ = "tenant_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_phone_numbers = Column(Integer, nullable=False, default=0)
+    active_phone_numbers = Column(Integer, nullable=False, default=0)
+    total_ai_agents = Column(Integer, nullable=False, default=0)
+    active_ai_agents = Column(Integer, nullable=False, default=0)
+    total_calls = Column(Integer, nullable=False, default=0)
+    total_orders = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
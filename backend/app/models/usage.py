@@ -0,0 +1,20 @@
+"""
+Usage Model
+Daily metered usage (LLM tokens, STT audio seconds, TTS characters) per tenant and agent
+Written by the usage meter's batched flushes; agent_id is 0 when no agent is involved
+"""
+from sqlalchemy import Column, Integer, BigInteger, Float, ForeignKey, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+
+class UsageDaily(Base):
+    __tablename__ = "usage_daily"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(DateTime, primary_key=True)  # UTC midnight
+    agent_id = Column(Integer, primary_key=True, default=0)
+    llm_tokens = Column(BigInteger, nullable=False, default=0)
+    stt_seconds = Column(Float, nullable=False, default=0.0)
+    tts_characters = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -44,3 +44,11 @@ class AgentPhoneLinkRequest(BaseModel):
     phone_number_ids: list[int]
 
 
+class AgentPhoneLinks(BaseModel):
+    agent_id: int
+    phone_number_ids: list[int]
+
+
+class AgentPhoneBulkLinkRequest(BaseModel):
+    links: list[AgentPhoneLinks]
+
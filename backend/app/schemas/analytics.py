@@ -0,0 +1,24 @@
+"""
+Analytics Schemas
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+
+
+class CallTimeseriesPoint(BaseModel):
+    bucket_start: datetime
+    calls: int
+    failed: int
+    failure_rate: float
+    total_duration: float
+    avg_duration: float
+    p95_duration: float  # Estimated from the duration histogram
+    max_duration: float
+
+
+class CallTimeseriesResponse(BaseModel):
+    granularity: str
+    start: datetime
+    end: datetime
+    points: List[CallTimeseriesPoint]
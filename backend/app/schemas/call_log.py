@@ -1,9 +1,11 @@
 """
 Call Log Schemas
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+from app.core.timestamps import to_naive_utc
 
 
 class CallLogCreate(BaseModel):
@@ -28,3 +30,27 @@ class CallLogResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class CallLogIngestItem(CallLogCreate):
+    timestamp: Optional[datetime] = None  # When the call happened; defaults to ingest time
+
+    @field_validator("timestamp")
+    @classmethod
+    def timestamp_to_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Webhooks usually send "...Z" or an offset; the column is naive UTC
+        return to_naive_utc(value)
+
+
+class CallLogIngestResult(BaseModel):
+    index: int  # Position of the event in the request
+    call_id: Optional[str] = None
+    status: str  # created, updated, duplicate, invalid, not_found, conflict
+    detail: Optional[str] = None
+
+
+class CallLogIngestResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[CallLogIngestResult]
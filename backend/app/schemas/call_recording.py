@@ -0,0 +1,24 @@
+"""
+Call Recording Schemas
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class CallRecordingTrack(BaseModel):
+    name: str  # caller / agent
+    media_type: str
+    bytes: int
+    url: str
+
+
+class CallRecordingResponse(BaseModel):
+    call_id: str
+    agent_id: Optional[int]
+    status: str
+    duration: float
+    dropped_chunks: int
+    started_at: datetime
+    finished_at: Optional[datetime]
+    tracks: List[CallRecordingTrack]
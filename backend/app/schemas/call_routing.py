@@ -0,0 +1,20 @@
+"""
+Call Routing Schemas
+"""
+from pydantic import BaseModel
+from typing import Optional
+
+
+class InboundCallRequest(BaseModel):
+    to_number: str  # Number that was dialed (one of our DIDs)
+    from_number: Optional[str] = None  # Caller's number
+    call_id: Optional[str] = None  # Provider call identifier
+
+
+class InboundCallRoute(BaseModel):
+    agent_id: int
+    user_id: int
+    phone_number_id: int
+    number: str  # Dialed number in E.164
+    media_stream_url: str  # WebSocket path the provider should stream call audio to
+    routing_version: int
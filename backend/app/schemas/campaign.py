@@ -0,0 +1,63 @@
+"""
+Campaign Schemas
+"""
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, time
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+class CampaignContactCreate(BaseModel):
+    phone: str
+    name: Optional[str] = None
+    variables: dict = {}
+
+
+class CampaignCreate(BaseModel):
+    name: str
+    agent_id: int
+    phone_number_id: int
+    window_start: time = time(9, 0)
+    window_end: time = time(20, 0)
+    timezone: str = "UTC"
+    max_attempts: int = Field(3, ge=1, le=10)
+    retry_backoff_seconds: int = Field(600, ge=0)
+    contacts: List[CampaignContactCreate] = []
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, value: str) -> str:
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone: {value}")
+        return value
+
+
+class CampaignContactsAdd(BaseModel):
+    contacts: List[CampaignContactCreate]
+
+
+class CampaignResponse(BaseModel):
+    id: int
+    user_id: int
+    agent_id: int
+    phone_number_id: int
+    name: str
+    status: str
+    window_start: time
+    window_end: time
+    timezone: str
+    max_attempts: int
+    retry_backoff_seconds: int
+    created_at: datetime
+    updated_at: datetime
+    contacts_by_status: Dict[str, int] = {}
+
+    class Config:
+        from_attributes = True
+
+
+class CampaignContactsAdded(BaseModel):
+    added: int
+    skipped: int  # Duplicates within the request or already in the campaign
@@ -0,0 +1,25 @@
+"""
+Usage Schemas
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class UsageTotals(BaseModel):
+    llm_tokens: int
+    stt_seconds: float
+    tts_characters: int
+    estimated_cost_usd: float  # From the configured unit prices
+
+
+class UsageItem(UsageTotals):
+    day: datetime
+    agent_id: Optional[int]  # None for usage outside an agent
+
+
+class UsageResponse(BaseModel):
+    start: datetime
+    end: datetime
+    totals: UsageTotals
+    items: List[UsageItem]
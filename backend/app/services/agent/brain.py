@@ -1,6 +1,5 @@
 import os
 from typing import List, Dict, Any, Optional
-from openai import AsyncOpenAI
 from app.core.config import settings
 
 class AgentBrain:
@@ -10,9 +9,20 @@ class AgentBrain:
     """
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.OPENAI_API_KEY
-        self.client = AsyncOpenAI(api_key=self.api_key) if self.api_key else None
+        self._client = None
         self.model = "gpt-4-turbo-preview"
 
+    @property
+    def client(self):
+        """OpenAI client, created (and the SDK imported) on first use"""
+        if self._client is None and self.api_key:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self.api_key)
+        return self._client
+
+    def warm_up(self):
+        self.client
+
     async def decide(self, 
                        user_input: str, 
                        history: List[Dict[str, str]], 
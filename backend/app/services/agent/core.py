@@ -3,6 +3,10 @@ from typing import Dict, Any, Optional
 from .brain import agent_brain
 from .memory import agent_memory
 from .voice import voice_service
+from app.core.config import settings
+from app.services.job_queue import job_queue
+from app.services.post_call import AGENT_ACTION_JOB, CALL_COMPLETED_JOB, CALL_SUMMARIZE_JOB, ORDER_EXTRACT_JOB
+from app.services.usage_meter import usage_meter, MeterKey
 
 class AgentCore:
     """
@@ -16,10 +20,12 @@ class AgentCore:
                              session_id: str, 
                              user_input: str, 
                              master_prompt: str,
-                             user_id: Optional[str] = None) -> Dict[str, Any]:
+                             user_id: Optional[str] = None,
+                             meter: Optional[MeterKey] = None) -> Dict[str, Any]:
         """
         Executes a single workflow turn:
         STT (already handled) -> Brain Logic -> Memory Update -> TTS Trigger
+        Token usage is metered against meter, the (user_id, agent_id) of the call.
         """
         
         # 1. Load context from Memory
@@ -34,25 +40,57 @@ class AgentCore:
             context=user_context
         )
 
+        usage_meter.record(meter, llm_tokens=result.get("metadata", {}).get("tokens_used", 0))
+
         # 3. Handle Memory Update
         agent_memory.add_to_history(session_id, "user", user_input)
         agent_memory.add_to_history(session_id, "assistant", result["response"])
 
         # 4. Process Intents (Custom Logic)
         if result["intent"] == "action_required":
-            # Logic to execute internal webhooks or functions could go here
-            print(f"Action triggered in turn: {result['response']}")
+            # Webhooks and functions run as a background job, never on the call loop
+            try:
+                await job_queue.enqueue(AGENT_ACTION_JOB, {
+                    "session_id": session_id,
+                    "response": result["response"]
+                })
+            except Exception as e:
+                print(f"Action Enqueue Error: {str(e)}")
 
         return {
             "text": result["response"],
             "intent": result["intent"]
         }
 
-    async def generate_voice_response(self, text: str, voice_id: Optional[str] = None):
+    async def end_call(self, session_id: str, details: Dict[str, Any], extract_orders: bool = False):
+        """
+        Hands the finished call's transcript to post-call processing, then frees its memory.
+        """
+        transcript = agent_memory.get_history(session_id)
+        try:
+            if transcript:
+                payload = {**details, "session_id": session_id, "transcript": transcript}
+                await job_queue.enqueue(CALL_COMPLETED_JOB, payload)
+                if extract_orders:
+                    await job_queue.enqueue(ORDER_EXTRACT_JOB, payload)
+                if settings.CALL_SUMMARY_ENABLED and settings.POST_CALL_WEBHOOK_URL:
+                    await job_queue.enqueue(CALL_SUMMARIZE_JOB, payload)
+        except Exception as e:
+            print(f"Post-call Enqueue Error: {str(e)}")
+        finally:
+            agent_memory.clear_history(session_id)
+
+    async def generate_voice_response(self, text: str, voice_id: Optional[str] = None, output_format: Optional[str] = None,
+                                      meter: Optional[MeterKey] = None):
         """
         Stream binary audio chunks.
         """
-        async for chunk in voice_service.stream_tts(text, voice_id=voice_id or "21m00Tcm4TlvDq8ikWAM"):
+        async for chunk in voice_service.stream_tts(
+            text,
+            voice_id=voice_id or "21m00Tcm4TlvDq8ikWAM",
+            output_format=output_format,
+            meter=meter
+        ):
             yield chunk
 
 agent_core = AgentCore()
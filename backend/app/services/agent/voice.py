@@ -1,9 +1,8 @@
-import os
 import httpx
-import json
-import base64
 from typing import Optional, AsyncGenerator
 from app.core.config import settings
+from app.services.tts_pipeline import split_for_tts, synthesize_ordered
+from app.services.usage_meter import usage_meter, MeterKey
 
 class VoiceService:
     """
@@ -13,13 +12,40 @@ class VoiceService:
     def __init__(self, elevenlabs_key: Optional[str] = None):
         self.elevenlabs_key = elevenlabs_key or settings.ELEVENLABS_API_KEY
         self.tts_url = "https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
+        self._stt_client = None
+
+    @property
+    def stt_client(self):
+        """Whisper client, created (and the OpenAI SDK imported) on first use"""
+        if self._stt_client is None and settings.OPENAI_API_KEY:
+            from openai import AsyncOpenAI
+            self._stt_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        return self._stt_client
+
+    def warm_up(self):
+        self.stt_client
         
-    async def stream_tts(self, text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> AsyncGenerator[bytes, None]:
+    async def stream_tts(self, text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM", output_format: Optional[str] = None,
+                         meter: Optional[MeterKey] = None) -> AsyncGenerator[bytes, None]:
         """
         Streams audio from ElevenLabs for the given text.
+        output_format selects a non-MP3 encoding, e.g. "ulaw_8000" for phone calls.
+        Long replies are split at sentence boundaries and rendered concurrently,
+        so the first chunk plays while the rest are still being synthesized.
+        meter is the (user_id, agent_id) the characters are billed to.
         """
+        usage_meter.record(meter, tts_characters=len(text))
+        chunks = split_for_tts(text, settings.TTS_CHUNK_MAX_CHARS, settings.TTS_FIRST_CHUNK_MAX_CHARS)
+        async for chunk in synthesize_ordered(
+            chunks,
+            lambda part: self._stream_tts_single(part, voice_id, output_format),
+            settings.TTS_MAX_PARALLEL_CHUNKS
+        ):
+            yield chunk
+
+    async def _stream_tts_single(self, text: str, voice_id: str, output_format: Optional[str] = None) -> AsyncGenerator[bytes, None]:
         headers = {
-            "Accept": "audio/mpeg",
+            "Accept": "audio/mpeg" if not output_format else "*/*",
             "Content-Type": "application/json",
             "xi-api-key": self.elevenlabs_key
         }
@@ -35,7 +61,8 @@ class VoiceService:
 
         async with httpx.AsyncClient() as client:
             url = self.tts_url.format(voice_id=voice_id)
-            async with client.stream("POST", url, json=data, headers=headers) as response:
+            params = {"output_format": output_format} if output_format else None
+            async with client.stream("POST", url, json=data, headers=headers, params=params) as response:
                 if response.status_code != 200:
                     error_msg = await response.aread()
                     print(f"ElevenLabs Error: {error_msg}")
@@ -44,33 +71,28 @@ class VoiceService:
                 async for chunk in response.aiter_bytes():
                     yield chunk
 
-    async def transcribe_audio(self, audio_data: bytes) -> str:
+    async def transcribe_audio(self, audio_data: bytes, filename: str = "audio.wav", meter: Optional[MeterKey] = None) -> str:
         """
         Transcribes binary audio data using Whisper (OpenAI API).
         Modular: Can be swapped with self-hosted Whisper.
+        The audio is uploaded from memory; filename only tells Whisper the container format.
+        meter is the (user_id, agent_id) the audio seconds are billed to.
         """
-        # Save temp file for OpenAI Whisper API (expects file object)
-        temp_file = "temp_audio.wav"
-        with open(temp_file, "wb") as f:
-            f.write(audio_data)
-            
         try:
-            from openai import AsyncOpenAI
-            client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            if not settings.OPENAI_API_KEY:
+            if not self.stt_client:
                 return "Error: OpenAI API Key missing."
             
-            with open(temp_file, "rb") as audio:
-                transcript = await client.audio.transcriptions.create(
-                    model="whisper-1", 
-                    file=audio
-                )
+            transcript = await self.stt_client.audio.transcriptions.create(
+                model="whisper-1", 
+                file=(filename, audio_data),
+                # verbose_json adds the billed audio duration
+                response_format="verbose_json" if meter else "json"
+            )
+            if meter:
+                usage_meter.record(meter, stt_seconds=float(getattr(transcript, "duration", 0) or 0))
             return transcript.text
         except Exception as e:
             print(f"STT Error: {str(e)}")
             return ""
-        finally:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
 
 voice_service = VoiceService()
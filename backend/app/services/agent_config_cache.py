@@ -0,0 +1,112 @@
+"""
+Agent Config Cache
+Immutable snapshots of AI agent settings for the chat and voice hot paths.
+Entries are versioned by updated_at, invalidated on update / delete in every
+worker through the invalidation bus, and concurrent misses share one load.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+from sqlalchemy import select
+
+from app.core.cache import TTLCache, SingleFlight
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.invalidation import invalidation_bus
+from app.models.ai_agent import AIAgent
+
+AGENT_TOPIC = "agent"
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class AgentConfig:
+    id: int
+    user_id: int
+    agent_name: str
+    system_prompt: str
+    language: Optional[str]
+    voice_name: Optional[str]
+    is_active: bool
+    configuration: Mapping[str, Any]
+    version: datetime  # updated_at of the row the snapshot was read from
+
+
+class AgentConfigCache:
+    def __init__(self):
+        self._cache = TTLCache(
+            ttl_seconds=settings.AGENT_CACHE_TTL_SECONDS,
+            max_size=settings.AGENT_CACHE_MAX_SIZE
+        )
+        self._loads = SingleFlight()
+        # Bumped on every invalidation (the epoch on clear), so a load that raced one is not cached
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0
+
+    async def get(self, agent_id: int) -> Optional[AgentConfig]:
+        config = self._cache.get(agent_id)
+        if config is not None:
+            return config
+        return await self._loads.do(agent_id, lambda: self._load(agent_id))
+
+    async def _load(self, agent_id: int) -> Optional[AgentConfig]:
+        generation = (self._epoch, self._generations.get(agent_id, 0))
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(
+                    AIAgent.id, AIAgent.user_id, AIAgent.agent_name, AIAgent.system_prompt,
+                    AIAgent.language, AIAgent.voice_name, AIAgent.is_active,
+                    AIAgent.configuration, AIAgent.updated_at
+                ).where(AIAgent.id == agent_id)
+            )
+            row = result.one_or_none()
+        if row is None:
+            return None
+
+        config = AgentConfig(
+            id=row.id,
+            user_id=row.user_id,
+            agent_name=row.agent_name,
+            system_prompt=row.system_prompt,
+            language=row.language,
+            voice_name=row.voice_name,
+            is_active=bool(row.is_active),
+            configuration=_freeze(row.configuration or {}),
+            version=row.updated_at
+        )
+        if (self._epoch, self._generations.get(agent_id, 0)) == generation:
+            self._cache.set(agent_id, config)
+        return config
+
+    def invalidate_local(self, agent_id: int):
+        self._generations[agent_id] = self._generations.get(agent_id, 0) + 1
+        self._cache.invalidate(agent_id)
+
+    def clear(self):
+        self._epoch += 1
+        self._generations.clear()
+        self._cache.clear()
+
+    async def invalidate(self, agent_id: int):
+        """Drop the agent here and in every other worker; call after the change is committed"""
+        self.invalidate_local(agent_id)
+        await invalidation_bus.publish(AGENT_TOPIC, agent_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+agent_config_cache = AgentConfigCache()
+invalidation_bus.subscribe(
+    AGENT_TOPIC,
+    lambda key: agent_config_cache.invalidate_local(int(key)),
+    reset=agent_config_cache.clear
+)
@@ -0,0 +1,91 @@
+"""
+Agent Link Service
+Set-based, diff-applying agent-to-phone linking
+"""
+from datetime import datetime
+from typing import Dict, Iterable, NamedTuple, Set
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, tuple_
+
+from app.models.ai_agent import AIAgent
+from app.models.phone_number import PhoneNumber
+from app.models.agent_phone_mapping import AgentPhoneMapping
+
+
+class LinkChanges(NamedTuple):
+    added: int
+    removed: int
+    phone_number_ids: Set[int]  # Phones whose set of linked agents changed
+
+
+async def apply_agent_phone_links(db: AsyncSession, user_id: int, links: Dict[int, Iterable[int]]) -> LinkChanges:
+    """
+    Make each agent's linked phone numbers exactly the given set.
+    Ownership of every agent and phone is checked with one IN query each, and only
+    the difference from the current mappings is written, in the caller's transaction.
+    Returns the number of links added and removed, and the phones they touched.
+    """
+    wanted: Dict[int, Set[int]] = {agent_id: set(phone_ids) for agent_id, phone_ids in links.items()}
+    if not wanted:
+        return LinkChanges(0, 0, set())
+
+    # 1. Verify agents belong to user
+    owned_agents = set((await db.execute(
+        select(AIAgent.id).where(
+            AIAgent.id.in_(wanted.keys()),
+            AIAgent.user_id == user_id
+        )
+    )).scalars().all())
+    missing_agents = sorted(set(wanted) - owned_agents)
+    if missing_agents:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"AI agent {missing_agents[0]} not found" if len(wanted) > 1 else "AI agent not found"
+        )
+
+    # 2. Verify phone numbers belong to user
+    requested_phones = set().union(*wanted.values())
+    if requested_phones:
+        owned_phones = set((await db.execute(
+            select(PhoneNumber.id).where(
+                PhoneNumber.id.in_(requested_phones),
+                PhoneNumber.user_id == user_id
+            )
+        )).scalars().all())
+        missing_phones = sorted(requested_phones - owned_phones)
+        if missing_phones:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Phone number {missing_phones[0]} not found"
+            )
+
+    # 3. Diff against current mappings
+    current_rows = await db.execute(
+        select(AgentPhoneMapping.agent_id, AgentPhoneMapping.phone_number_id)
+        .where(AgentPhoneMapping.agent_id.in_(wanted.keys()))
+    )
+    current = {(row.agent_id, row.phone_number_id) for row in current_rows}
+    target = {(agent_id, phone_id) for agent_id, phone_ids in wanted.items() for phone_id in phone_ids}
+    to_remove = current - target
+    to_add = target - current
+
+    # 4. Apply only the difference
+    if to_remove:
+        await db.execute(
+            delete(AgentPhoneMapping).where(
+                tuple_(AgentPhoneMapping.agent_id, AgentPhoneMapping.phone_number_id).in_(to_remove)
+            )
+        )
+    if to_add:
+        now = datetime.utcnow()
+        await db.execute(
+            insert(AgentPhoneMapping),
+            [{"agent_id": agent_id, "phone_number_id": phone_id, "created_at": now} for agent_id, phone_id in to_add]
+        )
+
+    return LinkChanges(
+        added=len(to_add),
+        removed=len(to_remove),
+        phone_number_ids={phone_id for _, phone_id in to_add | to_remove}
+    )
@@ -1,16 +1,33 @@
-import google.generativeai as genai
-import edge_tts
-import uuid
-import os
+from typing import AsyncGenerator, AsyncIterator
 from app.core.config import settings
+from app.services.audio_store import audio_store
+from app.services.tts_pipeline import split_for_tts, sentences_from_stream, synthesize_ordered
+
+
+class AIServiceError(Exception):
+    """Raised by the streaming paths, which cannot return an error string in-band."""
 
-# Configure Gemini
-if settings.GEMINI_API_KEY:
-    genai.configure(api_key=settings.GEMINI_API_KEY)
 
 class AIService:
+    """
+    Gemini text generation and Edge TTS.
+    Provider SDKs are imported on first use, so REST-only workers never load them.
+    """
     def __init__(self):
-        self.model = genai.GenerativeModel('gemini-pro') if settings.GEMINI_API_KEY else None
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None and settings.GEMINI_API_KEY:
+            import google.generativeai as genai
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+            self._model = genai.GenerativeModel('gemini-pro')
+        return self._model
+
+    def warm_up(self):
+        """Load the provider SDKs ahead of the first request"""
+        import edge_tts  # noqa: F401
+        self.model
 
     async def generate_response(self, user_input: str, system_prompt: str = "You are a helpful assistant.") -> str:
         """
@@ -29,23 +46,67 @@ class AIService:
         except Exception as e:
             return f"Error generating response: {str(e)}"
 
+    async def generate_response_stream(self, user_input: str, system_prompt: str = "You are a helpful assistant.") -> AsyncGenerator[str, None]:
+        """
+        Streams Gemini's response text as it is generated.
+        Raises AIServiceError instead of yielding an error message.
+        """
+        if not self.model:
+            raise AIServiceError("Error: Gemini API Key is missing. Please check your .env file.")
+
+        full_prompt = f"{system_prompt}\n\nUser: {user_input}\nAssistant:"
+        try:
+            response = await self.model.generate_content_async(full_prompt, stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise AIServiceError(f"Error generating response: {str(e)}") from e
+
+    async def _stream_speech_single(self, text: str, voice: str) -> AsyncGenerator[bytes, None]:
+        import edge_tts
+        communicate = edge_tts.Communicate(text, voice)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+
+    async def stream_speech(self, text: str, voice: str = "en-US-AriaNeural") -> AsyncGenerator[bytes, None]:
+        """
+        Streams MP3 audio from Edge TTS without touching the disk.
+        Long texts are split and synthesized as concurrent chunks, played back in order.
+        """
+        chunks = split_for_tts(text, settings.TTS_CHUNK_MAX_CHARS, settings.TTS_FIRST_CHUNK_MAX_CHARS)
+        async for audio in synthesize_ordered(
+            chunks,
+            lambda chunk: self._stream_speech_single(chunk, voice),
+            settings.TTS_MAX_PARALLEL_CHUNKS
+        ):
+            yield audio
+
+    async def speak_stream(self, text_chunks: AsyncIterator[str], voice: str = "en-US-AriaNeural") -> AsyncGenerator[bytes, None]:
+        """
+        Pipes a streaming text response into synthesis one sentence at a time,
+        so audio for the first sentence plays while the model is still writing.
+        """
+        async def pieces():
+            async for sentence in sentences_from_stream(text_chunks):
+                for chunk in split_for_tts(sentence, settings.TTS_CHUNK_MAX_CHARS):
+                    yield chunk
+
+        async for audio in synthesize_ordered(
+            pieces(),
+            lambda chunk: self._stream_speech_single(chunk, voice),
+            settings.TTS_MAX_PARALLEL_CHUNKS
+        ):
+            yield audio
+
     async def text_to_speech(self, text: str, voice: str = "en-US-AriaNeural") -> str:
         """
-        Converts text to speech using Edge TTS and returns the path to the temporary audio file.
+        Converts text to speech using Edge TTS and persists it in the bounded audio store.
+        Returns the path to the audio file, which is evicted after its TTL.
         """
         try:
-            # Create a unique filename for the audio
-            filename = f"speech_{uuid.uuid4()}.mp3"
-            # Ensure a static directory exists for serving files (we might need to adjust this path)
-            output_dir = "static/audio"
-            os.makedirs(output_dir, exist_ok=True)
-            
-            output_path = os.path.join(output_dir, filename)
-            
-            communicate = edge_tts.Communicate(text, voice)
-            await communicate.save(output_path)
-            
-            return output_path
+            return await audio_store.save_stream(self.stream_speech(text, voice))
         except Exception as e:
             print(f"TTS Error: {str(e)}")
             return ""
@@ -0,0 +1,270 @@
+"""
+Analytics Service
+Incremental call rollups, resumable back-fill and time-series queries over the rollups
+"""
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, and_, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models.agent_phone_mapping import AgentPhoneMapping
+from app.models.call_log import CallLog
+from app.models.call_stats import (
+    CallStatsHourly, CallStatsDaily, RollupCheckpoint, DURATION_BUCKETS, BUCKET_COLUMNS
+)
+from app.schemas.analytics import CallTimeseriesPoint
+
+FAILED_STATUSES = ("failed", "missed", "busy", "no-answer", "canceled")
+BACKFILL_JOB = "call_stats_backfill"
+
+ROLLUP_MODELS = {"hour": CallStatsHourly, "day": CallStatsDaily}
+
+
+def truncate(timestamp: datetime, granularity: str) -> datetime:
+    timestamp = timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0) if granularity == "day" else timestamp
+
+
+def bucket_index(duration: float) -> int:
+    return bisect_left(DURATION_BUCKETS, duration)
+
+
+def _phone_agents():
+    """
+    Calls are attributed to their phone's lowest-id linked agent, active or not.
+    Incremental and back-filled rollups share this rule, so a rebuild never moves calls.
+    """
+    return (
+        select(AgentPhoneMapping.phone_number_id, func.min(AgentPhoneMapping.agent_id).label("agent_id"))
+        .group_by(AgentPhoneMapping.phone_number_id)
+    )
+
+
+# --- Incremental maintenance (call ingest path) ---
+
+async def record_call_rollups(
+    db: AsyncSession,
+    calls: Iterable[Dict[str, Any]],
+    replaced: Iterable[Dict[str, Any]] = ()
+):
+    """
+    Add newly written calls to the hourly and daily rollups in the caller's transaction.
+    `replaced` holds the previous versions of calls a retry updated; they are subtracted
+    in the same upsert, so a changed status, duration or time moves the call between rows.
+    max_duration only ever grows; the back-fill recomputes it exactly.
+    Calls are pre-aggregated in memory, so a bulk ingest costs one agent lookup
+    plus one upsert per rollup table.
+    """
+    entries = [(call, 1) for call in calls] + [(call, -1) for call in replaced]
+    if not entries:
+        return
+
+    phone_ids = {call.get("phone_number_id") for call, _ in entries} - {None, 0}
+    agents: Dict[int, int] = {}
+    if phone_ids:
+        rows = await db.execute(_phone_agents().where(AgentPhoneMapping.phone_number_id.in_(phone_ids)))
+        agents = dict(rows.all())
+
+    for granularity, model in ROLLUP_MODELS.items():
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for call, sign in entries:
+            phone_number_id = call.get("phone_number_id") or 0
+            key = (
+                call["user_id"],
+                truncate(call["timestamp"], granularity),
+                phone_number_id,
+                agents.get(phone_number_id, 0),
+                call.get("status") or "completed",
+            )
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {
+                    "user_id": key[0], "bucket_start": key[1], "phone_number_id": key[2],
+                    "agent_id": key[3], "status": key[4],
+                    "call_count": 0, "total_duration": 0.0, "max_duration": 0.0,
+                    **{column: 0 for column in BUCKET_COLUMNS},
+                }
+            duration = call.get("duration") or 0.0
+            group["call_count"] += sign
+            group["total_duration"] += sign * duration
+            if sign > 0:
+                group["max_duration"] = max(group["max_duration"], duration)
+            group[BUCKET_COLUMNS[bucket_index(duration)]] += sign
+
+        stmt = pg_insert(model).values(list(groups.values()))
+        additive = ("call_count", "total_duration", *BUCKET_COLUMNS)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id", "bucket_start", "phone_number_id", "agent_id", "status"],
+            set_={
+                **{column: getattr(model, column) + getattr(stmt.excluded, column) for column in additive},
+                "max_duration": func.greatest(model.max_duration, stmt.excluded.max_duration),
+            }
+        ))
+
+
+# --- Back-fill (resumable, hour by hour) ---
+
+def _hour_rollup_select(hour: datetime):
+    """Aggregate one hour of raw call logs into hourly rollup rows"""
+    agents = _phone_agents().subquery()
+    bounds = (0, *DURATION_BUCKETS)
+    buckets = [
+        func.count().filter(
+            and_(CallLog.duration > bounds[i], CallLog.duration <= bounds[i + 1]) if i else CallLog.duration <= bounds[1]
+        )
+        for i in range(len(DURATION_BUCKETS))
+    ] + [func.count().filter(CallLog.duration > DURATION_BUCKETS[-1])]
+
+    phone_number_id = func.coalesce(CallLog.phone_number_id, 0)
+    agent_id = func.coalesce(agents.c.agent_id, 0)
+    status = func.coalesce(CallLog.status, "completed")
+    return (
+        select(
+            CallLog.user_id,
+            literal(hour).label("bucket_start"),
+            phone_number_id,
+            agent_id,
+            status,
+            func.count(),
+            func.coalesce(func.sum(CallLog.duration), 0.0),
+            func.coalesce(func.max(CallLog.duration), 0.0),
+            *buckets,
+        )
+        .select_from(CallLog)
+        .outerjoin(agents, agents.c.phone_number_id == CallLog.phone_number_id)
+        .where(CallLog.timestamp >= hour, CallLog.timestamp < hour + timedelta(hours=1))
+        .group_by(CallLog.user_id, phone_number_id, agent_id, status)
+    )
+
+
+ROLLUP_COLUMNS = [
+    "user_id", "bucket_start", "phone_number_id", "agent_id", "status",
+    "call_count", "total_duration", "max_duration", *BUCKET_COLUMNS,
+]
+
+
+async def backfill_hour(db: AsyncSession, hour: datetime):
+    """Replace one hour of hourly rollups with values recomputed from call_logs"""
+    await db.execute(delete(CallStatsHourly).where(CallStatsHourly.bucket_start == hour))
+    await db.execute(
+        pg_insert(CallStatsHourly).from_select(ROLLUP_COLUMNS, _hour_rollup_select(hour))
+    )
+
+
+async def rebuild_day(db: AsyncSession, day: datetime):
+    """Replace one day of daily rollups with the sum of its hourly rollups"""
+    additive = [func.sum(getattr(CallStatsHourly, column)) for column in ("call_count", "total_duration")]
+    await db.execute(delete(CallStatsDaily).where(CallStatsDaily.bucket_start == day))
+    await db.execute(
+        pg_insert(CallStatsDaily).from_select(
+            ROLLUP_COLUMNS,
+            select(
+                CallStatsHourly.user_id,
+                literal(day).label("bucket_start"),
+                CallStatsHourly.phone_number_id,
+                CallStatsHourly.agent_id,
+                CallStatsHourly.status,
+                *additive,
+                func.max(CallStatsHourly.max_duration),
+                *[func.sum(getattr(CallStatsHourly, column)) for column in BUCKET_COLUMNS],
+            )
+            .where(
+                CallStatsHourly.bucket_start >= day,
+                CallStatsHourly.bucket_start < day + timedelta(days=1)
+            )
+            .group_by(
+                CallStatsHourly.user_id, CallStatsHourly.phone_number_id,
+                CallStatsHourly.agent_id, CallStatsHourly.status
+            )
+        )
+    )
+
+
+async def get_backfill_position(db: AsyncSession) -> Optional[datetime]:
+    result = await db.execute(select(RollupCheckpoint.position).where(RollupCheckpoint.job_name == BACKFILL_JOB))
+    return result.scalar_one_or_none()
+
+
+async def set_backfill_position(db: AsyncSession, position: datetime):
+    stmt = pg_insert(RollupCheckpoint).values(job_name=BACKFILL_JOB, position=position, updated_at=datetime.utcnow())
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[RollupCheckpoint.job_name],
+        set_={"position": stmt.excluded.position, "updated_at": stmt.excluded.updated_at}
+    ))
+
+
+# --- Time-series queries ---
+
+def _estimate_percentile(buckets: List[int], total: int, max_duration: float, q: float) -> float:
+    """Linear interpolation inside the histogram bucket that holds the q-th call"""
+    if not total:
+        return 0.0
+    target = q * total
+    seen = 0
+    for i, count in enumerate(buckets):
+        if count and seen + count >= target:
+            lower = DURATION_BUCKETS[i - 1] if i else 0.0
+            upper = DURATION_BUCKETS[i] if i < len(DURATION_BUCKETS) else max_duration
+            # Never estimate past the longest call actually seen
+            upper = max(lower, min(upper, max_duration))
+            return round(lower + (upper - lower) * (target - seen) / count, 2)
+        seen += count
+    return max_duration
+
+
+async def get_call_timeseries(
+    db: AsyncSession,
+    user_id: int,
+    granularity: str,
+    start: datetime,
+    end: datetime,
+    phone_number_id: Optional[int] = None,
+    agent_id: Optional[int] = None,
+    status: Optional[str] = None
+) -> List[CallTimeseriesPoint]:
+    """Range query answered entirely from the rollup tables"""
+    model = ROLLUP_MODELS[granularity]
+    query = (
+        select(
+            model.bucket_start,
+            func.sum(model.call_count).label("calls"),
+            func.sum(model.call_count).filter(model.status.in_(FAILED_STATUSES)).label("failed"),
+            func.sum(model.total_duration).label("total_duration"),
+            func.max(model.max_duration).label("max_duration"),
+            *[func.sum(getattr(model, column)).label(column) for column in BUCKET_COLUMNS],
+        )
+        .where(
+            model.user_id == user_id,
+            model.bucket_start >= truncate(start, granularity),
+            model.bucket_start < end
+        )
+        .group_by(model.bucket_start)
+        .order_by(model.bucket_start)
+    )
+    if phone_number_id is not None:
+        query = query.where(model.phone_number_id == phone_number_id)
+    if agent_id is not None:
+        query = query.where(model.agent_id == agent_id)
+    if status is not None:
+        query = query.where(model.status == status)
+
+    points = []
+    for row in await db.execute(query):
+        calls = row.calls or 0
+        failed = row.failed or 0
+        total_duration = float(row.total_duration or 0.0)
+        max_duration = float(row.max_duration or 0.0)
+        buckets = [getattr(row, column) or 0 for column in BUCKET_COLUMNS]
+        points.append(CallTimeseriesPoint(
+            bucket_start=row.bucket_start,
+            calls=calls,
+            failed=failed,
+            failure_rate=round(failed / calls, 4) if calls else 0.0,
+            total_duration=round(total_duration, 2),
+            avg_duration=round(total_duration / calls, 2) if calls else 0.0,
+            p95_duration=_estimate_percentile(buckets, calls, max_duration, 0.95),
+            max_duration=max_duration
+        ))
+    return points
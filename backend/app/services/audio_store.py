@@ -0,0 +1,105 @@
+"""
+Audio Store
+Size- and TTL-bounded on-disk store for audio that must outlive a request.
+Files are evicted by a background sweep, oldest first once the size cap is hit.
+"""
+import asyncio
+import os
+import time
+import uuid
+from typing import AsyncIterator, List, Tuple
+
+from app.core.config import settings
+
+
+class AudioStore:
+    def __init__(self,
+                 directory: str,
+                 max_bytes: int,
+                 ttl_seconds: int,
+                 sweep_interval: int = 60):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        os.makedirs(directory, exist_ok=True)
+
+    async def save_stream(self, chunks: AsyncIterator[bytes], prefix: str = "speech", suffix: str = ".mp3") -> str:
+        """
+        Persists an audio stream and returns its path.
+        The file is written under a temporary name so the sweeper never sees partial audio.
+        """
+        audio = bytearray()
+        async for chunk in chunks:
+            audio.extend(chunk)
+        if not audio:
+            return ""
+
+        path = os.path.join(self.directory, f"{prefix}_{uuid.uuid4()}{suffix}")
+        await asyncio.to_thread(self._write, path, bytes(audio))
+        return path
+
+    def _write(self, path: str, data: bytes):
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def sweep(self) -> int:
+        """
+        Removes expired files (and expired leftover .part files), then the oldest
+        files until the store fits in max_bytes.
+        Returns the number of files removed.
+        """
+        now = time.time()
+        entries: List[Tuple[float, int, str]] = []
+        removed = 0
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.ttl_seconds:
+                    # Includes .part files abandoned by an interrupted write
+                    removed += self._remove(entry.path)
+                elif not entry.name.endswith(".part"):
+                    # Fresh .part files may still be being written; they never count toward the size cap
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                removed += self._remove(path)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+        return removed
+
+    def _remove(self, path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    async def run_eviction(self):
+        """Background eviction loop, started from the application lifespan."""
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"Audio Store Sweep Error: {str(e)}")
+            await asyncio.sleep(self.sweep_interval)
+
+
+audio_store = AudioStore(
+    directory=settings.AUDIO_STORE_DIR,
+    max_bytes=settings.AUDIO_STORE_MAX_BYTES,
+    ttl_seconds=settings.AUDIO_STORE_TTL_SECONDS,
+    sweep_interval=settings.AUDIO_STORE_SWEEP_INTERVAL_SECONDS,
+)
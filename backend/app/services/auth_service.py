@@ -8,7 +8,7 @@ from fastapi import HTTPException, status
 from datetime import timedelta
 
 from app.models.user import User
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
+from app.core.security import verify_and_update_password, get_password_hash_async, create_access_token, create_refresh_token, decode_token
 from app.core.config import settings
 from app.schemas.auth import UserSignup, UserLogin
 
@@ -26,7 +26,7 @@ async def signup_user(db: AsyncSession, user_data: UserSignup) -> User:
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -57,13 +57,19 @@ async def login_user(db: AsyncSession, login_data: UserLogin) -> dict:
             detail="User account is inactive"
         )
     
-    # Verify password
-    if not verify_password(login_data.password, user.hashed_password):
+    # Verify password (off the event loop)
+    valid, new_hash = await verify_and_update_password(login_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
+    # Transparently upgrade hashes made with outdated parameters
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Create tokens
     access_token = create_access_token(data={"sub": user.id})
     refresh_token = create_refresh_token(data={"sub": user.id})
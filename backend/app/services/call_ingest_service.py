@@ -0,0 +1,177 @@
+"""
+Call Ingest Service
+Bulk, idempotent call-log ingestion for telephony webhooks
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.models.call_log import CallLog
+from app.models.phone_number import PhoneNumber
+from app.schemas.call_log import CallLogIngestItem, CallLogIngestResult, CallLogIngestResponse
+from app.services.counter_service import apply_counter_deltas
+from app.services.analytics_service import record_call_rollups
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Columns a retried event may overwrite; id, user_id and created_at stay as first written
+UPSERT_COLUMNS = ("phone_number_id", "caller_number", "duration", "status", "timestamp")
+# Columns the analytics rollups are keyed or aggregated on
+ROLLUP_COLUMNS = ("phone_number_id", "duration", "status", "timestamp")
+
+
+class IngestPayloadError(ValueError):
+    """The request body could not be read as a list of events."""
+
+
+def parse_call_events(body: bytes, content_type: Optional[str]) -> List[Any]:
+    """
+    Parse a JSON array (or single object) or NDJSON body into raw events.
+    Unparseable NDJSON lines are kept as None so they get a per-item outcome.
+    """
+    if content_type and content_type.split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES:
+        events = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                events.append(None)
+        return events
+
+    try:
+        payload = json.loads(body or b"[]")
+    except ValueError:
+        raise IngestPayloadError("Body must be a JSON array of call events or NDJSON")
+    if isinstance(payload, dict):
+        return [payload]
+    if not isinstance(payload, list):
+        raise IngestPayloadError("Body must be a JSON array of call events or NDJSON")
+    return payload
+
+
+async def ingest_call_logs(db: AsyncSession, user_id: int, events: List[Any]) -> CallLogIngestResponse:
+    """
+    Validate and upsert a batch of call events keyed on call_id.
+    Phone ownership is checked with one query; rows are written with multi-row upserts
+    in a single transaction. Every event gets an outcome in the response.
+    """
+    results: List[Optional[CallLogIngestResult]] = [None] * len(events)
+    items: Dict[str, tuple[int, CallLogIngestItem]] = {}
+
+    # 1. Validate, keeping the last event per call_id (a later retry supersedes earlier ones)
+    for index, raw in enumerate(events):
+        if not isinstance(raw, dict):
+            results[index] = CallLogIngestResult(index=index, status="invalid", detail="Event must be a JSON object")
+            continue
+        try:
+            item = CallLogIngestItem.model_validate(raw)
+        except ValidationError as e:
+            call_id = raw.get("call_id")
+            # The outcome must not fail validation itself, whatever type call_id had
+            results[index] = CallLogIngestResult(
+                index=index, call_id=None if call_id is None else str(call_id), status="invalid",
+                detail=e.errors()[0]["msg"] if e.errors() else "Invalid event"
+            )
+            continue
+        previous = items.get(item.call_id)
+        if previous:
+            results[previous[0]] = CallLogIngestResult(
+                index=previous[0], call_id=item.call_id, status="duplicate",
+                detail=f"Superseded by event {index}"
+            )
+        items[item.call_id] = (index, item)
+
+    # 2. Set-based ownership check for referenced phone numbers
+    phone_ids = {item.phone_number_id for _, item in items.values() if item.phone_number_id}
+    owned_phone_ids = set()
+    if phone_ids:
+        owned_result = await db.execute(
+            select(PhoneNumber.id).where(
+                PhoneNumber.id.in_(phone_ids),
+                PhoneNumber.user_id == user_id
+            )
+        )
+        owned_phone_ids = set(owned_result.scalars().all())
+
+    now = datetime.utcnow()
+    rows = []
+    for call_id, (index, item) in items.items():
+        if item.phone_number_id and item.phone_number_id not in owned_phone_ids:
+            results[index] = CallLogIngestResult(
+                index=index, call_id=call_id, status="not_found", detail="Phone number not found"
+            )
+            continue
+        rows.append({
+            "user_id": user_id,
+            "call_id": call_id,
+            "phone_number_id": item.phone_number_id,
+            "caller_number": item.caller_number,
+            "duration": item.duration,
+            "status": item.status,
+            "timestamp": item.timestamp or now,
+            "created_at": now,
+        })
+
+    # 3. Multi-row upserts; another tenant's call_id is never overwritten.
+    #    The tenant's existing rows are read (and locked) first, so updated calls can be re-rolled up.
+    outcomes: Dict[str, bool] = {}
+    previous: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(rows), settings.CALL_LOG_INGEST_CHUNK_SIZE):
+        chunk = rows[start:start + settings.CALL_LOG_INGEST_CHUNK_SIZE]
+        existing = await db.execute(
+            select(CallLog.call_id, *[getattr(CallLog, column) for column in ROLLUP_COLUMNS])
+            .where(CallLog.call_id.in_([row["call_id"] for row in chunk]), CallLog.user_id == user_id)
+            .with_for_update()
+        )
+        for row in existing:
+            previous[row.call_id] = {"user_id": user_id, **{column: getattr(row, column) for column in ROLLUP_COLUMNS}}
+        stmt = pg_insert(CallLog).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CallLog.call_id],
+            set_={column: getattr(stmt.excluded, column) for column in UPSERT_COLUMNS},
+            where=CallLog.user_id == stmt.excluded.user_id
+        ).returning(CallLog.call_id, literal_column("xmax = 0").label("inserted"))
+        written = await db.execute(stmt)
+        outcomes.update({row.call_id: row.inserted for row in written})
+
+    created = sum(1 for inserted in outcomes.values() if inserted)
+    await apply_counter_deltas(db, user_id, total_calls=created)
+    # Updated calls move between rollup rows: old version out, new version in
+    changed = [
+        row for row in rows
+        if row["call_id"] in previous and outcomes.get(row["call_id"]) is False
+        and any(previous[row["call_id"]][column] != row[column] for column in ROLLUP_COLUMNS)
+    ]
+    await record_call_rollups(
+        db,
+        [row for row in rows if outcomes.get(row["call_id"])] + changed,
+        replaced=[previous[row["call_id"]] for row in changed]
+    )
+    await db.commit()
+
+    for row in rows:
+        index = items[row["call_id"]][0]
+        if row["call_id"] not in outcomes:
+            results[index] = CallLogIngestResult(
+                index=index, call_id=row["call_id"], status="conflict",
+                detail="call_id belongs to another account"
+            )
+        else:
+            results[index] = CallLogIngestResult(
+                index=index, call_id=row["call_id"],
+                status="created" if outcomes[row["call_id"]] else "updated"
+            )
+
+    return CallLogIngestResponse(
+        created=created,
+        updated=len(outcomes) - created,
+        failed=sum(1 for r in results if r.status not in ("created", "updated", "duplicate")),
+        results=results
+    )
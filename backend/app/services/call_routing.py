@@ -0,0 +1,188 @@
+"""
+Call Routing Index
+In-process map from a dialed number (normalized E.164) to the agent that answers it.
+Built once at startup, updated incrementally on writes, swapped atomically.
+Writes are announced on the invalidation bus so every worker re-reads the same routes.
+"""
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.invalidation import invalidation_bus
+from app.models.ai_agent import AIAgent
+from app.models.phone_number import PhoneNumber
+from app.models.agent_phone_mapping import AgentPhoneMapping
+
+_NON_DIGITS = re.compile(r"\D")
+
+ROUTES_TOPIC = "routes"
+
+
+def normalize_e164(number: str, default_country_code: Optional[str] = None) -> str:
+    """
+    Normalize a dialed number to E.164 (+<country><subscriber>).
+    National formats (leading trunk 0, or bare 10-digit numbers) get the default country code.
+    """
+    country_code = default_country_code or settings.DEFAULT_COUNTRY_CODE
+    raw = number.strip()
+    digits = _NON_DIGITS.sub("", raw)
+
+    if raw.startswith("+"):
+        return f"+{digits}"
+    if digits.startswith("00"):
+        return f"+{digits[2:]}"
+    if digits.startswith("0") and len(digits) == 11:
+        return f"+{country_code}{digits[1:]}"
+    if len(digits) == 10:
+        return f"+{country_code}{digits}"
+    return f"+{digits}"
+
+
+@dataclass(frozen=True)
+class CallRoute:
+    number: str
+    phone_number_id: int
+    user_id: int
+    agent_id: int
+
+
+class CallRoutingIndex:
+    """
+    Readers take a reference to the current immutable snapshot and never lock;
+    writers build a new snapshot and swap it in under a lock, bumping the version.
+    """
+    def __init__(self):
+        # (routes by number, routes by phone_number_id)
+        self._snapshot: Tuple[Dict[str, CallRoute], Dict[int, CallRoute]] = ({}, {})
+        self._write_lock = asyncio.Lock()
+        self._remote_refreshes: set = set()
+        self.version = 0
+
+    def resolve(self, number: str) -> Optional[CallRoute]:
+        """Route lookup on the ring path: one normalization and one dict lookup"""
+        return self._snapshot[0].get(normalize_e164(number))
+
+    def agent_for_phone(self, phone_number_id: int) -> Optional[int]:
+        route = self._snapshot[1].get(phone_number_id)
+        return route.agent_id if route else None
+
+    def phones_for_agent(self, agent_id: int) -> set:
+        return {route.phone_number_id for route in self._snapshot[1].values() if route.agent_id == agent_id}
+
+    def __len__(self) -> int:
+        return len(self._snapshot[0])
+
+    def _routes_query(self, phone_ids: Optional[Iterable[int]] = None):
+        """Active phone numbers with their active linked agents, lowest agent id first"""
+        query = (
+            select(
+                PhoneNumber.id,
+                PhoneNumber.number,
+                PhoneNumber.user_id,
+                AIAgent.id.label("agent_id")
+            )
+            .join(AgentPhoneMapping, AgentPhoneMapping.phone_number_id == PhoneNumber.id)
+            .join(AIAgent, AIAgent.id == AgentPhoneMapping.agent_id)
+            .where(PhoneNumber.status == "active", AIAgent.is_active == True)
+            .order_by(PhoneNumber.id, AIAgent.id)
+        )
+        if phone_ids is not None:
+            query = query.where(PhoneNumber.id.in_(phone_ids))
+        return query
+
+    async def _load(self, phone_ids: Optional[Iterable[int]] = None) -> Dict[int, CallRoute]:
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(self._routes_query(phone_ids))
+            routes: Dict[int, CallRoute] = {}
+            for row in rows:
+                routes.setdefault(row.id, CallRoute(
+                    number=normalize_e164(row.number),
+                    phone_number_id=row.id,
+                    user_id=row.user_id,
+                    agent_id=row.agent_id
+                ))
+            return routes
+
+    def _swap(self, by_phone: Dict[int, CallRoute]):
+        by_number: Dict[str, CallRoute] = {}
+        # If a number is registered twice, the oldest phone row keeps the route
+        for phone_id in sorted(by_phone, reverse=True):
+            route = by_phone[phone_id]
+            by_number[route.number] = route
+        self._snapshot = (by_number, by_phone)
+        self.version += 1
+
+    async def rebuild(self):
+        """Full rebuild, at startup and periodically as a safety net"""
+        async with self._write_lock:
+            self._swap(await self._load())
+
+    async def refresh_phones(self, phone_ids: Iterable[int]):
+        """
+        Re-read the routes of the given phone numbers after they or their links changed, in every worker.
+        Callers have already committed, so failures are logged, not raised; run_refresh repairs a miss.
+        """
+        phone_ids = set(phone_ids)
+        if not phone_ids:
+            return
+        try:
+            await self._refresh_local(phone_ids)
+        except Exception as e:
+            print(f"Routing Index Error: {str(e)}")
+        await invalidation_bus.publish(ROUTES_TOPIC, ",".join(str(pid) for pid in sorted(phone_ids)))
+
+    async def _refresh_local(self, phone_ids: set):
+        async with self._write_lock:
+            fresh = await self._load(phone_ids)
+            by_phone = {pid: route for pid, route in self._snapshot[1].items() if pid not in phone_ids}
+            by_phone.update(fresh)
+            self._swap(by_phone)
+
+    def _schedule(self, refresh):
+        """Bus handlers are synchronous; the re-read runs as a task"""
+        async def run():
+            try:
+                await refresh
+            except Exception as e:
+                print(f"Routing Index Refresh Error: {str(e)}")
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._remote_refreshes.add(task)
+        task.add_done_callback(self._remote_refreshes.discard)
+
+    def on_remote_change(self, key: str):
+        self._schedule(self._refresh_local({int(pid) for pid in key.split(",") if pid}))
+
+    def on_bus_reset(self):
+        # Changes may have been missed while the listener was disconnected
+        self._schedule(self.rebuild())
+
+    async def refresh_agent(self, agent_id: int):
+        """Re-read every route the agent serves or could serve after it changed; never raises"""
+        try:
+            async with AsyncSessionLocal() as db:
+                mapped = await db.execute(
+                    select(AgentPhoneMapping.phone_number_id).where(AgentPhoneMapping.agent_id == agent_id)
+                )
+                phone_ids = set(mapped.scalars().all())
+        except Exception as e:
+            print(f"Routing Index Error: {str(e)}")
+            phone_ids = set()
+        await self.refresh_phones(phone_ids | self.phones_for_agent(agent_id))
+
+    async def run_refresh(self):
+        """Periodic full rebuild, started from the application lifespan"""
+        while True:
+            await asyncio.sleep(settings.ROUTING_INDEX_REFRESH_SECONDS)
+            try:
+                await self.rebuild()
+            except Exception as e:
+                print(f"Routing Index Refresh Error: {str(e)}")
+
+
+call_router = CallRoutingIndex()
+invalidation_bus.subscribe(ROUTES_TOPIC, call_router.on_remote_change, reset=call_router.on_bus_reset)
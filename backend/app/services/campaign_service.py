@@ -0,0 +1,59 @@
+"""
+Campaign Service
+Contact-list loading and progress counts for outbound campaigns
+"""
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.campaign import CampaignContact
+from app.schemas.campaign import CampaignContactCreate
+from app.services.call_routing import normalize_e164
+
+
+async def add_contacts(db: AsyncSession, campaign_id: int, contacts: List[CampaignContactCreate]) -> Tuple[int, int]:
+    """
+    Bulk-insert contacts with normalized numbers, skipping numbers already in the
+    campaign. Runs in the caller's transaction; returns (added, skipped).
+    """
+    rows = {}
+    for contact in contacts:
+        phone = normalize_e164(contact.phone)
+        rows.setdefault(phone, {
+            "campaign_id": campaign_id,
+            "phone": phone,
+            "name": contact.name,
+            "variables": contact.variables,
+            "status": "pending",
+            "attempts": 0,
+        })
+
+    added = 0
+    values = list(rows.values())
+    for start in range(0, len(values), settings.CALL_LOG_INGEST_CHUNK_SIZE):
+        chunk = values[start:start + settings.CALL_LOG_INGEST_CHUNK_SIZE]
+        result = await db.execute(
+            pg_insert(CampaignContact).values(chunk)
+            .on_conflict_do_nothing(index_elements=["campaign_id", "phone"])
+            .returning(CampaignContact.id)
+        )
+        added += len(result.all())
+    return added, len(contacts) - added
+
+
+async def contact_counts(db: AsyncSession, campaign_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """Contacts per status for each campaign, in one grouped query"""
+    campaign_ids = list(campaign_ids)
+    counts: Dict[int, Dict[str, int]] = {campaign_id: {} for campaign_id in campaign_ids}
+    if not campaign_ids:
+        return counts
+    result = await db.execute(
+        select(CampaignContact.campaign_id, CampaignContact.status, func.count())
+        .where(CampaignContact.campaign_id.in_(campaign_ids))
+        .group_by(CampaignContact.campaign_id, CampaignContact.status)
+    )
+    for campaign_id, contact_status, count in result.all():
+        counts[campaign_id][contact_status] = count
+    return counts
@@ -0,0 +1,135 @@
+"""
+Counter Service
+Incremental maintenance and reconciliation of per-tenant counters
+"""
+import asyncio
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, run_after_commit
+from app.models.user import User
+from app.models.phone_number import PhoneNumber
+from app.models.ai_agent import AIAgent
+from app.models.call_log import CallLog
+from app.models.order import Order
+from app.models.tenant_counters import TenantCounters
+
+COUNTER_FIELDS = (
+    "total_phone_numbers",
+    "active_phone_numbers",
+    "total_ai_agents",
+    "active_ai_agents",
+    "total_calls",
+    "total_orders",
+)
+
+# Arbitrary key for the advisory lock that keeps workers from reconciling at the same time
+RECONCILE_LOCK_KEY = 728_001
+
+
+async def apply_counter_deltas(db: AsyncSession, user_id: int, **deltas: int):
+    """
+    Adjust a tenant's counters inside the caller's transaction.
+    Tenants without a counters row are skipped; their row is built on first read.
+    """
+    values = {
+        field: getattr(TenantCounters, field) + delta
+        for field, delta in deltas.items()
+        if delta
+    }
+    if not values:
+        return
+
+    await db.execute(
+        update(TenantCounters)
+        .where(TenantCounters.user_id == user_id)
+        .values(updated_at=datetime.utcnow(), **values)
+    )
+
+    # Imported here to avoid a cycle: the dashboard service reads through this module
+    from app.services.dashboard_service import invalidate_dashboard_cache
+    # Only once the new counts are visible; earlier, a concurrent read could re-cache the old ones
+    run_after_commit(db, lambda: invalidate_dashboard_cache(user_id))
+
+
+def _counts_select(user_id: Optional[int] = None):
+    """One statement computing every counter from the source tables."""
+    def count(column, *conditions):
+        return (
+            select(func.count(column))
+            .where(*conditions)
+            .correlate(User)
+            .scalar_subquery()
+        )
+
+    stmt = select(
+        User.id,
+        count(PhoneNumber.id, PhoneNumber.user_id == User.id),
+        count(PhoneNumber.id, PhoneNumber.user_id == User.id, PhoneNumber.status == "active"),
+        count(AIAgent.id, AIAgent.user_id == User.id),
+        count(AIAgent.id, AIAgent.user_id == User.id, AIAgent.is_active == True),
+        count(CallLog.id, CallLog.user_id == User.id),
+        count(Order.id, Order.user_id == User.id),
+        func.now(),
+    )
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+    return stmt
+
+
+def _reconcile_statement(user_id: Optional[int] = None):
+    insert_stmt = pg_insert(TenantCounters).from_select(
+        ["user_id", *COUNTER_FIELDS, "updated_at"],
+        _counts_select(user_id)
+    )
+    return insert_stmt.on_conflict_do_update(
+        index_elements=[TenantCounters.user_id],
+        set_={
+            field: getattr(insert_stmt.excluded, field)
+            for field in (*COUNTER_FIELDS, "updated_at")
+        }
+    )
+
+
+async def reconcile_tenant_counters(db: AsyncSession, user_id: int) -> Optional[TenantCounters]:
+    """Rebuild one tenant's counters from the source tables (caller commits)"""
+    await db.execute(_reconcile_statement(user_id))
+    result = await db.execute(
+        select(TenantCounters)
+        .where(TenantCounters.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def reconcile_all_counters() -> bool:
+    """
+    Rebuild every tenant's counters in one statement.
+    Returns False if another worker holds the reconcile lock.
+    """
+    async with AsyncSessionLocal() as db:
+        locked = await db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+        )
+        if not locked.scalar():
+            return False
+        await db.execute(_reconcile_statement())
+        await db.commit()
+
+    from app.services.dashboard_service import clear_dashboard_cache
+    clear_dashboard_cache()
+    return True
+
+
+async def run_counter_reconciliation():
+    """Background reconciliation loop, started from the application lifespan."""
+    while True:
+        await asyncio.sleep(settings.COUNTER_RECONCILE_INTERVAL_SECONDS)
+        try:
+            await reconcile_all_counters()
+        except Exception as e:
+            print(f"Counter Reconcile Error: {str(e)}")
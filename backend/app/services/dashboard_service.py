@@ -3,67 +3,53 @@ Dashboard Service
 Business logic for dashboard statistics
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 
-from app.models.user import User
-from app.models.phone_number import PhoneNumber
-from app.models.ai_agent import AIAgent
-from app.models.call_log import CallLog
-from app.models.order import Order
+from app.core.cache import TTLCache, SingleFlight
+from app.core.config import settings
+from app.models.tenant_counters import TenantCounters
 from app.schemas.dashboard import DashboardStats
+from app.services.counter_service import reconcile_tenant_counters
+
+# Short-lived cache in front of the counters row; concurrent misses share one load
+_stats_cache = TTLCache(ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
+_stats_loads = SingleFlight()
+
+
+def invalidate_dashboard_cache(user_id: int):
+    _stats_cache.invalidate(user_id)
+
+
+def clear_dashboard_cache():
+    _stats_cache.clear()
 
 
 async def get_dashboard_stats(db: AsyncSession, user_id: int) -> DashboardStats:
     """Get dashboard statistics for a user"""
-    # Total phone numbers
-    total_phones_result = await db.execute(
-        select(func.count(PhoneNumber.id)).where(PhoneNumber.user_id == user_id)
-    )
-    total_phone_numbers = total_phones_result.scalar() or 0
-    
-    # Active phone numbers
-    active_phones_result = await db.execute(
-        select(func.count(PhoneNumber.id)).where(
-            PhoneNumber.user_id == user_id,
-            PhoneNumber.status == "active"
-        )
-    )
-    active_phone_numbers = active_phones_result.scalar() or 0
-    
-    # Total AI agents
-    total_agents_result = await db.execute(
-        select(func.count(AIAgent.id)).where(AIAgent.user_id == user_id)
-    )
-    total_ai_agents = total_agents_result.scalar() or 0
-    
-    # Active AI agents
-    active_agents_result = await db.execute(
-        select(func.count(AIAgent.id)).where(
-            AIAgent.user_id == user_id,
-            AIAgent.is_active == True
-        )
-    )
-    active_ai_agents = active_agents_result.scalar() or 0
-    
-    # Total calls
-    total_calls_result = await db.execute(
-        select(func.count(CallLog.id)).where(CallLog.user_id == user_id)
+    stats = _stats_cache.get(user_id)
+    if stats is not None:
+        return stats
+    return await _stats_loads.do(user_id, lambda: _load_dashboard_stats(db, user_id))
+
+
+async def _load_dashboard_stats(db: AsyncSession, user_id: int) -> DashboardStats:
+    """Read the tenant's counters row, building it on first use"""
+    result = await db.execute(
+        select(TenantCounters).where(TenantCounters.user_id == user_id)
     )
-    total_calls = total_calls_result.scalar() or 0
+    counters = result.scalar_one_or_none()
     
-    # Total orders
-    total_orders_result = await db.execute(
-        select(func.count(Order.id)).where(Order.user_id == user_id)
-    )
-    total_orders = total_orders_result.scalar() or 0
+    if counters is None:
+        counters = await reconcile_tenant_counters(db, user_id)
+        await db.commit()
     
-    return DashboardStats(
-        total_phone_numbers=total_phone_numbers,
-        active_phone_numbers=active_phone_numbers,
-        total_ai_agents=total_ai_agents,
-        active_ai_agents=active_ai_agents,
-        total_calls=total_calls,
-        total_orders=total_orders
+    stats = DashboardStats(
+        total_phone_numbers=counters.total_phone_numbers if counters else 0,
+        active_phone_numbers=counters.active_phone_numbers if counters else 0,
+        total_ai_agents=counters.total_ai_agents if counters else 0,
+        active_ai_agents=counters.active_ai_agents if counters else 0,
+        total_calls=counters.total_calls if counters else 0,
+        total_orders=counters.total_orders if counters else 0
     )
-
+    _stats_cache.set(user_id, stats)
+    return stats
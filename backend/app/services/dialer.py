@@ -0,0 +1,279 @@
+"""
+Campaign Dialer
+Places outbound campaign calls. One worker at a time leads (Postgres advisory
+lock); the leader claims due contacts of running campaigns inside their calling
+window, bounded by per-phone-number and per-tenant concurrency caps, and records
+every outcome as a CallLog. Failed attempts are retried with exponential backoff.
+"""
+import asyncio
+import random
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+import asyncpg
+from sqlalchemy import select, update, func
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, direct_dsn
+from app.models.campaign import Campaign, CampaignContact
+from app.models.phone_number import PhoneNumber
+from app.services.call_ingest_service import ingest_call_logs
+from app.services.telephony.outbound import DialResult, backend_problem, get_backend
+
+DIALER_LOCK_KEY = 728003
+LEADER_RETRY_SECONDS = 10.0
+RECOVERY_EVERY_TICKS = 30  # Lost-call sweep while leading, about once a minute at the default poll
+
+
+def in_calling_window(campaign: Campaign, now: datetime) -> bool:
+    """now is naive UTC; the window is in the campaign's local time and may span midnight"""
+    local = now.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(campaign.timezone)).time()
+    start, end = campaign.window_start, campaign.window_end
+    if start <= end:
+        return start <= local < end
+    return local >= start or local < end
+
+
+def dialer_unavailable_reason() -> Optional[str]:
+    """Why this deployment places no outbound calls, or None when the dialer runs"""
+    if not settings.DIALER_ENABLED:
+        return "Outbound dialing is disabled (DIALER_ENABLED)"
+    if settings.DB_PGBOUNCER_MODE:
+        # Session locks do not survive a transaction pooler, so every worker would lead and multiply the caps
+        return "Outbound dialing does not run in pgbouncer mode"
+    return backend_problem()
+
+
+def retry_delay(backoff_seconds: int, attempts: int) -> timedelta:
+    """Doubles per attempt, with ±20% jitter so retries of one batch spread out"""
+    delay = backoff_seconds * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+@dataclass(frozen=True)
+class CallJob:
+    call_id: str
+    campaign_id: int
+    user_id: int
+    agent_id: int
+    phone_number_id: int
+    from_number: str
+    contact_id: int
+    to_number: str
+    attempt: int
+    max_attempts: int
+    retry_backoff_seconds: int
+
+
+class CampaignDialer:
+    def __init__(self):
+        self._backend = None
+        self.active_by_phone: Counter = Counter()
+        self.active_by_tenant: Counter = Counter()
+        self._calls: set = set()
+        self.is_leader = False
+        self.started = 0
+        self.outcomes: Counter = Counter()
+        self._finished_at: deque = deque()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = get_backend()
+        return self._backend
+
+    async def run(self):
+        """Leader election loop, started from the application lifespan"""
+        reason = dialer_unavailable_reason()
+        if reason:
+            if settings.DIALER_ENABLED:
+                print(f"Dialer disabled: {reason}")
+            return
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(direct_dsn())
+                while not await connection.fetchval("SELECT pg_try_advisory_lock($1)", DIALER_LOCK_KEY):
+                    await asyncio.sleep(LEADER_RETRY_SECONDS)
+                await self._lead(connection)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Dialer Error: {str(e)}")
+            finally:
+                self.is_leader = False
+                # Closing the session releases the lock for the next leader
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(LEADER_RETRY_SECONDS)
+
+    async def _lead(self, lock_connection: asyncpg.Connection):
+        self.is_leader = True
+        ticks = 0
+        while True:
+            # Stop dialing as soon as the lock's session is gone
+            await lock_connection.fetchval("SELECT 1")
+            if ticks % RECOVERY_EVERY_TICKS == 0:
+                # Also while leading: a call whose task died mid-dial would otherwise stay "dialing"
+                await self._recover_lost_calls()
+            ticks += 1
+            await self.tick()
+            await asyncio.sleep(settings.DIALER_POLL_SECONDS)
+
+    async def _recover_lost_calls(self):
+        """Contacts left "dialing" by a crashed leader go back to the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.DIALER_MAX_CALL_SECONDS)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(CampaignContact)
+                .where(CampaignContact.status == "dialing", CampaignContact.updated_at < cutoff)
+                .values(status="pending", last_outcome="failed", next_attempt_at=datetime.utcnow())
+            )
+            await db.commit()
+
+    async def tick(self):
+        """Claims as many due contacts as the caps allow and starts their calls"""
+        now = datetime.utcnow()
+        jobs = []
+        claimed_phone: Counter = Counter()
+        claimed_tenant: Counter = Counter()
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Campaign, PhoneNumber.number)
+                .join(PhoneNumber, PhoneNumber.id == Campaign.phone_number_id)
+                .where(Campaign.status == "running")
+                .order_by(Campaign.id)
+            )
+            for campaign, from_number in result.all():
+                if not in_calling_window(campaign, now):
+                    continue
+                slots = min(
+                    settings.DIALER_MAX_CALLS_PER_PHONE
+                    - self.active_by_phone[campaign.phone_number_id] - claimed_phone[campaign.phone_number_id],
+                    settings.DIALER_MAX_CALLS_PER_TENANT
+                    - self.active_by_tenant[campaign.user_id] - claimed_tenant[campaign.user_id],
+                )
+                if slots <= 0:
+                    continue
+
+                due = await db.execute(
+                    select(CampaignContact)
+                    .where(
+                        CampaignContact.campaign_id == campaign.id,
+                        CampaignContact.status == "pending",
+                        CampaignContact.next_attempt_at <= now
+                    )
+                    .order_by(CampaignContact.next_attempt_at, CampaignContact.id)
+                    .limit(slots)
+                    .with_for_update(skip_locked=True)
+                )
+                contacts = due.scalars().all()
+                if not contacts:
+                    await self._complete_if_finished(db, campaign)
+                    continue
+
+                for contact in contacts:
+                    contact.status = "dialing"
+                    contact.attempts = (contact.attempts or 0) + 1
+                    contact.last_call_id = f"out_{uuid.uuid4().hex}"
+                    jobs.append(CallJob(
+                        call_id=contact.last_call_id,
+                        campaign_id=campaign.id,
+                        user_id=campaign.user_id,
+                        agent_id=campaign.agent_id,
+                        phone_number_id=campaign.phone_number_id,
+                        from_number=from_number,
+                        contact_id=contact.id,
+                        to_number=contact.phone,
+                        attempt=contact.attempts,
+                        max_attempts=campaign.max_attempts,
+                        retry_backoff_seconds=campaign.retry_backoff_seconds
+                    ))
+                    claimed_phone[campaign.phone_number_id] += 1
+                    claimed_tenant[campaign.user_id] += 1
+            await db.commit()
+
+        for job in jobs:
+            self.active_by_phone[job.phone_number_id] += 1
+            self.active_by_tenant[job.user_id] += 1
+            self.started += 1
+            task = asyncio.create_task(self._place_call(job))
+            self._calls.add(task)
+            task.add_done_callback(self._calls.discard)
+
+    async def _complete_if_finished(self, db, campaign: Campaign):
+        remaining = await db.execute(
+            select(func.count()).where(
+                CampaignContact.campaign_id == campaign.id,
+                CampaignContact.status.in_(("pending", "dialing"))
+            )
+        )
+        if not remaining.scalar():
+            campaign.status = "completed"
+
+    async def _place_call(self, job: CallJob):
+        try:
+            result = await asyncio.wait_for(
+                self.backend.dial(job.from_number, job.to_number, job.agent_id, job.call_id),
+                timeout=settings.DIALER_MAX_CALL_SECONDS
+            )
+        except Exception as e:
+            print(f"Dial Error ({job.call_id}): {str(e) or type(e).__name__}")
+            result = DialResult("failed", 0.0)
+        finally:
+            self.active_by_phone[job.phone_number_id] -= 1
+            self.active_by_tenant[job.user_id] -= 1
+
+        self.outcomes[result.status] += 1
+        self._finished_at.append(time.monotonic())
+        try:
+            await self._record(job, result)
+        except Exception as e:
+            print(f"Dialer Record Error ({job.call_id}): {str(e)}")
+
+    async def _record(self, job: CallJob, result: DialResult):
+        """Updates the contact and logs the call in one transaction"""
+        if result.status == "completed":
+            values: Dict[str, Any] = {"status": "completed"}
+        elif job.attempt >= job.max_attempts:
+            values = {"status": "exhausted"}
+        else:
+            values = {
+                "status": "pending",
+                "next_attempt_at": datetime.utcnow() + retry_delay(job.retry_backoff_seconds, job.attempt)
+            }
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(CampaignContact)
+                .where(CampaignContact.id == job.contact_id)
+                .values(last_outcome=result.status, **values)
+            )
+            # Commits the contact update together with the call log
+            await ingest_call_logs(db, job.user_id, [{
+                "call_id": job.call_id,
+                "phone_number_id": job.phone_number_id,
+                "caller_number": job.to_number,
+                "duration": result.duration,
+                "status": result.status,
+            }])
+
+    def stats(self) -> Dict[str, Any]:
+        hour_ago = time.monotonic() - 3600
+        while self._finished_at and self._finished_at[0] < hour_ago:
+            self._finished_at.popleft()
+        return {
+            "leader": self.is_leader,
+            "active_calls": len(self._calls),
+            "started": self.started,
+            "outcomes": dict(self.outcomes),
+            "calls_last_hour": len(self._finished_at),
+        }
+
+
+campaign_dialer = CampaignDialer()
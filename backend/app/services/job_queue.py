@@ -0,0 +1,326 @@
+"""
+Job Queue
+Durable background jobs for work that must not run on a live call's loop
+(post-call webhooks, transcript processing, order extraction).
+Jobs are stored in a local SQLite file (WAL mode) owned by one store thread, so
+enqueueing is a single fast insert and survives restarts. Workers claim due jobs
+under a lease; a job whose worker died is re-queued when its lease expires.
+Failures are retried with exponential backoff until max_attempts, then kept as "dead".
+"""
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import time
+import uuid
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+MAINTENANCE_SECONDS = 60.0
+LATENCY_SAMPLES = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_at REAL NOT NULL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    locked_by TEXT,
+    locked_until REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_run_at ON jobs (status, run_at);
+"""
+
+JobHandlerFunc = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    func: JobHandlerFunc
+    max_attempts: int
+    concurrency: int
+
+
+@dataclass(frozen=True)
+class Job:
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    enqueued_at: float
+    started_at: float
+
+
+def retry_backoff(attempts: int) -> float:
+    """Doubles per attempt up to the cap, with ±20% jitter so a failed batch spreads out"""
+    delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0)
+    return min(delay, settings.JOB_RETRY_MAX_BACKOFF_SECONDS) * random.uniform(0.8, 1.2)
+
+
+def _percentile(samples, q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)], 3)
+
+
+class JobQueue:
+    def __init__(self, path: str):
+        self.path = path
+        self.worker_id = uuid.uuid4().hex
+        # One thread owns the connection, so store calls never block the event loop or race
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._handlers: Dict[str, JobHandler] = {}
+        self._running: Dict[int, asyncio.Task] = {}
+        self._running_by_kind: Counter = Counter()
+        self._wake: Optional[asyncio.Event] = None
+        self.outcomes: Counter = Counter()
+        self._wait_times: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._run_times: deque = deque(maxlen=LATENCY_SAMPLES)
+
+    # --- Handlers ---
+
+    def handler(self, kind: str, max_attempts: Optional[int] = None, concurrency: Optional[int] = None):
+        """
+        Registers an async handler(payload) for a job kind. Handlers must be idempotent:
+        a job can run again after a crash or a lease expiry.
+        """
+        def decorator(func: JobHandlerFunc) -> JobHandlerFunc:
+            self._handlers[kind] = JobHandler(
+                func=func,
+                max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+                concurrency=concurrency or settings.JOB_WORKER_CONCURRENCY
+            )
+            return func
+        return decorator
+
+    # --- Store (runs on the store thread only) ---
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit; claims open their own IMMEDIATE transaction
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _store(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _insert(self, kind: str, payload: str, run_at: float, max_attempts: int, now: float) -> int:
+        cursor = self._connect().execute(
+            "INSERT INTO jobs (kind, payload, max_attempts, run_at, enqueued_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, payload, max_attempts, run_at, now)
+        )
+        return cursor.lastrowid
+
+    def _claim(self, limits: Dict[str, int], total: int, now: float) -> List[Job]:
+        """Atomically moves due jobs to running, within the free slots of each kind"""
+        conn = self._connect()
+        placeholders = ",".join("?" * len(limits))
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                f"SELECT id, kind, payload, attempts, max_attempts, enqueued_at FROM jobs "
+                f"WHERE status = 'queued' AND run_at <= ? AND kind IN ({placeholders}) "
+                f"ORDER BY run_at, id LIMIT ?",
+                (now, *limits, total * 4)
+            ).fetchall()
+            picked, taken = [], Counter()
+            for row in rows:
+                if len(picked) == total:
+                    break
+                if taken[row[1]] < limits[row[1]]:
+                    taken[row[1]] += 1
+                    picked.append(row)
+            conn.executemany(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, "
+                "locked_by = ?, locked_until = ? WHERE id = ?",
+                [(now, self.worker_id, now + settings.JOB_LEASE_SECONDS, row[0]) for row in picked]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return [
+            Job(id=row[0], kind=row[1], payload=json.loads(row[2]), attempts=row[3] + 1,
+                max_attempts=row[4], enqueued_at=row[5], started_at=now)
+            for row in picked
+        ]
+
+    def _complete(self, job_id: int, now: float):
+        self._connect().execute(
+            "UPDATE jobs SET status = 'done', finished_at = ?, locked_by = NULL, locked_until = NULL, "
+            "last_error = NULL WHERE id = ?",
+            (now, job_id)
+        )
+
+    def _fail(self, job_id: int, error: str, retry_at: Optional[float], now: float):
+        """Re-queues the job at retry_at, or buries it as dead when retry_at is None"""
+        if retry_at is None:
+            self._connect().execute(
+                "UPDATE jobs SET status = 'dead', finished_at = ?, locked_by = NULL, locked_until = NULL, "
+                "last_error = ? WHERE id = ?",
+                (now, error, job_id)
+            )
+        else:
+            self._connect().execute(
+                "UPDATE jobs SET status = 'queued', run_at = ?, locked_by = NULL, locked_until = NULL, "
+                "last_error = ? WHERE id = ?",
+                (retry_at, error, job_id)
+            )
+
+    def _release(self, job_ids: List[int]):
+        """Hands jobs interrupted by shutdown back without charging them an attempt"""
+        self._connect().executemany(
+            "UPDATE jobs SET status = 'queued', attempts = attempts - 1, locked_by = NULL, "
+            "locked_until = NULL WHERE id = ? AND status = 'running'",
+            [(job_id,) for job_id in job_ids]
+        )
+
+    def _maintain(self, now: float) -> int:
+        """Re-queues jobs whose lease expired and purges old finished jobs"""
+        conn = self._connect()
+        expired = conn.execute(
+            "UPDATE jobs SET status = 'queued', locked_by = NULL, locked_until = NULL, "
+            "last_error = 'lease expired' WHERE status = 'running' AND locked_until < ?",
+            (now,)
+        ).rowcount
+        conn.execute(
+            "DELETE FROM jobs WHERE status = 'done' AND finished_at < ?",
+            (now - settings.JOB_RETENTION_SECONDS,)
+        )
+        return expired
+
+    def _depth(self, now: float) -> Dict[str, Any]:
+        conn = self._connect()
+        by_status = dict(conn.execute("SELECT status, count(*) FROM jobs GROUP BY status").fetchall())
+        oldest = conn.execute(
+            "SELECT min(run_at) FROM jobs WHERE status = 'queued' AND run_at <= ?", (now,)
+        ).fetchone()[0]
+        return {
+            "queued": by_status.get("queued", 0),
+            "running": by_status.get("running", 0),
+            "dead": by_status.get("dead", 0),
+            "oldest_due_seconds": round(now - oldest, 3) if oldest else 0.0,
+        }
+
+    # --- Producer API ---
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], delay: float = 0.0,
+                      max_attempts: Optional[int] = None) -> int:
+        """Persists a job and wakes the workers; returns the job id"""
+        handler = self._handlers.get(kind)
+        attempts = max_attempts or (handler.max_attempts if handler else settings.JOB_MAX_ATTEMPTS)
+        now = time.time()
+        job_id = await self._store(self._insert, kind, json.dumps(payload, default=str), now + delay, attempts, now)
+        self.outcomes["enqueued"] += 1
+        if self._wake and not delay:
+            self._wake.set()
+        return job_id
+
+    # --- Workers ---
+
+    async def _execute(self, job: Job):
+        handler = self._handlers[job.kind]
+        self._wait_times.append(job.started_at - job.enqueued_at)
+        started = time.monotonic()
+        try:
+            # A job must finish inside its lease, or another worker could pick it up too
+            await asyncio.wait_for(handler.func(job.payload), timeout=settings.JOB_LEASE_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"[:1000]
+            retry_at = time.time() + retry_backoff(job.attempts) if job.attempts < job.max_attempts else None
+            self.outcomes["retried" if retry_at else "dead"] += 1
+            print(f"Job Error ({job.kind} #{job.id}, attempt {job.attempts}): {error}")
+            await self._store(self._fail, job.id, error, retry_at, time.time())
+        else:
+            self.outcomes["done"] += 1
+            await self._store(self._complete, job.id, time.time())
+        finally:
+            self._run_times.append(time.monotonic() - started)
+
+    def _on_done(self, job: Job, task: asyncio.Task):
+        self._running.pop(job.id, None)
+        self._running_by_kind[job.kind] -= 1
+        if self._wake:
+            self._wake.set()
+
+    async def _claim_free_slots(self):
+        free = settings.JOB_WORKER_CONCURRENCY - len(self._running)
+        limits = {
+            kind: handler.concurrency - self._running_by_kind[kind]
+            for kind, handler in self._handlers.items()
+            if handler.concurrency > self._running_by_kind[kind]
+        }
+        if free <= 0 or not limits:
+            return
+        for job in await self._store(self._claim, limits, free, time.time()):
+            task = asyncio.create_task(self._execute(job))
+            self._running[job.id] = task
+            self._running_by_kind[job.kind] += 1
+            task.add_done_callback(lambda t, job=job: self._on_done(job, t))
+
+    async def run(self):
+        """Worker loop, started from the application lifespan"""
+        self._wake = asyncio.Event()
+        last_maintenance = 0.0
+        try:
+            while True:
+                try:
+                    if time.monotonic() - last_maintenance >= MAINTENANCE_SECONDS:
+                        expired = await self._store(self._maintain, time.time())
+                        if expired:
+                            print(f"Job Queue: re-queued {expired} jobs with expired leases")
+                        last_maintenance = time.monotonic()
+                    self._wake.clear()
+                    await self._claim_free_slots()
+                except Exception as e:
+                    print(f"Job Queue Error: {str(e)}")
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=settings.JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            interrupted = list(self._running)
+            for task in list(self._running.values()):
+                task.cancel()
+            if interrupted:
+                await self._store(self._release, interrupted)
+            raise
+
+    async def stats(self) -> Dict[str, Any]:
+        depth = await self._store(self._depth, time.time())
+        return {
+            **depth,
+            "active": len(self._running),
+            "outcomes": dict(self.outcomes),
+            "wait_p50_seconds": _percentile(self._wait_times, 0.5),
+            "wait_p95_seconds": _percentile(self._wait_times, 0.95),
+            "run_p50_seconds": _percentile(self._run_times, 0.5),
+            "run_p95_seconds": _percentile(self._run_times, 0.95),
+        }
+
+
+job_queue = JobQueue(settings.JOB_QUEUE_PATH)
@@ -0,0 +1,287 @@
+"""
+Order Extraction
+Turns finished call transcripts into Order rows linked by call_id.
+Each call arrives as its own order.extract job; concurrent jobs are gathered into
+micro-batches so one LLM request covers several calls, and each batch is written
+with one bulk insert. Every extracted call gets an order_extractions marker in
+the same transaction as its orders, even when it had none; calls with a marker
+are skipped, so retried jobs never duplicate orders or pay for a second extraction.
+"""
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.call_log import CallLog
+from app.models.order import Order
+from app.models.order_extraction import OrderExtraction
+from app.services.agent.brain import agent_brain
+from app.services.call_ingest_service import ingest_call_logs
+from app.services.counter_service import apply_counter_deltas
+from app.services.job_queue import job_queue
+from app.services.post_call import ORDER_EXTRACT_JOB
+from app.services.usage_meter import usage_meter
+
+TOKENS_PER_CALL = 400  # Completion budget per call in a batch
+
+EXTRACTION_PROMPT = """You extract customer orders from phone call transcripts.
+Each call is delimited by a line "### CALL <call_id>".
+Return JSON: {"calls": [{"call_id": "...", "orders": [{"customer_name": "...", "phone": "...",
+"address": "...", "items": [{"name": "...", "quantity": 1, "notes": "..."}], "notes": "..."}]}]}
+Include every call_id exactly once. Only report orders the customer actually confirmed;
+use an empty "orders" list when there is none. Use null for details that were not given."""
+
+
+class ExtractionError(Exception):
+    """The model's reply did not cover a call in the batch."""
+
+
+def format_transcript(transcript: List[Dict[str, str]]) -> str:
+    text = "\n".join(f"{turn.get('role')}: {turn.get('content')}" for turn in transcript)
+    # Orders are confirmed at the end of a call, so long calls keep their tail
+    return text[-settings.ORDER_EXTRACTION_MAX_TRANSCRIPT_CHARS:]
+
+
+def order_rows(call: Dict[str, Any], orders: List[Dict[str, Any]], call_id: Optional[str], now: datetime) -> List[Dict[str, Any]]:
+    rows = []
+    for order in orders:
+        if not isinstance(order, dict):
+            continue
+        name, phone = order.get("customer_name"), order.get("phone")
+        if not name and not phone:
+            continue
+        details = {key: order[key] for key in ("items", "notes") if order.get(key)}
+        rows.append({
+            "user_id": call["user_id"],
+            "call_id": call_id,
+            "customer_name": str(name or ""),
+            "phone": str(phone or ""),
+            "address": order.get("address"),
+            "order_details": json.dumps(details) if details else None,
+            "created_at": now,
+            "updated_at": now,
+        })
+    return rows
+
+
+class OrderExtractor:
+    def __init__(self):
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._pending_chars = 0
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._batches: set = set()
+        self.counts: Counter = Counter()
+        self.llm_seconds = 0.0
+        self.cost_usd = 0.0
+        self._completed_at: deque = deque()
+
+    async def extract(self, call: Dict[str, Any]) -> int:
+        """Queues one call for the next batch and waits for its outcome; returns orders created"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((call, future))
+        self._pending_chars += len(format_transcript(call.get("transcript") or []))
+        if (len(self._pending) >= settings.ORDER_EXTRACTION_BATCH_SIZE
+                or self._pending_chars >= settings.ORDER_EXTRACTION_MAX_BATCH_CHARS):
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(settings.ORDER_EXTRACTION_BATCH_WAIT_SECONDS)
+        self._flush_timer = None
+        self._flush()
+
+    def _flush(self):
+        if self._flush_timer and self._flush_timer is not asyncio.current_task():
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending, self._pending_chars = self._pending, [], 0
+        # Jobs cancelled while waiting (shutdown, lease timeout) are re-run later anyway
+        batch = [(call, future) for call, future in batch if not future.done()]
+        if not batch:
+            return
+        task = asyncio.create_task(self._process(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _process(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        try:
+            outcomes = await self._run_batch([call for call, _ in batch])
+        except Exception as e:
+            outcomes = {call["call_id"]: e for call, _ in batch}
+        for call, future in batch:
+            if future.done():
+                continue
+            outcome = outcomes.get(call["call_id"], ExtractionError("No outcome for call"))
+            if isinstance(outcome, Exception):
+                self.counts["failed_calls"] += 1
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def _complete(self, calls: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """One LLM request for the whole batch; returns orders by call_id"""
+        if not agent_brain.client:
+            raise ExtractionError("OpenAI API key is missing")
+
+        transcripts = "\n\n".join(
+            f"### CALL {call['call_id']}\n{format_transcript(call['transcript'])}" for call in calls
+        )
+        started = time.monotonic()
+        response = await agent_brain.client.chat.completions.create(
+            model=settings.ORDER_EXTRACTION_MODEL,
+            messages=[
+                {"role": "system", "content": EXTRACTION_PROMPT},
+                {"role": "user", "content": transcripts},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=TOKENS_PER_CALL * len(calls)
+        )
+        self.llm_seconds += time.monotonic() - started
+        self.counts["batches"] += 1
+        self.counts["llm_calls"] += len(calls)
+        if response.usage:
+            self.counts["prompt_tokens"] += response.usage.prompt_tokens
+            self.counts["completion_tokens"] += response.usage.completion_tokens
+            self.cost_usd += (
+                response.usage.prompt_tokens * settings.ORDER_EXTRACTION_INPUT_COST_PER_1M
+                + response.usage.completion_tokens * settings.ORDER_EXTRACTION_OUTPUT_COST_PER_1M
+            ) / 1_000_000
+            self._meter(calls, response.usage.total_tokens)
+
+        reply = json.loads(response.choices[0].message.content or "{}")
+        return {
+            str(entry.get("call_id")): entry.get("orders") or []
+            for entry in reply.get("calls", [])
+            if isinstance(entry, dict)
+        }
+
+    def _meter(self, calls: List[Dict[str, Any]], tokens: int):
+        """Bills a batch's tokens to its calls' tenants and agents, in proportion to transcript length"""
+        weights = [len(format_transcript(call.get("transcript") or [])) or 1 for call in calls]
+        total = sum(weights)
+        shares = [tokens * weight // total for weight in weights]
+        # Rounding leftovers go to the first call, so the shares add up to the batch
+        shares[0] += tokens - sum(shares)
+        for call, share in zip(calls, shares):
+            usage_meter.record((call["user_id"], call.get("agent_id")), llm_tokens=share)
+
+    async def _run_batch(self, calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # A job re-run while its first attempt is still queued must not insert twice
+        calls = list({call["call_id"]: call for call in calls}.values())
+        call_ids = [call["call_id"] for call in calls]
+        outcomes: Dict[str, Any] = {}
+
+        # 1. Skip calls extracted by an earlier attempt before paying for the LLM
+        async with AsyncSessionLocal() as db:
+            done = await db.execute(
+                select(OrderExtraction.call_id, OrderExtraction.orders).where(OrderExtraction.call_id.in_(call_ids))
+            )
+            outcomes.update(dict(done.all()))
+        calls = [call for call in calls if call["call_id"] not in outcomes]
+        if not calls:
+            return outcomes
+
+        # No session is open here: a pooled connection must not idle through the LLM round-trip
+        extracted = await self._complete(calls)
+
+        async with AsyncSessionLocal() as db:
+            # 2. Orders reference call_logs; log calls that no other path recorded
+            logged = await db.execute(
+                select(CallLog.call_id, CallLog.user_id).where(CallLog.call_id.in_([c["call_id"] for c in calls]))
+            )
+            owners = dict(logged.all())
+            missing: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+            for call in calls:
+                if call["call_id"] not in owners:
+                    missing[call["user_id"]].append({
+                        "call_id": call["call_id"],
+                        "caller_number": call.get("caller_number") or call.get("channel") or "unknown",
+                        "duration": call.get("duration") or 0.0,
+                        "status": "completed",
+                    })
+            for user_id, events in missing.items():
+                result = await ingest_call_logs(db, user_id, events)
+                owners.update({r.call_id: user_id for r in result.results if r.status in ("created", "updated")})
+
+            # 3. Markers first: a concurrent attempt that already marked a call keeps its orders
+            now = datetime.utcnow()
+            rows_by_call: Dict[str, List[Dict[str, Any]]] = {}
+            for call in calls:
+                if call["call_id"] not in extracted:
+                    outcomes[call["call_id"]] = ExtractionError("Call missing from the model's reply")
+                    continue
+                # Never link to another tenant's call log
+                call_id = call["call_id"] if owners.get(call["call_id"]) == call["user_id"] else None
+                rows_by_call[call["call_id"]] = order_rows(call, extracted[call["call_id"]], call_id, now)
+
+            rows, per_user = [], Counter()
+            if rows_by_call:
+                users = {call["call_id"]: call["user_id"] for call in calls}
+                marked = await db.execute(
+                    pg_insert(OrderExtraction)
+                    .values([
+                        {"call_id": call_id, "user_id": users[call_id], "orders": len(call_rows), "extracted_at": now}
+                        for call_id, call_rows in rows_by_call.items()
+                    ])
+                    .on_conflict_do_nothing(index_elements=[OrderExtraction.call_id])
+                    .returning(OrderExtraction.call_id)
+                )
+                fresh = set(marked.scalars().all())
+                for call_id, call_rows in rows_by_call.items():
+                    if call_id in fresh:
+                        rows.extend(call_rows)
+                        per_user[users[call_id]] += len(call_rows)
+                    outcomes[call_id] = len(call_rows) if call_id in fresh else 0
+
+            # 4. One bulk insert for the batch, plus the tenants' order counters
+            if rows:
+                await db.execute(insert(Order), rows)
+                for user_id, created in per_user.items():
+                    await apply_counter_deltas(db, user_id, total_orders=created)
+            await db.commit()
+
+        finished = time.monotonic()
+        extracted_calls = sum(1 for outcome in outcomes.values() if not isinstance(outcome, Exception))
+        self.counts["calls"] += extracted_calls
+        self.counts["orders"] += len(rows)
+        self._completed_at.extend([finished] * extracted_calls)
+        print(f"Order extraction: {len(calls)} calls in one request, {len(rows)} orders")
+        return outcomes
+
+    def stats(self) -> Dict[str, Any]:
+        window_start = time.monotonic() - 3600
+        while self._completed_at and self._completed_at[0] < window_start:
+            self._completed_at.popleft()
+        llm_calls = self.counts["llm_calls"]
+        batches = self.counts["batches"]
+        return {
+            "calls": self.counts["calls"],
+            "orders": self.counts["orders"],
+            "failed_calls": self.counts["failed_calls"],
+            "calls_last_hour": len(self._completed_at),
+            "pending": len(self._pending),
+            "batches": batches,
+            "avg_batch_size": round(llm_calls / batches, 2) if batches else 0.0,
+            "avg_llm_seconds": round(self.llm_seconds / batches, 3) if batches else 0.0,
+            "prompt_tokens": self.counts["prompt_tokens"],
+            "completion_tokens": self.counts["completion_tokens"],
+            "cost_usd": round(self.cost_usd, 6),
+            "cost_per_call_usd": round(self.cost_usd / llm_calls, 6) if llm_calls else 0.0,
+        }
+
+
+order_extractor = OrderExtractor()
+
+
+@job_queue.handler(ORDER_EXTRACT_JOB, concurrency=settings.ORDER_EXTRACTION_BATCH_SIZE)
+async def handle_order_extract(payload: Dict[str, Any]):
+    await order_extractor.extract(payload)
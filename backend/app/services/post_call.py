@@ -0,0 +1,89 @@
+"""
+Post-call Jobs
+Job handlers for work that used to run (or would have to run) on the call loop.
+Calls only enqueue these; the job queue runs them with retries after the turn or call.
+"""
+import re
+from typing import Any, Dict
+import httpx
+
+from app.core.config import settings
+from app.services.agent.brain import agent_brain
+from app.services.job_queue import job_queue
+from app.services.usage_meter import usage_meter
+
+AGENT_ACTION_JOB = "agent.action"
+CALL_COMPLETED_JOB = "call.completed"
+CALL_SUMMARIZE_JOB = "call.summarize"
+CALL_SUMMARY_DELIVER_JOB = "call.summary.deliver"
+ORDER_EXTRACT_JOB = "order.extract"
+
+_ACTION_TAG = re.compile(r"\[ACTION:\s*([^\]]+)\]")
+WEBHOOK_TIMEOUT_SECONDS = 10.0
+SUMMARY_MAX_TOKENS = 200
+
+SUMMARY_PROMPT = """You summarize phone calls between an AI agent and a caller.
+Reply with 2-4 plain sentences: why the caller called, what was agreed or done,
+and any follow-up the business still owes the caller."""
+
+
+async def deliver_webhook(event: str, payload: Dict[str, Any]):
+    """POSTs an event to the configured webhook; a non-2xx reply fails the job so it is retried"""
+    if not settings.POST_CALL_WEBHOOK_URL:
+        return
+    async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT_SECONDS) as client:
+        response = await client.post(settings.POST_CALL_WEBHOOK_URL, json={"event": event, **payload})
+        response.raise_for_status()
+
+
+@job_queue.handler(AGENT_ACTION_JOB)
+async def handle_agent_action(payload: Dict[str, Any]):
+    actions = [action.strip() for action in _ACTION_TAG.findall(payload.get("response", ""))]
+    print(f"Action triggered in session {payload.get('session_id')}: {actions or payload.get('response')}")
+    await deliver_webhook(AGENT_ACTION_JOB, {**payload, "actions": actions})
+
+
+@job_queue.handler(CALL_COMPLETED_JOB)
+async def handle_call_completed(payload: Dict[str, Any]):
+    if not payload.get("transcript"):
+        return
+    await deliver_webhook(CALL_COMPLETED_JOB, payload)
+
+
+@job_queue.handler(CALL_SUMMARIZE_JOB)
+async def handle_call_summarize(payload: Dict[str, Any]):
+    """
+    Generates the summary once and hands it to its own delivery job, so a failing
+    webhook retries the delivery only, never the LLM call or its metering.
+    """
+    transcript = payload.get("transcript")
+    if not transcript:
+        return
+    if not agent_brain.client:
+        raise RuntimeError("OpenAI API key is missing")
+
+    text = "\n".join(f"{turn.get('role')}: {turn.get('content')}" for turn in transcript)
+    response = await agent_brain.client.chat.completions.create(
+        model=settings.CALL_SUMMARY_MODEL,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": text[-settings.CALL_SUMMARY_MAX_TRANSCRIPT_CHARS:]},
+        ],
+        temperature=0,
+        max_tokens=SUMMARY_MAX_TOKENS
+    )
+
+    details = {key: payload.get(key) for key in ("call_id", "session_id", "user_id", "agent_id", "channel")}
+    await job_queue.enqueue(CALL_SUMMARY_DELIVER_JOB, {
+        **details,
+        "summary": (response.choices[0].message.content or "").strip()
+    })
+    # Metered last: nothing after it can fail the job and re-run the completion
+    if response.usage and payload.get("user_id"):
+        usage_meter.record((payload["user_id"], payload.get("agent_id")), llm_tokens=response.usage.total_tokens)
+
+
+@job_queue.handler(CALL_SUMMARY_DELIVER_JOB)
+async def handle_call_summary_deliver(payload: Dict[str, Any]):
+    # Receivers see the same "call.summarize" event as before the split
+    await deliver_webhook(CALL_SUMMARIZE_JOB, payload)
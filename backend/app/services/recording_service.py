@@ -0,0 +1,209 @@
+"""
+Recording Service
+Per-call audio recording for the agent WebSocket.
+The call loop only enqueues chunks; a writer task batches them into append-only
+track files in a worker thread, so recording never waits on the disk. Tracks are
+finalized (flushed, fsynced, indexed) when the call ends.
+"""
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.call_recording import CallRecording
+from app.services.call_ingest_service import ingest_call_logs
+
+CALLER_TRACK = "caller"
+AGENT_TRACK = "agent"
+
+# Container sniffing for the caller track; MediaRecorder timeslices concatenate into one stream
+CONTAINER_SIGNATURES = (
+    (b"\x1a\x45\xdf\xa3", "audio/webm", "webm"),
+    (b"OggS", "audio/ogg", "ogg"),
+    (b"RIFF", "audio/wav", "wav"),
+    (b"ID3", "audio/mpeg", "mp3"),
+)
+EXTENSIONS = {media_type: extension for _, media_type, extension in CONTAINER_SIGNATURES}
+
+
+def sniff_media_type(data: bytes) -> str:
+    for signature, media_type, _ in CONTAINER_SIGNATURES:
+        if data.startswith(signature):
+            return media_type
+    return "application/octet-stream"
+
+
+def track_path(storage_path: str, track: str, media_type: Optional[str]) -> str:
+    return os.path.join(storage_path, f"{track}.{EXTENSIONS.get(media_type, 'bin')}")
+
+
+class CallRecorder:
+    """Recording state of one call; write() is safe to call from the hot path"""
+    def __init__(self, call_id: str, user_id: int, agent_id: int, storage_path: str):
+        self.call_id = call_id
+        self.user_id = user_id
+        self.agent_id = agent_id
+        self.storage_path = storage_path
+        self.started = time.monotonic()
+        self.media_types: Dict[str, Optional[str]] = {CALLER_TRACK: None, AGENT_TRACK: "audio/mpeg"}
+        self.bytes_written: Dict[str, int] = {CALLER_TRACK: 0, AGENT_TRACK: 0}
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.RECORDING_QUEUE_MAX_CHUNKS)
+        self._files: Dict[str, object] = {}
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._run())
+
+    def write(self, track: str, data: bytes):
+        if not data:
+            return
+        if track == CALLER_TRACK and self.media_types[CALLER_TRACK] is None:
+            self.media_types[CALLER_TRACK] = sniff_media_type(data)
+        try:
+            self._queue.put_nowait((track, data))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self):
+        buffers: Dict[str, bytearray] = {CALLER_TRACK: bytearray(), AGENT_TRACK: bytearray()}
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is None:
+                    break
+                track, data = item
+                buffers[track].extend(data)
+                if len(buffers[track]) >= settings.RECORDING_FLUSH_BYTES:
+                    await asyncio.to_thread(self._append, track, bytes(buffers[track]))
+                    buffers[track].clear()
+            for track, buffer in buffers.items():
+                if buffer:
+                    await asyncio.to_thread(self._append, track, bytes(buffer))
+        except Exception as e:
+            # Surfaces again from finish(), which marks the recording failed
+            print(f"Recording Writer Error ({self.call_id}): {str(e)}")
+            raise
+        finally:
+            await asyncio.to_thread(self._close)
+
+    def _append(self, track: str, data: bytes):
+        f = self._files.get(track)
+        if f is None:
+            os.makedirs(self.storage_path, exist_ok=True)
+            f = self._files[track] = open(track_path(self.storage_path, track, self.media_types[track]), "ab")
+        f.write(data)
+        self.bytes_written[track] += len(data)
+
+    def _close(self):
+        files, self._files = self._files, {}
+        error = None
+        for f in files.values():
+            try:
+                f.flush()
+                os.fsync(f.fileno())
+            except OSError as e:
+                error = error or e
+            finally:
+                f.close()
+        if error:
+            raise error
+
+    async def finish(self) -> float:
+        """Drains the queue and closes the track files; returns the call duration"""
+        if self._writer and not self._writer.done():
+            try:
+                self._queue.put_nowait(None)
+            except asyncio.QueueFull:
+                # Wait for room, unless the writer dies first and nothing drains the queue
+                put = asyncio.ensure_future(self._queue.put(None))
+                await asyncio.wait({put, self._writer}, return_when=asyncio.FIRST_COMPLETED)
+                put.cancel()
+        if self._writer:
+            await self._writer
+        return time.monotonic() - self.started
+
+
+class RecordingService:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    async def start(self, user_id: int, agent_id: int) -> CallRecorder:
+        """Registers the recording under a fresh call_id and starts its writer"""
+        call_id = f"ws_{uuid.uuid4().hex}"
+        recorder = CallRecorder(call_id, user_id, agent_id, os.path.join(self.directory, str(user_id), call_id))
+        async with AsyncSessionLocal() as db:
+            db.add(CallRecording(
+                user_id=user_id,
+                agent_id=agent_id,
+                call_id=call_id,
+                storage_path=recorder.storage_path,
+                status="recording"
+            ))
+            await db.commit()
+        recorder.start()
+        return recorder
+
+    async def finish(self, recorder: CallRecorder):
+        """
+        Finalizes the tracks, then indexes the recording and logs the call.
+        Runs after the socket closed, so it is off the call's hot path.
+        """
+        status = "complete"
+        try:
+            duration = await recorder.finish()
+        except Exception as e:
+            print(f"Recording Error ({recorder.call_id}): {str(e)}")
+            duration, status = time.monotonic() - recorder.started, "failed"
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(CallRecording)
+                .where(CallRecording.call_id == recorder.call_id)
+                .values(
+                    status=status,
+                    caller_media_type=recorder.media_types[CALLER_TRACK],
+                    caller_bytes=recorder.bytes_written[CALLER_TRACK],
+                    agent_bytes=recorder.bytes_written[AGENT_TRACK],
+                    dropped_chunks=recorder.dropped,
+                    duration=round(duration, 2),
+                    finished_at=datetime.utcnow()
+                )
+            )
+            # Commits both the recording row and the call log
+            await ingest_call_logs(db, recorder.user_id, [{
+                "call_id": recorder.call_id,
+                "caller_number": "web",
+                "duration": round(duration, 2),
+                "status": "completed",
+            }])
+
+    async def get_recording(self, db: AsyncSession, user_id: int, call_id: str) -> Optional[CallRecording]:
+        result = await db.execute(
+            select(CallRecording).where(
+                CallRecording.call_id == call_id,
+                CallRecording.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    def track_file(self, recording: CallRecording, track: str) -> Tuple[Optional[str], Optional[str]]:
+        """Path and media type of a track, or (None, None) if it was never written"""
+        if track == CALLER_TRACK:
+            media_type, size = recording.caller_media_type, recording.caller_bytes
+        elif track == AGENT_TRACK:
+            media_type, size = recording.agent_media_type, recording.agent_bytes
+        else:
+            return None, None
+        if not size:
+            return None, None
+        return track_path(recording.storage_path, track, media_type), media_type or "application/octet-stream"
+
+
+recording_service = RecordingService(settings.RECORDINGS_DIR)
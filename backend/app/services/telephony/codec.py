@@ -0,0 +1,95 @@
+"""
+Telephony audio codec helpers
+G.711 μ-law <-> 16-bit PCM, resampling, WAV packing and 20 ms framing.
+Pure Python (table driven), so it does not depend on the deprecated audioop module.
+"""
+import io
+import wave
+from array import array
+from typing import Iterator
+
+TELEPHONY_SAMPLE_RATE = 8000
+STT_SAMPLE_RATE = 16000
+FRAME_MS = 20
+ULAW_FRAME_BYTES = TELEPHONY_SAMPLE_RATE * FRAME_MS // 1000  # one byte per sample
+
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 32635
+
+
+def _decode_ulaw_byte(value: int) -> int:
+    value = ~value & 0xFF
+    sign = value & 0x80
+    exponent = (value >> 4) & 0x07
+    mantissa = value & 0x0F
+    sample = (((mantissa << 3) + _ULAW_BIAS) << exponent) - _ULAW_BIAS
+    return -sample if sign else sample
+
+
+def _encode_ulaw_sample(sample: int) -> int:
+    sign = 0x80 if sample < 0 else 0
+    magnitude = min(-sample if sign else sample, _ULAW_CLIP) + _ULAW_BIAS
+    exponent = max((magnitude >> 7).bit_length() - 1, 0)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return ~(sign | (exponent << 4) | mantissa) & 0xFF
+
+
+_ULAW_DECODE = [_decode_ulaw_byte(value) for value in range(256)]
+# Indexed by the sample's unsigned 16-bit representation
+_ULAW_ENCODE = bytes(_encode_ulaw_sample(value - 65536 if value > 32767 else value) for value in range(65536))
+
+
+def ulaw_to_pcm16(data: bytes) -> bytes:
+    """Decode μ-law bytes to little-endian 16-bit PCM"""
+    return array("h", [_ULAW_DECODE[value] for value in data]).tobytes()
+
+
+def pcm16_to_ulaw(pcm: bytes) -> bytes:
+    """Encode little-endian 16-bit PCM to μ-law bytes"""
+    return bytes(_ULAW_ENCODE[sample & 0xFFFF] for sample in array("h", pcm))
+
+
+def resample_linear(pcm: bytes, src_rate: int, dst_rate: int) -> bytes:
+    """Linear-interpolation resampler for mono 16-bit PCM (good enough for speech)"""
+    if src_rate == dst_rate or not pcm:
+        return pcm
+    samples = array("h", pcm)
+    count = len(samples)
+    out_count = count * dst_rate // src_rate
+    step = src_rate / dst_rate
+    out = array("h", bytes(out_count * 2))
+    last = count - 1
+    for i in range(out_count):
+        position = i * step
+        index = int(position)
+        if index >= last:
+            out[i] = samples[last]
+            continue
+        fraction = position - index
+        out[i] = int(samples[index] + (samples[index + 1] - samples[index]) * fraction)
+    return out.tobytes()
+
+
+def rms(pcm: bytes) -> float:
+    """Root-mean-square level of 16-bit PCM"""
+    samples = array("h", pcm)
+    if not samples:
+        return 0.0
+    return (sum(sample * sample for sample in samples) / len(samples)) ** 0.5
+
+
+def pcm16_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap mono 16-bit PCM in an in-memory WAV container"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def frames(data: bytes, frame_bytes: int = ULAW_FRAME_BYTES) -> Iterator[bytes]:
+    """Split a byte stream into fixed-size frames (the last one may be short)"""
+    for start in range(0, len(data), frame_bytes):
+        yield data[start:start + frame_bytes]
@@ -0,0 +1,60 @@
+"""
+Telephony media helpers
+Energy-based endpointing that turns a continuous call stream into caller utterances.
+"""
+from typing import Optional
+
+from app.services.telephony.codec import FRAME_MS, rms
+
+
+class UtteranceSegmenter:
+    """
+    Buffers 16-bit PCM frames and emits an utterance once the caller has spoken
+    for at least min_speech_ms and then been silent for silence_ms.
+    Very long utterances are cut at max_utterance_ms so STT latency stays bounded.
+    """
+    def __init__(self,
+                 threshold_rms: float = 500.0,
+                 silence_ms: int = 700,
+                 min_speech_ms: int = 250,
+                 max_utterance_ms: int = 15000,
+                 frame_ms: int = FRAME_MS):
+        self.threshold_rms = threshold_rms
+        self.silence_frames = silence_ms // frame_ms
+        self.min_speech_frames = min_speech_ms // frame_ms
+        self.max_frames = max_utterance_ms // frame_ms
+        self._frames: list = []
+        self._speech_frames = 0
+        self._trailing_silence = 0
+
+    @property
+    def in_speech(self) -> bool:
+        return self._speech_frames > 0
+
+    def feed(self, pcm_frame: bytes) -> Optional[bytes]:
+        """Add one frame; returns a complete utterance when the caller stops talking"""
+        voiced = rms(pcm_frame) >= self.threshold_rms
+
+        if not self._speech_frames and not voiced:
+            # Keep a little leading audio so the first syllable is not clipped
+            self._frames = (self._frames + [pcm_frame])[-self.silence_frames:]
+            return None
+
+        self._frames.append(pcm_frame)
+        if voiced:
+            self._speech_frames += 1
+            self._trailing_silence = 0
+        else:
+            self._trailing_silence += 1
+
+        ended = self._trailing_silence >= self.silence_frames
+        if ended or len(self._frames) >= self.max_frames:
+            utterance = b"".join(self._frames) if self._speech_frames >= self.min_speech_frames else None
+            self.reset()
+            return utterance
+        return None
+
+    def reset(self):
+        self._frames = []
+        self._speech_frames = 0
+        self._trailing_silence = 0
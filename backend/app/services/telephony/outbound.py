@@ -0,0 +1,74 @@
+"""
+Outbound telephony backends
+A backend places one call and returns its outcome once the call has ended.
+A provider backend would originate the call with the agent's signed media-stream URL
+(/api/v1/ws/telephony/{agent_id}?token=..., see create_media_stream_token) and wait for the provider's final status;
+the simulated backend stands in for one during local runs and load tests.
+"""
+import asyncio
+import random
+from typing import NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class DialResult(NamedTuple):
+    status: str  # completed / no-answer / busy / failed (same vocabulary as CallLog.status)
+    duration: float  # Seconds of conversation
+
+
+class SimulatedTelephony:
+    """
+    Answers, rings out or returns busy at fixed rates and "talks" for an
+    exponentially distributed time, compressed by time_scale so a campaign
+    of real-length calls can be exercised in seconds.
+    """
+    def __init__(self,
+                 answer_rate: float = 0.7,
+                 busy_rate: float = 0.1,
+                 mean_duration: float = 45.0,
+                 ring_seconds: float = 20.0,
+                 time_scale: float = 0.05,
+                 seed: Optional[int] = None):
+        self.answer_rate = answer_rate
+        self.busy_rate = busy_rate
+        self.mean_duration = mean_duration
+        self.ring_seconds = ring_seconds
+        self.time_scale = time_scale
+        self._random = random.Random(seed)
+
+    async def dial(self, from_number: str, to_number: str, agent_id: int, call_id: str) -> DialResult:
+        roll = self._random.random()
+        if roll < self.busy_rate:
+            await asyncio.sleep(1.0 * self.time_scale)
+            return DialResult("busy", 0.0)
+        if roll >= self.busy_rate + self.answer_rate:
+            await asyncio.sleep(self.ring_seconds * self.time_scale)
+            return DialResult("no-answer", 0.0)
+
+        duration = self._random.expovariate(1 / self.mean_duration)
+        await asyncio.sleep(duration * self.time_scale)
+        return DialResult("completed", round(duration, 2))
+
+
+BACKENDS = {
+    "simulated": lambda: SimulatedTelephony(time_scale=settings.DIALER_SIM_TIME_SCALE),
+}
+# Backends that place no real calls; only used with DIALER_SIMULATED_OK
+SIMULATED_BACKENDS = {"simulated"}
+
+
+def backend_problem() -> Optional[str]:
+    """Why the configured backend cannot place calls, or None when it can"""
+    if settings.DIALER_BACKEND not in BACKENDS:
+        return f"Unknown DIALER_BACKEND: {settings.DIALER_BACKEND}"
+    if settings.DIALER_BACKEND in SIMULATED_BACKENDS and not settings.DIALER_SIMULATED_OK:
+        return "No telephony backend is configured (the simulated one needs DIALER_SIMULATED_OK)"
+    return None
+
+
+def get_backend():
+    problem = backend_problem()
+    if problem:
+        raise ValueError(problem)
+    return BACKENDS[settings.DIALER_BACKEND]()
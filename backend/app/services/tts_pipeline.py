@@ -0,0 +1,132 @@
+"""
+TTS Pipeline
+Splits long texts at prosody-safe boundaries and synthesizes the chunks
+concurrently, re-assembling the audio in order as it streams out.
+"""
+import asyncio
+import re
+from typing import AsyncGenerator, AsyncIterable, Callable, Iterable, List, Optional, Union
+
+# Boundaries where a pause already exists in natural speech
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;:…])\s+")
+CLAUSE_BOUNDARY = re.compile(r"(?<=[,—–])\s+")
+
+_DONE = object()
+
+
+def _pack(parts: Iterable[str], limit: int) -> List[str]:
+    """Greedily joins parts with spaces into pieces of at most `limit` characters."""
+    packed, current = [], ""
+    for part in parts:
+        if current and len(current) + 1 + len(part) > limit:
+            packed.append(current)
+            current = ""
+        current = f"{current} {part}" if current else part
+    if current:
+        packed.append(current)
+    return packed
+
+
+def _sentences(text: str, max_chars: int) -> List[str]:
+    """Sentences, with any sentence longer than max_chars broken at clauses, then words."""
+    pieces = []
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in _pack(CLAUSE_BOUNDARY.split(sentence), max_chars):
+            if len(clause) <= max_chars:
+                pieces.append(clause)
+            else:
+                pieces.extend(_pack(clause.split(), max_chars))
+    return pieces
+
+
+def split_for_tts(text: str, max_chars: int, first_max_chars: Optional[int] = None) -> List[str]:
+    """
+    Splits text into chunks of whole sentences of at most max_chars.
+    The first chunk can be kept shorter so the first audio arrives sooner.
+    """
+    sentences = _sentences(text, max_chars)
+    if not sentences:
+        return []
+    if not first_max_chars:
+        return _pack(sentences, max_chars)
+
+    count, length = 1, len(sentences[0])
+    while count < len(sentences) and length + 1 + len(sentences[count]) <= first_max_chars:
+        length += 1 + len(sentences[count])
+        count += 1
+    return [" ".join(sentences[:count])] + _pack(sentences[count:], max_chars)
+
+
+async def sentences_from_stream(text_chunks: AsyncIterable[str]) -> AsyncGenerator[str, None]:
+    """Re-chunks a streaming text response into complete sentences."""
+    buffer = ""
+    async for text in text_chunks:
+        buffer += text
+        *sentences, buffer = SENTENCE_BOUNDARY.split(buffer)
+        for sentence in sentences:
+            if sentence.strip():
+                yield sentence
+    if buffer.strip():
+        yield buffer
+
+
+async def _aiter(chunks: Union[Iterable[str], AsyncIterable[str]]) -> AsyncGenerator[str, None]:
+    if hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+async def synthesize_ordered(chunks: Union[Iterable[str], AsyncIterable[str]],
+                             synthesize: Callable[[str], AsyncIterable[bytes]],
+                             max_parallel: int) -> AsyncGenerator[bytes, None]:
+    """
+    Synthesizes up to max_parallel chunks at once and yields their audio in chunk order.
+    The chunk being played streams straight through; later chunks buffer until their turn.
+    """
+    order: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(max(1, max_parallel))
+    tasks: List[asyncio.Task] = []
+
+    async def render(text: str, out: asyncio.Queue):
+        try:
+            async for audio in synthesize(text):
+                await out.put(audio)
+        except Exception as e:
+            await out.put(e)
+        finally:
+            slots.release()
+            await out.put(_DONE)
+
+    async def schedule():
+        try:
+            async for text in _aiter(chunks):
+                await slots.acquire()
+                out: asyncio.Queue = asyncio.Queue()
+                tasks.append(asyncio.create_task(render(text, out)))
+                await order.put(out)
+        except Exception as e:
+            await order.put(e)
+        finally:
+            await order.put(_DONE)
+
+    scheduler = asyncio.create_task(schedule())
+    try:
+        while (out := await order.get()) is not _DONE:
+            if isinstance(out, Exception):
+                raise out
+            while (item := await out.get()) is not _DONE:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+    finally:
+        scheduler.cancel()
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,165 @@
+"""
+Usage Meter
+Per-tenant, per-agent metering of LLM tokens, STT audio seconds and TTS characters.
+Voice turns only add to an in-memory aggregate; a background loop flushes it as
+multi-row upserts into usage_daily in one transaction, so metering adds no database
+writes to a turn.
+Usage recorded since the last flush is lost if the worker is killed, at most
+USAGE_FLUSH_SECONDS worth.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.usage import UsageDaily
+from app.schemas.usage import UsageItem, UsageTotals
+
+METERED_FIELDS = ("llm_tokens", "stt_seconds", "tts_characters")
+
+# (user_id, agent_id) a call's usage is billed to
+MeterKey = Tuple[int, int]
+
+
+def estimate_cost(llm_tokens: int, stt_seconds: float, tts_characters: int) -> float:
+    return round(
+        llm_tokens / 1000 * settings.USAGE_LLM_COST_PER_1K_TOKENS
+        + stt_seconds / 60 * settings.USAGE_STT_COST_PER_MINUTE
+        + tts_characters / 1000 * settings.USAGE_TTS_COST_PER_1K_CHARACTERS,
+        6
+    )
+
+
+class UsageMeter:
+    def __init__(self):
+        # (user_id, agent_id, day) -> [llm_tokens, stt_seconds, tts_characters]
+        self._pending: Dict[Tuple[int, int, datetime], List[float]] = {}
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.flush_errors = 0
+
+    def record(self, meter: Optional[MeterKey], llm_tokens: int = 0, stt_seconds: float = 0.0, tts_characters: int = 0):
+        """Adds usage to the in-memory aggregate; safe to call on the hot path"""
+        if not meter or not (llm_tokens or stt_seconds or tts_characters):
+            return
+        user_id, agent_id = meter
+        day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        totals = self._pending.setdefault((user_id, agent_id or 0, day), [0, 0.0, 0])
+        totals[0] += llm_tokens
+        totals[1] += stt_seconds
+        totals[2] += tts_characters
+
+    def _merge_back(self, pending: Dict[Tuple[int, int, datetime], List[float]]):
+        for key, values in pending.items():
+            totals = self._pending.setdefault(key, [0, 0.0, 0])
+            for i, value in enumerate(values):
+                totals[i] += value
+
+    async def flush(self):
+        """Writes everything aggregated so far in one transaction; kept for the next flush on failure"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id, "agent_id": agent_id, "day": day,
+                "llm_tokens": int(values[0]), "stt_seconds": values[1], "tts_characters": int(values[2]),
+                "updated_at": now,
+            }
+            for (user_id, agent_id, day), values in pending.items()
+        ]
+        try:
+            async with AsyncSessionLocal() as db:
+                # Chunked to stay under the bind-parameter limit after a long outage
+                for start in range(0, len(rows), settings.USAGE_FLUSH_CHUNK_SIZE):
+                    stmt = pg_insert(UsageDaily).values(rows[start:start + settings.USAGE_FLUSH_CHUNK_SIZE])
+                    await db.execute(stmt.on_conflict_do_update(
+                        index_elements=[UsageDaily.user_id, UsageDaily.day, UsageDaily.agent_id],
+                        set_={
+                            **{field: getattr(UsageDaily, field) + getattr(stmt.excluded, field) for field in METERED_FIELDS},
+                            "updated_at": stmt.excluded.updated_at,
+                        }
+                    ))
+                await db.commit()
+        except Exception:
+            self.flush_errors += 1
+            self._merge_back(pending)
+            raise
+        self.flushes += 1
+        self.rows_flushed += len(rows)
+
+    async def run(self):
+        """Periodic flush loop, started from the application lifespan"""
+        try:
+            while True:
+                await asyncio.sleep(settings.USAGE_FLUSH_SECONDS)
+                try:
+                    await self.flush()
+                except Exception as e:
+                    print(f"Usage Flush Error: {str(e)}")
+        except asyncio.CancelledError:
+            # Last flush on shutdown
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Usage Flush Error: {str(e)}")
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending_rows": len(self._pending),
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "flush_errors": self.flush_errors,
+        }
+
+
+async def get_usage(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    agent_id: Optional[int] = None
+) -> Tuple[UsageTotals, List[UsageItem]]:
+    """Daily usage per agent for one tenant, read from the flushed aggregates"""
+    query = (
+        select(UsageDaily.day, UsageDaily.agent_id, *[getattr(UsageDaily, field) for field in METERED_FIELDS])
+        .where(
+            UsageDaily.user_id == user_id,
+            UsageDaily.day >= start.replace(hour=0, minute=0, second=0, microsecond=0),
+            UsageDaily.day < end
+        )
+        .order_by(UsageDaily.day, UsageDaily.agent_id)
+    )
+    if agent_id is not None:
+        query = query.where(UsageDaily.agent_id == agent_id)
+
+    items = [
+        UsageItem(
+            day=row.day,
+            agent_id=row.agent_id or None,
+            llm_tokens=row.llm_tokens,
+            stt_seconds=round(row.stt_seconds, 2),
+            tts_characters=row.tts_characters,
+            estimated_cost_usd=estimate_cost(row.llm_tokens, row.stt_seconds, row.tts_characters)
+        )
+        for row in await db.execute(query)
+    ]
+    llm_tokens = sum(item.llm_tokens for item in items)
+    stt_seconds = round(sum(item.stt_seconds for item in items), 2)
+    tts_characters = sum(item.tts_characters for item in items)
+    totals = UsageTotals(
+        llm_tokens=llm_tokens,
+        stt_seconds=stt_seconds,
+        tts_characters=tts_characters,
+        estimated_cost_usd=estimate_cost(llm_tokens, stt_seconds, tts_characters)
+    )
+    return totals, items
+
+
+usage_meter = UsageMeter()
@@ -0,0 +1,76 @@
+"""
+Resumable back-fill of the call analytics rollups from call_logs.
+
+Recomputes call_stats_hourly one hour at a time, committing a checkpoint after
+each hour. A day's call_stats_daily rows are rebuilt in the same transaction
+that moves the checkpoint past its last hour, and the final partial day is
+rebuilt at the end. Safe to interrupt and re-run; it resumes from the last
+committed hour without skipping any day.
+
+    python backfill_rollups.py --start 2024-01-01
+    python backfill_rollups.py --start 2024-01-01 --reset
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import select, func
+
+from app.core.database import AsyncSessionLocal
+from app.core.timestamps import to_naive_utc
+from app.models.call_log import CallLog
+from app.services.analytics_service import (
+    truncate, backfill_hour, rebuild_day, get_backfill_position, set_backfill_position
+)
+
+
+async def backfill(start: datetime, end: datetime, reset: bool):
+    async with AsyncSessionLocal() as db:
+        position = None if reset else await get_backfill_position(db)
+        if position is None and start is None:
+            oldest = await db.execute(select(func.min(CallLog.timestamp)))
+            start = oldest.scalar()
+            if start is None:
+                print("No call logs to back-fill.")
+                return
+
+        hour = truncate(position or start, "hour")
+        end = truncate(end, "hour")
+        print(f"Back-filling hourly rollups from {hour} to {end}")
+
+        days = 0
+        while hour < end:
+            await backfill_hour(db, hour)
+            hour += timedelta(hours=1)
+            if hour.hour == 0:
+                await rebuild_day(db, hour - timedelta(days=1))
+                days += 1
+                print(f"  done through {hour}")
+            await set_backfill_position(db, hour)
+            await db.commit()
+
+        if hour.hour != 0:
+            # The last day is partial; also covers a run interrupted after its final hour
+            await rebuild_day(db, truncate(hour, "day"))
+            await db.commit()
+            days += 1
+        print(f"Rebuilt {days} daily rollup(s).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=datetime.fromisoformat, help="First hour to back-fill (default: oldest call)")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Stop before this hour (default: current hour)")
+    parser.add_argument("--reset", action="store_true", help="Ignore the saved checkpoint")
+    args = parser.parse_args()
+
+    asyncio.run(backfill(to_naive_utc(args.start), to_naive_utc(args.end) or datetime.utcnow(), args.reset))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+REST API benchmark suite
+
+Drives the main endpoints of a running instance against data seeded by
+benchmarks/seed_data.py, one scenario at a time at a fixed concurrency, and
+reports throughput, error counts and latency percentiles per scenario.
+Requests are spread over the manifest's heavy, median and light tenants.
+
+    python benchmarks/seed_data.py --users 2000 --calls 2000000 --orders 500000
+    python benchmarks/bench_api.py --url http://localhost:8000 --concurrency 32 --requests 2000
+    python benchmarks/bench_api.py --scenario dashboard --scenario call_logs_list --output before.json
+
+Scenarios: login, dashboard, call_logs_list, call_logs_paging, call_log_detail,
+orders_list, order_detail, analytics, ingest. Results are printed as JSON
+(and written to --output), so runs can be diffed before and after a change.
+Only 2xx responses count as successes.
+
+Writing scenarios (ingest) run against a throwaway tenant that is signed up for
+the scenario and deleted afterwards, so the seeded tenants stay the same from
+run to run. Deleting it needs the database settings the seed script uses.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+# Run from the backend directory so `app` is importable
+sys.path.append(os.getcwd())
+
+from seed_data import SEED_DOMAIN
+
+API = "/api/v1"
+INGEST_BATCH = 100
+# Scenarios that add data; each gets its own throwaway tenant
+WRITE_SCENARIOS = {"ingest"}
+
+
+def percentiles(samples_ms):
+    if not samples_ms:
+        return {"p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples_ms)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "p50": round(statistics.median(ordered), 2),
+        "p90": round(pick(0.90), 2),
+        "p95": round(pick(0.95), 2),
+        "p99": round(pick(0.99), 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+class Tenant:
+    def __init__(self, entry: Dict[str, Any]):
+        self.tier = entry["tier"]
+        self.email = entry["email"]
+        self.call_ids = entry["call_ids"]
+        self.order_ids = entry["order_ids"]
+        self.headers: Dict[str, str] = {}
+        self.next_cursor: str = ""
+
+
+# Each scenario builds one request for a tenant: (method, path, kwargs)
+def scenario_login(tenant: Tenant, password: str, rng: random.Random):
+    return "POST", f"{API}/auth/login", {"json": {"email": tenant.email, "password": password}, "auth": False}
+
+
+def scenario_dashboard(tenant: Tenant, password: str, rng: random.Random):
+    return "GET", f"{API}/dashboard/stats", {}
+
+
+def scenario_call_logs_list(tenant: Tenant, password: str, rng: random.Random):
+    return "GET", f"{API}/call-logs", {"params": {"limit": 50}}
+
+
+def scenario_call_logs_paging(tenant: Tenant, password: str, rng: random.Random):
+    # Follows each tenant's keyset cursor deeper on every request; starts over after the last page
+    params = {"limit": 50}
+    if tenant.next_cursor:
+        params["cursor"] = tenant.next_cursor
+    return "GET", f"{API}/call-logs", {"params": params, "remember_cursor": True}
+
+
+def scenario_call_log_detail(tenant: Tenant, password: str, rng: random.Random):
+    return "GET", f"{API}/call-logs/{rng.choice(tenant.call_ids)}", {}
+
+
+def scenario_orders_list(tenant: Tenant, password: str, rng: random.Random):
+    return "GET", f"{API}/orders", {"params": {"limit": 50}}
+
+
+def scenario_order_detail(tenant: Tenant, password: str, rng: random.Random):
+    return "GET", f"{API}/orders/{rng.choice(tenant.order_ids)}", {}
+
+
+def scenario_analytics(tenant: Tenant, password: str, rng: random.Random):
+    return "GET", f"{API}/analytics/calls", {"params": {"granularity": "day"}}
+
+
+def scenario_ingest(tenant: Tenant, password: str, rng: random.Random):
+    events = [
+        {
+            "call_id": f"bench_{uuid.uuid4().hex}",
+            "caller_number": f"+9198{rng.randrange(10 ** 7, 10 ** 8)}",
+            "duration": round(rng.uniform(5, 600), 1),
+            "status": "completed",
+        }
+        for _ in range(INGEST_BATCH)
+    ]
+    return "POST", f"{API}/call-logs/bulk", {"json": events}
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": scenario_login,
+    "dashboard": scenario_dashboard,
+    "call_logs_list": scenario_call_logs_list,
+    "call_logs_paging": scenario_call_logs_paging,
+    "call_log_detail": scenario_call_log_detail,
+    "orders_list": scenario_orders_list,
+    "order_detail": scenario_order_detail,
+    "analytics": scenario_analytics,
+    "ingest": scenario_ingest,
+}
+
+
+async def authenticate(client, tenants: List[Tenant], password: str):
+    for tenant in tenants:
+        response = await client.post(f"{API}/auth/login", json={"email": tenant.email, "password": password})
+        response.raise_for_status()
+        tenant.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def create_scratch_tenant(client, password: str) -> Tenant:
+    email = f"bench-scratch-{uuid.uuid4().hex[:12]}@{SEED_DOMAIN}"
+    response = await client.post(f"{API}/auth/signup", json={"email": email, "password": password})
+    response.raise_for_status()
+    tenant = Tenant({"tier": "scratch", "email": email, "call_ids": [], "order_ids": []})
+    await authenticate(client, [tenant], password)
+    return tenant
+
+
+async def drop_scratch_tenant(tenant: Tenant):
+    # Its calls, counters and rollups go with it (ON DELETE CASCADE); seed_data.py --reset also catches leftovers
+    import asyncpg
+    from app.core.database import direct_dsn
+
+    conn = await asyncpg.connect(direct_dsn())
+    try:
+        await conn.execute("DELETE FROM users WHERE email = $1", tenant.email)
+    finally:
+        await conn.close()
+
+
+async def run_scenario(client, name: str, tenants: List[Tenant], password: str,
+                       concurrency: int, requests: int, warmup: int, seed: int) -> Dict[str, Any]:
+    build = SCENARIOS[name]
+    rng = random.Random(seed)
+    usable = [t for t in tenants if (name != "call_log_detail" or t.call_ids) and (name != "order_detail" or t.order_ids)]
+    if not usable:
+        return {"scenario": name, "skipped": "no tenant in the manifest has data for it"}
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    queries: List[float] = []
+    remaining = 0
+
+    async def worker(measured: bool):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            tenant = rng.choice(usable)
+            method, path, options = build(tenant, password, rng)
+            headers = tenant.headers if options.pop("auth", True) else {}
+            remember_cursor = options.pop("remember_cursor", False)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, headers=headers, **options)
+                status = response.status_code
+            except Exception as e:
+                response, status = None, type(e).__name__
+            elapsed = (time.perf_counter() - start) * 1000
+            if response is not None and remember_cursor:
+                tenant.next_cursor = response.headers.get("X-Next-Cursor", "")
+            if measured:
+                latencies.append(elapsed)
+                statuses[str(status)] += 1
+                timing = response.headers.get("Server-Timing", "") if response is not None else ""
+                if 'desc="' in timing:
+                    queries.append(float(timing.split('desc="')[1].split(" ")[0]))
+
+    remaining = warmup
+    await asyncio.gather(*(worker(False) for _ in range(concurrency)))
+    remaining = requests
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(True) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    # Redirects count as errors: no benchmarked endpoint should redirect
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": dict(statuses),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": percentiles(latencies),
+        "queries_per_request": round(statistics.mean(queries), 2) if queries else None,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default="storage/bench_manifest.json")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Repeat to pick several; default all")
+    parser.add_argument("--tier", action="append", choices=["heavy", "median", "light"], help="Restrict to tenant tiers")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per scenario")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    import httpx
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    tenants = [Tenant(entry) for entry in manifest["tenants"] if not args.tier or entry["tier"] in args.tier]
+    password = manifest["password"]
+    scenarios = args.scenario or list(SCENARIOS)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        await authenticate(client, tenants, password)
+        results = []
+        for name in scenarios:
+            if name not in WRITE_SCENARIOS:
+                results.append(await run_scenario(
+                    client, name, tenants, password, args.concurrency, args.requests, args.warmup, args.seed
+                ))
+                continue
+            scratch = await create_scratch_tenant(client, password)
+            try:
+                results.append(await run_scenario(
+                    client, name, [scratch], password, args.concurrency, args.requests, args.warmup, args.seed
+                ))
+            finally:
+                await drop_scratch_tenant(scratch)
+
+    report = {
+        "url": args.url,
+        "started_at": datetime.utcnow().isoformat(),
+        "seed_run": manifest["run"],
+        "tenants": Counter(t.tier for t in tenants),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+"""
+Login throughput and event-loop lag benchmark
+
+Local mode compares verifying bcrypt hashes inline on the event loop (the old
+behaviour) against the bounded hashing executor, while a probe coroutine
+measures how late the loop wakes it up:
+
+    python benchmarks/bench_login.py --concurrency 32 --logins 200
+
+Server mode drives POST /auth/login on a running instance and samples
+/health latency at the same time as a proxy for the worker's loop lag:
+
+    python benchmarks/bench_login.py --url http://localhost:8000 \
+        --email demo@example.com --password secret
+
+Results are printed as JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+# Run from the backend directory so `app` is importable
+sys.path.append(os.getcwd())
+
+
+def percentiles(samples_ms):
+    if not samples_ms:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples_ms)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "p50": round(statistics.median(ordered), 2),
+        "p95": round(pick(0.95), 2),
+        "p99": round(pick(0.99), 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+async def probe_loop_lag(stop: asyncio.Event, interval: float = 0.005):
+    """Records how much later than requested the loop resumes a sleeping coroutine"""
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+    return lags
+
+
+async def run_local(mode: str, concurrency: int, logins: int):
+    from app.core.security import get_password_hash, verify_password, verify_password_async
+
+    hashed = get_password_hash("benchmark-password")
+    slots = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with slots:
+            if mode == "inline":
+                verify_password("benchmark-password", hashed)
+            else:
+                await verify_password_async("benchmark-password", hashed)
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lags = await probe
+
+    return {
+        "mode": mode,
+        "logins": logins,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(logins / elapsed, 2),
+        "loop_lag_ms": percentiles(lags),
+    }
+
+
+async def run_server(url: str, email: str, password: str, concurrency: int, logins: int):
+    import httpx
+
+    slots = asyncio.Semaphore(concurrency)
+    latencies, health_latencies, failures = [], [], 0
+    stop = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+        async def login():
+            nonlocal failures
+            async with slots:
+                start = time.perf_counter()
+                response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    failures += 1
+
+        async def probe_health():
+            while not stop.is_set():
+                start = time.perf_counter()
+                await client.get("/health")
+                health_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe = asyncio.create_task(probe_health())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    return {
+        "mode": "server",
+        "url": url,
+        "logins": logins,
+        "failures": failures,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(logins / elapsed, 2),
+        "login_latency_ms": percentiles(latencies),
+        "health_latency_ms": percentiles(health_latencies),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--url", help="Benchmark a running server instead of the local hashing paths")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    if args.url:
+        results = [await run_server(args.url, args.email, args.password, args.concurrency, args.logins)]
+    else:
+        results = [
+            await run_local("inline", args.concurrency, args.logins),
+            await run_local("executor", args.concurrency, args.logins),
+        ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
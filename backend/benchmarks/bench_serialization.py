@@ -0,0 +1,87 @@
+"""
+List-endpoint serialization benchmark
+
+Compares, for a page of call logs, the old path (ORM entities validated through
+the response_model with from_attributes, then encoded by the standard JSON
+encoder, as FastAPI does) against the column-projected path (plain row tuples
+encoded with orjson). Rows are synthetic, so only serialization CPU is measured:
+
+    python benchmarks/bench_serialization.py --rows 1000 --iterations 200
+
+Results are printed as JSON.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# Run from the backend directory so `app` is importable
+sys.path.append(os.getcwd())
+
+
+def make_rows(count: int):
+    now = datetime.utcnow()
+    return [
+        (i, 1, i % 7 or None, f"call-{i:08d}", f"+9198{i:08d}", float(i % 600), "completed",
+         now - timedelta(seconds=i), now - timedelta(seconds=i))
+        for i in range(1, count + 1)
+    ]
+
+
+def timed(fn, iterations: int):
+    samples = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        size = len(fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    from pydantic import TypeAdapter
+    from app.core.serialization import schema_fields, encode_rows
+    from app.models.call_log import CallLog
+    from app.schemas.call_log import CallLogResponse
+
+    fields = schema_fields(CallLogResponse)
+    rows = make_rows(args.rows)
+    entities = [CallLog(**dict(zip(fields, row))) for row in rows]
+    adapter = TypeAdapter(List[CallLogResponse])
+
+    def response_model_path() -> bytes:
+        validated = adapter.validate_python(entities, from_attributes=True)
+        return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+    def projected_path() -> bytes:
+        return encode_rows(fields, rows)
+
+    assert json.loads(response_model_path()) == json.loads(projected_path()), "paths disagree"
+
+    baseline = timed(response_model_path, args.iterations)
+    fast = timed(projected_path, args.iterations)
+    print(json.dumps({
+        "rows": args.rows,
+        "iterations": args.iterations,
+        "response_model": baseline,
+        "projected_orjson": fast,
+        "speedup": round(baseline["p50_ms"] / fast["p50_ms"], 2) if fast["p50_ms"] else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
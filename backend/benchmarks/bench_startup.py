@@ -0,0 +1,123 @@
+"""
+Worker cold-start benchmark
+
+Measures, in fresh interpreter processes:
+  * import time of the application (`import main`) and which provider SDKs it loaded
+  * time from spawning uvicorn until the first /health request succeeds
+  * resident memory of the worker after that first request
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --runs 5 --warm-up   # with WARM_UP_PROVIDERS=true
+
+Results are printed as JSON.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+PROVIDER_MODULES = ("google.generativeai", "edge_tts", "openai")
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+rss_kb = 0
+with open("/proc/self/status") as status:
+    for line in status:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "rss_mb": rss_kb / 1024,
+    "providers_loaded": [m for m in {PROVIDER_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return 0.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_first_request(env, timeout: float) -> dict:
+    port = free_port()
+    start = time.perf_counter()
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return {
+                            "first_request_ms": (time.perf_counter() - start) * 1000,
+                            "worker_rss_mb": rss_mb(worker.pid),
+                        }
+            except OSError:
+                time.sleep(0.02)
+        raise SystemExit(f"Worker did not answer /health within {timeout}s")
+    finally:
+        worker.terminate()
+        worker.wait()
+
+
+def summarize(samples, key):
+    values = [sample[key] for sample in samples]
+    return {"median": round(statistics.median(values), 1), "min": round(min(values), 1), "max": round(max(values), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warm-up", action="store_true", help="Start workers with WARM_UP_PROVIDERS=true")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    # Run from the backend directory so `main` is importable
+    env = dict(os.environ, PYTHONPATH=os.getcwd(), WARM_UP_PROVIDERS="true" if args.warm_up else "false")
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    requests = [measure_first_request(env, args.timeout) for _ in range(args.runs)]
+
+    print(json.dumps({
+        "runs": args.runs,
+        "warm_up": args.warm_up,
+        "providers_loaded_on_import": imports[-1]["providers_loaded"],
+        "import_ms": summarize(imports, "import_ms"),
+        "import_rss_mb": summarize(imports, "rss_mb"),
+        "first_request_ms": summarize(requests, "first_request_ms"),
+        "worker_rss_mb": summarize(requests, "worker_rss_mb"),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
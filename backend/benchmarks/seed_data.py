@@ -0,0 +1,259 @@
+"""
+Synthetic multi-tenant data generator
+
+Seeds a local database with benchmark tenants and realistic, skewed volumes:
+a few tenants own most of the calls and orders (Pareto-distributed), call
+timestamps cluster in recent days and business hours, durations are lognormal.
+Rows are written with COPY in batches, so millions of rows take minutes, not hours.
+
+    python benchmarks/seed_data.py --users 2000 --calls 2000000 --orders 500000
+    python benchmarks/seed_data.py --reset   # remove all benchmark tenants first
+
+Every benchmark tenant has an email under SEED_DOMAIN and the password given by
+--password. A manifest of sample tenants (heavy, median, light) with some of
+their call ids and order ids is written for benchmarks/bench_api.py.
+Run python backfill_rollups.py afterwards to fill the analytics rollups.
+
+Results are printed as JSON.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+# Run from the backend directory so `app` is importable
+sys.path.append(os.getcwd())
+
+SEED_DOMAIN = "loadtest.pegasus-bench.com"
+COPY_BATCH_ROWS = 50_000
+CALL_STATUSES = (("completed", 0.78), ("missed", 0.09), ("failed", 0.05), ("busy", 0.04), ("no-answer", 0.04))
+MENU = ("Margherita pizza", "Paneer tikka", "Veg biryani", "Cold coffee", "Garlic bread", "Masala dosa", "Brownie")
+
+
+def tenant_weights(users: int, rng: random.Random) -> List[float]:
+    """Pareto weights: roughly 20% of tenants get 80% of the traffic"""
+    weights = [rng.paretovariate(1.16) for _ in range(users)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def allocate(total: int, weights: List[float]) -> List[int]:
+    """Splits total rows across tenants by weight, exactly"""
+    counts = [int(total * w) for w in weights]
+    remainder = total - sum(counts)
+    for i in sorted(range(len(weights)), key=lambda i: weights[i], reverse=True)[:remainder]:
+        counts[i] += 1
+    return counts
+
+
+def call_timestamp(now: datetime, days: int, rng: random.Random) -> datetime:
+    """Recent days are busier; calls cluster in business hours"""
+    day = min(int(rng.expovariate(3.0 / days)), days - 1)
+    hour = min(max(int(rng.gauss(14, 3.5)), 0), 23)
+    return (now - timedelta(days=day)).replace(
+        hour=hour, minute=rng.randrange(60), second=rng.randrange(60), microsecond=0
+    )
+
+
+def indian_number(rng: random.Random) -> str:
+    return f"+91{rng.choice('6789')}{rng.randrange(10 ** 8, 10 ** 9)}"
+
+
+async def copy_batches(conn, table: str, columns: List[str], rows) -> int:
+    written, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == COPY_BATCH_ROWS:
+            await conn.copy_records_to_table(table, records=batch, columns=columns)
+            written += len(batch)
+            batch = []
+    if batch:
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        written += len(batch)
+    return written
+
+
+async def reset(conn) -> int:
+    # Phone numbers, agents, calls and orders go with their tenant (ON DELETE CASCADE)
+    deleted = await conn.execute("DELETE FROM users WHERE email LIKE $1", f"%@{SEED_DOMAIN}")
+    return int(deleted.split()[-1])
+
+
+async def seed(args) -> Dict:
+    import asyncpg
+    from app.core.database import direct_dsn
+    from app.core.security import get_password_hash
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    run = f"{args.seed}_{int(time.time())}"
+    timings: Dict[str, float] = {}
+
+    conn = await asyncpg.connect(direct_dsn())
+    try:
+        if args.reset:
+            started = time.perf_counter()
+            timings["reset_deleted_users"] = await reset(conn)
+            timings["reset_seconds"] = round(time.perf_counter() - started, 2)
+
+        # 1. Tenants (one bcrypt hash shared by all of them)
+        started = time.perf_counter()
+        hashed = get_password_hash(args.password)
+        emails = [f"bench-{run}-{i}@{SEED_DOMAIN}" for i in range(args.users)]
+        await copy_batches(conn, "users", ["email", "hashed_password", "full_name", "is_active", "created_at", "updated_at"], (
+            (email, hashed, f"Bench Tenant {i}", True, now, now) for i, email in enumerate(emails)
+        ))
+        user_ids = [row["id"] for row in await conn.fetch(
+            "SELECT id FROM users WHERE email = ANY($1::text[]) ORDER BY id", emails
+        )]
+        weights = tenant_weights(len(user_ids), rng)
+
+        # 2. Phone numbers and agents, more for bigger tenants
+        phone_rows, agent_rows = [], []
+        for user_id, weight in zip(user_ids, weights):
+            size = 1 + min(int(weight * len(user_ids)), 4)
+            phone_rows += [(user_id, indian_number(rng), "Knowlarity", "active", now, now) for _ in range(size)]
+            agent_rows += [
+                (user_id, f"Agent {n}", "You take food orders politely.", "en", True, "{}", now, now)
+                for n in range(max(1, size // 2))
+            ]
+        await copy_batches(conn, "phone_numbers", ["user_id", "number", "provider", "status", "created_at", "updated_at"], phone_rows)
+        await copy_batches(conn, "ai_agents", [
+            "user_id", "agent_name", "system_prompt", "language", "is_active", "configuration", "created_at", "updated_at"
+        ], agent_rows)
+
+        phones: Dict[int, List[int]] = {}
+        for row in await conn.fetch("SELECT id, user_id FROM phone_numbers WHERE user_id = ANY($1::int[])", user_ids):
+            phones.setdefault(row["user_id"], []).append(row["id"])
+        agents: Dict[int, List[int]] = {}
+        for row in await conn.fetch("SELECT id, user_id FROM ai_agents WHERE user_id = ANY($1::int[])", user_ids):
+            agents.setdefault(row["user_id"], []).append(row["id"])
+        await copy_batches(conn, "agent_phone_mappings", ["agent_id", "phone_number_id", "created_at"], (
+            (agents[user_id][i % len(agents[user_id])], phone_id, now)
+            for user_id in user_ids
+            for i, phone_id in enumerate(phones[user_id])
+        ))
+        timings["tenants_seconds"] = round(time.perf_counter() - started, 2)
+
+        # 3. Call logs, skewed across tenants
+        started = time.perf_counter()
+        statuses = [status for status, _ in CALL_STATUSES]
+        status_weights = [weight for _, weight in CALL_STATUSES]
+        call_counts = allocate(args.calls, weights)
+        sample_calls: Dict[int, List[str]] = {}
+
+        def call_rows():
+            sequence = 0
+            for user_id, count in zip(user_ids, call_counts):
+                user_phones = phones[user_id]
+                for _ in range(count):
+                    sequence += 1
+                    call_id = f"seed_{run}_{sequence:09d}"
+                    if len(sample_calls.setdefault(user_id, [])) < 20:
+                        sample_calls[user_id].append(call_id)
+                    status = rng.choices(statuses, status_weights)[0]
+                    duration = round(min(rng.lognormvariate(4.2, 0.9), 3600.0), 1) if status == "completed" else 0.0
+                    timestamp = call_timestamp(now, args.days, rng)
+                    yield (user_id, rng.choice(user_phones), call_id, indian_number(rng), duration, status, timestamp, timestamp)
+
+        calls_written = await copy_batches(conn, "call_logs", [
+            "user_id", "phone_number_id", "call_id", "caller_number", "duration", "status", "timestamp", "created_at"
+        ], call_rows())
+        timings["calls_seconds"] = round(time.perf_counter() - started, 2)
+
+        # 4. Orders, mostly linked to one of the tenant's calls
+        started = time.perf_counter()
+        order_counts = allocate(args.orders, weights)
+
+        def order_rows():
+            for user_id, count in zip(user_ids, order_counts):
+                linkable = sample_calls.get(user_id, [])
+                for _ in range(count):
+                    created = call_timestamp(now, args.days, rng)
+                    items = [{"name": rng.choice(MENU), "quantity": rng.randint(1, 3)} for _ in range(rng.randint(1, 4))]
+                    yield (
+                        user_id,
+                        rng.choice(linkable) if linkable and rng.random() < 0.7 else None,
+                        f"Customer {rng.randrange(10 ** 6)}",
+                        indian_number(rng),
+                        json.dumps({"items": items}),
+                        f"{rng.randint(1, 999)} MG Road, Bengaluru",
+                        created,
+                        created,
+                    )
+
+        orders_written = await copy_batches(conn, "orders", [
+            "user_id", "call_id", "customer_name", "phone", "order_details", "address", "created_at", "updated_at"
+        ], order_rows())
+        timings["orders_seconds"] = round(time.perf_counter() - started, 2)
+
+        started = time.perf_counter()
+        for table in ("users", "phone_numbers", "ai_agents", "agent_phone_mappings", "call_logs", "orders"):
+            await conn.execute(f"ANALYZE {table}")
+        timings["analyze_seconds"] = round(time.perf_counter() - started, 2)
+
+        # 5. Manifest: heavy, median and light tenants, with ids the detail benchmarks can fetch
+        ranked = sorted(range(len(user_ids)), key=lambda i: call_counts[i], reverse=True)
+        picks = {"heavy": ranked[:5], "median": ranked[len(ranked) // 2:len(ranked) // 2 + 5], "light": ranked[-5:]}
+        tenants = []
+        for tier, indexes in picks.items():
+            for i in indexes:
+                user_id = user_ids[i]
+                order_ids = [row["id"] for row in await conn.fetch(
+                    "SELECT id FROM orders WHERE user_id = $1 ORDER BY id LIMIT 20", user_id
+                )]
+                tenants.append({
+                    "tier": tier,
+                    "user_id": user_id,
+                    "email": emails[i],
+                    "calls": call_counts[i],
+                    "orders": order_counts[i],
+                    "call_ids": sample_calls.get(user_id, []),
+                    "order_ids": order_ids,
+                })
+    finally:
+        await conn.close()
+
+    manifest = {"run": run, "password": args.password, "created_at": now.isoformat(), "tenants": tenants}
+    os.makedirs(os.path.dirname(args.manifest) or ".", exist_ok=True)
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    top_share = sum(sorted(call_counts, reverse=True)[:max(1, math.ceil(len(call_counts) * 0.2))]) / max(args.calls, 1)
+    return {
+        "run": run,
+        "users": len(user_ids),
+        "phone_numbers": len(phone_rows),
+        "ai_agents": len(agent_rows),
+        "call_logs": calls_written,
+        "orders": orders_written,
+        "top_20pct_tenants_call_share": round(top_share, 3),
+        "max_calls_per_tenant": max(call_counts, default=0),
+        "manifest": args.manifest,
+        "timings": timings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=2_000_000)
+    parser.add_argument("--orders", type=int, default=500_000)
+    parser.add_argument("--days", type=int, default=90, help="Spread calls over this many past days")
+    parser.add_argument("--password", default="benchmark-password")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed, for repeatable volumes and skew")
+    parser.add_argument("--manifest", default="storage/bench_manifest.json")
+    parser.add_argument("--reset", action="store_true", help="Delete existing benchmark tenants first")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(seed(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
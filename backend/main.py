@@ -2,25 +2,74 @@
 FastAPI Application Entry Point
 Multi-tenant AI Calling Platform Backend
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Header, HTTPException, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
+import asyncio
+import hmac
+from typing import Optional
 from contextlib import asynccontextmanager
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import get_pool_status
+from app.core.migrations import ensure_schema
+from app.core.profiling import ProfilingMiddleware, request_profiler
 from app.api.v1.router import api_router
+from app.core.dependencies import principal_cache
+from app.core.invalidation import invalidation_bus
+from app.services.audio_store import audio_store
+from app.services.counter_service import run_counter_reconciliation
+from app.services.call_routing import call_router
+from app.services.agent_config_cache import agent_config_cache
+from app.services.dialer import campaign_dialer
+from app.services.job_queue import job_queue
+from app.services import post_call  # noqa: F401  (registers the post-call job handlers)
+from app.services.order_extraction import order_extractor
+from app.services.usage_meter import usage_meter
+from app.services.ai_service import ai_service
+from app.services.agent.brain import agent_brain
+from app.services.agent.voice import voice_service
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create database tables on startup"""
+    """Check the schema version and start background jobs"""
     try:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        await ensure_schema()
     except Exception as e:
         print(f"Startup Error: {str(e)}")
+        # A failed migration must not leave workers serving a half-migrated schema
+        if settings.MIGRATE_ON_STARTUP:
+            raise
+
+    if settings.WARM_UP_PROVIDERS:
+        try:
+            for service in (ai_service, agent_brain, voice_service):
+                service.warm_up()
+        except Exception as e:
+            print(f"Warm-up Error: {str(e)}")
+
+    try:
+        await call_router.rebuild()
+    except Exception as e:
+        print(f"Routing Index Error: {str(e)}")
+
+    background_tasks = [
+        asyncio.create_task(audio_store.run_eviction()),
+        asyncio.create_task(run_counter_reconciliation()),
+        asyncio.create_task(call_router.run_refresh()),
+        asyncio.create_task(invalidation_bus.run()),
+        asyncio.create_task(campaign_dialer.run()),
+        asyncio.create_task(job_queue.run()),
+        asyncio.create_task(usage_meter.run()),
+    ]
     yield
+    for task in background_tasks:
+        task.cancel()
+    # Let the tasks finish their cancellation cleanup (e.g. the job queue releasing leases)
+    await asyncio.gather(*background_tasks, return_exceptions=True)
 
 app = FastAPI(
     title="AI Calling Platform API",
@@ -42,8 +91,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Range", "Accept-Ranges", "Server-Timing", "X-Profile-Id"],
 )
 
+# Added last so it wraps CORS too and times the whole request
+app.add_middleware(ProfilingMiddleware)
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """Fail fast with a clear error when no database connection frees up in time"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database connection pool exhausted, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -58,3 +120,24 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics(x_metrics_token: Optional[str] = Header(None)):
+    """In-process cache and runtime metrics for this worker; requires METRICS_TOKEN outside DEBUG"""
+    if not settings.METRICS_TOKEN:
+        if not settings.DEBUG:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    elif not hmac.compare_digest(x_metrics_token or "", settings.METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return {
+        "principal_cache": principal_cache.stats(),
+        "agent_config_cache": agent_config_cache.stats(),
+        "invalidation_bus": invalidation_bus.stats(),
+        "dialer": campaign_dialer.stats(),
+        "jobs": await job_queue.stats(),
+        "order_extraction": order_extractor.stats(),
+        "usage_meter": usage_meter.stats(),
+        "db_pool": get_pool_status(),
+        "call_routing": {"routes": len(call_router), "version": call_router.version},
+        "routes": request_profiler.stats(),
+    }
@@ -0,0 +1,48 @@
+"""
+Apply versioned schema migrations (app/migrations).
+
+    python migrate.py             # apply everything pending
+    python migrate.py --status    # list applied / pending migrations
+    python migrate.py --target 4  # stop after version 4
+
+Run it against a direct database connection rather than a transaction pooler:
+it holds a session-level advisory lock while migrating.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from app.core.database import engine
+from app.core.migrations import discover_migrations, applied_versions, migrate
+
+
+async def status():
+    async with engine.connect() as conn:
+        applied = await applied_versions(conn)
+    for migration in discover_migrations():
+        mark = "applied" if migration.version in applied else "pending"
+        print(f"{migration.version:>4}  {mark:<8} {migration.name}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="Show migration state and exit")
+    parser.add_argument("--target", type=int, help="Highest version to apply")
+    args = parser.parse_args()
+
+    try:
+        if args.status:
+            await status()
+            return
+        applied = await migrate(args.target)
+        print(f"✓ Applied {len(applied)} migration(s)." if applied else "Schema is up to date.")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""
+Local phone-call simulator for the telephony media-stream gateway.
+
+Plays WAV files into /ws/telephony/{agent_id} the way a telephony provider
+would (base64 μ-law 8 kHz, 20 ms media frames, start/mark/stop events),
+and records the agent's audio replies to a WAV file. The stream URL is signed
+locally with the backend's SECRET_KEY, as /calls/inbound would sign it.
+
+    python simulate_call.py --agent 1 --input hello.wav --input order.wav --output reply.wav
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import uuid
+import wave
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+import websockets
+
+from app.core.security import create_media_stream_token
+from app.services.telephony.codec import (
+    TELEPHONY_SAMPLE_RATE, FRAME_MS, ULAW_FRAME_BYTES,
+    pcm16_to_ulaw, ulaw_to_pcm16, resample_linear, frames
+)
+
+SILENCE_FRAME = pcm16_to_ulaw(bytes(ULAW_FRAME_BYTES * 2))
+
+
+def load_caller_audio(path: str) -> bytes:
+    """Read a 16-bit WAV (first channel if stereo) and convert it to μ-law 8 kHz"""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise SystemExit(f"{path}: only 16-bit PCM WAV files are supported")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        pcm = wav.readframes(wav.getnframes())
+    if channels > 1:
+        width = 2 * channels
+        pcm = b"".join(pcm[i:i + 2] for i in range(0, len(pcm), width))
+    return pcm16_to_ulaw(resample_linear(pcm, rate, TELEPHONY_SAMPLE_RATE))
+
+
+async def simulate(url: str, inputs: list, output: str, turn_timeout: float):
+    stream_sid = f"MZ{uuid.uuid4().hex}"
+    call_sid = f"CA{uuid.uuid4().hex}"
+    agent_audio = bytearray()
+
+    async with websockets.connect(url) as ws:
+        await ws.send(json.dumps({"event": "connected", "protocol": "Call", "version": "1.0.0"}))
+        await ws.send(json.dumps({
+            "event": "start",
+            "streamSid": stream_sid,
+            "start": {
+                "streamSid": stream_sid,
+                "callSid": call_sid,
+                "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": TELEPHONY_SAMPLE_RATE, "channels": 1},
+            },
+        }))
+
+        turn_done = asyncio.Event()
+
+        async def receive():
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get("event") == "media":
+                    agent_audio.extend(ulaw_to_pcm16(base64.b64decode(message["media"]["payload"])))
+                elif message.get("event") == "mark":
+                    # Playback is instantaneous here, so acknowledge the mark right away
+                    await ws.send(json.dumps({"event": "mark", "streamSid": stream_sid, "mark": message["mark"]}))
+                    turn_done.set()
+
+        async def send_frame(frame: bytes):
+            await ws.send(json.dumps({
+                "event": "media",
+                "streamSid": stream_sid,
+                "media": {"payload": base64.b64encode(frame).decode()},
+            }))
+            await asyncio.sleep(FRAME_MS / 1000)
+
+        receiver = asyncio.create_task(receive())
+        for path in inputs:
+            print(f"Caller: playing {path}")
+            turn_done.clear()
+            for frame in frames(load_caller_audio(path)):
+                await send_frame(frame)
+
+            # Keep the line open with silence, as a real call would, until the agent replies
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + turn_timeout
+            while not turn_done.is_set() and loop.time() < deadline:
+                await send_frame(SILENCE_FRAME)
+            print("Agent: replied" if turn_done.is_set() else "Agent: no reply before timeout")
+
+        await ws.send(json.dumps({"event": "stop", "streamSid": stream_sid, "stop": {"callSid": call_sid}}))
+        receiver.cancel()
+
+    with wave.open(output, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(TELEPHONY_SAMPLE_RATE)
+        wav.writeframes(bytes(agent_audio))
+    print(f"Wrote {len(agent_audio) / 2 / TELEPHONY_SAMPLE_RATE:.1f}s of agent audio to {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", type=int, required=True, help="AI agent id")
+    parser.add_argument("--input", action="append", required=True, help="Caller WAV file; repeat for more turns")
+    parser.add_argument("--output", default="agent_reply.wav")
+    parser.add_argument("--base-url", default="ws://localhost:8000/api/v1")
+    parser.add_argument("--turn-timeout", type=float, default=20.0)
+    args = parser.parse_args()
+
+    url = f"{args.base_url}/ws/telephony/{args.agent}?token={create_media_stream_token(args.agent)}"
+    asyncio.run(simulate(url, args.input, args.output, args.turn_timeout))
+
+
+if __name__ == "__main__":
+    main()
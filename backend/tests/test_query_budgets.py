@@ -0,0 +1,132 @@
+"""
+Query budgets for endpoints that used to run N+1 queries.
+Needs a Postgres database (DATABASE_URL); skipped when none is reachable.
+
+    pip install -r requirements-dev.txt
+    DATABASE_URL=postgresql+asyncpg://... python -m pytest tests
+"""
+import asyncio
+import contextvars
+import random
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from main import app
+from app.core.database import AsyncSessionLocal
+from app.core.profiling import query_budget
+
+API = "/api/v1"
+TEST_DOMAIN = "query-budgets.pegasus-bench.com"
+PASSWORD = "query-budget-password"
+PHONES = 10
+
+# Ownership checks, the mapping diff, the write, the routing reload and its NOTIFY
+LINK_BUDGET = 8
+# Collection ETag and the list itself
+LIST_BUDGET = 3
+
+
+async def _delete_user(user_id: int):
+    # Phones, agents and mappings go with the user (ON DELETE CASCADE)
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+        await db.commit()
+
+
+@pytest.fixture(scope="module")
+def client():
+    client = TestClient(app)
+    try:
+        client.__enter__()
+    except Exception as e:
+        pytest.skip(f"No database available: {e}")
+    try:
+        yield client
+    finally:
+        client.__exit__(None, None, None)
+
+
+@pytest.fixture(scope="module")
+def tenant(client):
+    email = f"tenant-{uuid.uuid4().hex[:12]}@{TEST_DOMAIN}"
+    signup = client.post(f"{API}/auth/signup", json={"email": email, "password": PASSWORD})
+    assert signup.status_code == 201, signup.text
+    user_id = signup.json()["id"]
+    try:
+        login = client.post(f"{API}/auth/login", json={"email": email, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        agent = client.post(
+            f"{API}/ai-agents", headers=headers,
+            json={"agent_name": "Budget Agent", "system_prompt": "You take orders."}
+        )
+        assert agent.status_code == 201, agent.text
+        phone_ids = []
+        for _ in range(PHONES):
+            phone = client.post(
+                f"{API}/phone-numbers", headers=headers,
+                json={"number": f"+9198{random.randrange(10 ** 7, 10 ** 8)}"}
+            )
+            assert phone.status_code == 201, phone.text
+            phone_ids.append(phone.json()["id"])
+        # Loads the principal into the cache, so budgets measure the endpoints alone
+        client.get(f"{API}/ai-agents", headers=headers)
+        yield headers, agent.json()["id"], phone_ids
+    finally:
+        client.portal.call(_delete_user, user_id)
+
+
+def test_link_phones_query_count_does_not_grow_with_phones(client, tenant):
+    headers, agent_id, phone_ids = tenant
+
+    with query_budget(LINK_BUDGET) as few:
+        response = client.post(
+            f"{API}/ai-agents/{agent_id}/link-phones", headers=headers,
+            json={"phone_number_ids": phone_ids[:2]}
+        )
+    assert response.status_code == 200, response.text
+
+    with query_budget(LINK_BUDGET) as many:
+        response = client.post(
+            f"{API}/ai-agents/{agent_id}/link-phones", headers=headers,
+            json={"phone_number_ids": phone_ids}
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["added"] == PHONES - 2
+    assert len(many.statements) == len(few.statements)
+
+
+def test_unlink_phones_stays_within_budget(client, tenant):
+    headers, agent_id, phone_ids = tenant
+    client.post(f"{API}/ai-agents/{agent_id}/link-phones", headers=headers, json={"phone_number_ids": phone_ids})
+
+    with query_budget(LINK_BUDGET):
+        response = client.post(
+            f"{API}/ai-agents/{agent_id}/link-phones", headers=headers,
+            json={"phone_number_ids": []}
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["removed"] == PHONES
+
+
+def test_list_agents_stays_within_budget(client, tenant):
+    headers, _, _ = tenant
+
+    with query_budget(LIST_BUDGET):
+        response = client.get(f"{API}/ai-agents", headers=headers)
+    assert response.status_code == 200, response.text
+
+
+def test_background_statements_are_not_counted(client):
+    async def background_statement():
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
+
+    async def run_detached():
+        # A fresh context, like the loops the lifespan starts before any request
+        await asyncio.get_running_loop().create_task(background_statement(), context=contextvars.Context())
+
+    with query_budget(0) as budget:
+        client.portal.call(run_detached)
+    assert budget.statements == []